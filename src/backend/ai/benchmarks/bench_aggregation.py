@@ -0,0 +1,80 @@
+"""
+Sentiment Aggregation Benchmark
+Compares aggregate_sentiment over result dicts against the columnar NumPy path
+and the streaming aggregator (no model required)
+
+Run from src/backend/ai:
+    python -m benchmarks.bench_aggregation --results 500000
+"""
+
+import argparse
+import time
+from typing import Dict
+
+import numpy as np
+
+from models.sentiment_analyzer import CryptoSentimentAnalyzer, SentimentColumns
+from models.sentiment_stream import StreamingSentimentAggregator
+
+
+def make_columns(n_results: int, seed: int = 42) -> SentimentColumns:
+    """Random boosted probabilities shaped like analyze_batch_columns output"""
+    rng = np.random.default_rng(seed)
+    probs = rng.dirichlet([1.0, 1.0, 1.0], size=n_results)
+    return SentimentColumns(
+        probs=probs,
+        labels=np.argmax(probs, axis=1),
+        text_lengths=rng.integers(10, 280, size=n_results)
+    )
+
+
+def bench_aggregation(n_results: int) -> Dict[str, float]:
+    """Seconds per aggregation for each representation"""
+    # Aggregation never touches the model, so skip loading it
+    analyzer = object.__new__(CryptoSentimentAnalyzer)
+
+    columns = make_columns(n_results)
+    results = columns.to_results()
+    weights = np.random.default_rng(0).uniform(1, 1000, size=n_results)
+    weight_list = weights.tolist()
+    report = {}
+
+    start = time.perf_counter()
+    expected = analyzer.aggregate_sentiment(results, weight_list)
+    report['dicts_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = analyzer.aggregate_columns(columns, weights)
+    report['columns_s'] = time.perf_counter() - start
+
+    stream = StreamingSentimentAggregator()
+    start = time.perf_counter()
+    for result, weight in zip(results, weight_list):
+        stream.add(result, 'twitter', weight, timestamp=0.0)
+    report['stream_ingest_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    streamed = stream.aggregate('twitter')
+    report['stream_query_s'] = time.perf_counter() - start
+
+    report['max_abs_diff_columns'] = max(
+        abs(expected[key] - actual[key]) for key in expected if isinstance(expected[key], float)
+    )
+    report['max_abs_diff_stream'] = max(
+        abs(expected[key] - streamed[key]) for key in expected if isinstance(expected[key], float)
+    )
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--results', type=int, default=500_000)
+    args = parser.parse_args()
+
+    for name, value in bench_aggregation(args.results).items():
+        print(f"{name:>22}: {value:.6g}")
+
+
+if __name__ == '__main__':
+    main()
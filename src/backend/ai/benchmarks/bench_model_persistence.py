@@ -0,0 +1,84 @@
+"""
+Model Persistence Benchmark
+Load time of many per-asset model sets saved with save_models (torch.save +
+joblib) vs single-file memory-mapped bundles from save_bundle
+
+Run from src/backend/ai:
+    python -m benchmarks.bench_model_persistence --sets 200
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict
+
+import numpy as np
+import torch
+
+from benchmarks.bench_price_predictor import make_candles
+from models.price_predictor import CryptoPricePredictor
+
+
+def bench_persistence(n_sets: int, multi_head: bool = False) -> Dict[str, float]:
+    """Milliseconds per model set to load, and to load plus run a first prediction"""
+    torch.manual_seed(0)
+    data = make_candles(500)
+    report = {}
+
+    with tempfile.TemporaryDirectory() as root:
+        for i in range(n_sets):
+            # Untrained weights load exactly like trained ones
+            predictor = CryptoPricePredictor(multi_head=multi_head)
+            predictor.scaler.fit(predictor.prepare_features(data))
+            predictor.is_trained = True
+
+            directory = os.path.join(root, f"set{i}")
+            os.makedirs(directory)
+            predictor.save_models(directory)
+            predictor.save_bundle(os.path.join(root, f"set{i}.bundle"))
+
+        report['directory_kb'] = sum(
+            os.path.getsize(os.path.join(root, 'set0', name)) for name in os.listdir(os.path.join(root, 'set0'))
+        ) / 1024
+        report['bundle_kb'] = os.path.getsize(os.path.join(root, 'set0.bundle')) / 1024
+
+        loaders = {
+            'save_models': lambda p, i: p.load_models(os.path.join(root, f"set{i}"), shared=False),
+            'bundle': lambda p, i: p.load_bundle(os.path.join(root, f"set{i}.bundle"), shared=False)
+        }
+
+        predictions = {}
+        for name, load in loaders.items():
+            predictors = [CryptoPricePredictor(multi_head=multi_head) for _ in range(n_sets)]
+
+            start = time.perf_counter()
+            for i, predictor in enumerate(predictors):
+                load(predictor, i)
+            report[f"{name}_load_ms"] = (time.perf_counter() - start) / n_sets * 1000
+
+            start = time.perf_counter()
+            predictions[name] = [predictor.predict(data) for predictor in predictors]
+            report[f"{name}_first_predict_ms"] = (time.perf_counter() - start) / n_sets * 1000
+
+    report['load_speedup'] = report['save_models_load_ms'] / report['bundle_load_ms']
+    report['max_abs_diff'] = float(np.max([
+        abs(a[h]['predicted_price'] - b[h]['predicted_price'])
+        for a, b in zip(predictions['save_models'], predictions['bundle']) for h in a
+    ]))
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sets', type=int, default=200)
+    parser.add_argument('--multi-head', action='store_true')
+    args = parser.parse_args()
+
+    for name, value in bench_persistence(args.sets, args.multi_head).items():
+        print(f"{name:>28}: {value:.6g}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+OHLCV Store Benchmark
+Time for a worker to get a symbol's candle history from an .npy copy vs a
+memory-mapped OHLCVStore view, and live append throughput
+
+Run from src/backend/ai:
+    python -m benchmarks.bench_ohlcv_store --bars 2000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict
+
+import numpy as np
+
+from benchmarks.bench_trading_signals import make_ohlcv
+from models.ohlcv_store import OHLCVStore
+from models.trading_signals import TradingSignalsGenerator
+
+
+def bench_store(n_bars: int, n_appends: int = 10_000, repeats: int = 5) -> Dict[str, float]:
+    """
+    Milliseconds to load the history and score the latest bar, per worker
+    start, from an .npy file vs the store; microseconds per live append
+    """
+    close, high, low, volume = make_ohlcv(n_bars)
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    timestamps = np.arange(n_bars, dtype=np.int64) * 60_000
+    generator = TradingSignalsGenerator()
+    report = {}
+
+    with tempfile.TemporaryDirectory() as root:
+        npy_path = os.path.join(root, 'BTC.npy')
+        np.save(npy_path, np.stack([open_, high, low, close, volume], axis=1))
+
+        store = OHLCVStore(os.path.join(root, 'store'))
+        store.append('BTC', timestamps, open_, high, low, close, volume, flush=True)
+        report['store_mb'] = os.path.getsize(store.path('BTC')) / 2**20
+
+        def from_npy():
+            data = np.load(npy_path)
+            return generator.analyze_indicators(data[:, 3], data[:, 1], data[:, 2], data[:, 4], last_only=True)
+
+        def from_store():
+            # A fresh store per call, as in a newly started worker
+            series = OHLCVStore(store.root).series('BTC')
+            return generator.analyze_indicators(*series.signal_inputs(), last_only=True)
+
+        for name, load in {'npy': from_npy, 'store': from_store}.items():
+            start = time.perf_counter()
+            for _ in range(repeats):
+                result = load()
+            report[f"{name}_ms"] = (time.perf_counter() - start) / repeats * 1000
+            report[f"{name}_price"] = result['price']
+        report['speedup'] = report['npy_ms'] / report['store_ms']
+
+        reader = OHLCVStore(store.root).series('BTC')
+        writer = store.series('BTC', writable=True)
+        step = 60_000
+        start = time.perf_counter()
+        for i in range(n_appends):
+            price = close[-1] * (1 + 1e-4 * np.sin(i))
+            writer.append(timestamps[-1] + (i + 1) * step, price, price, price, price, 1.0)
+        report['append_us'] = (time.perf_counter() - start) / n_appends * 1e6
+        report['reader_sees_appends'] = float(len(reader) == n_bars + n_appends)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bars', type=int, default=2_000_000)
+    parser.add_argument('--appends', type=int, default=10_000)
+    args = parser.parse_args()
+
+    for name, value in bench_store(args.bars, args.appends).items():
+        print(f"{name:>26}: {value:.6g}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,324 @@
+"""
+Price Predictor Benchmarks
+Feature extraction, sequence building, three-model vs multi-head training,
+the training engine, parallel training, MC dropout intervals and batched
+multi-asset prediction on synthetic minute candles
+
+Run from src/backend/ai:
+    python -m benchmarks.bench_price_predictor --candles 1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Dict, Optional
+
+import numpy as np
+import torch
+
+from models.price_predictor import CryptoPricePredictor, SequenceDataset
+
+
+def make_candles(n_candles: int, seed: int = 42) -> np.ndarray:
+    """Random-walk OHLCV candles [open, high, low, close, volume]"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n_candles)))
+    open_ = close * (1 + rng.normal(0, 0.0005, n_candles))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0005, n_candles)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0005, n_candles)))
+    volume = rng.lognormal(10, 0.5, n_candles)
+    return np.column_stack([open_, high, low, close, volume])
+
+
+def legacy_prepare_features(predictor: CryptoPricePredictor, data: np.ndarray) -> np.ndarray:
+    """Previous per-row implementation, kept for comparison"""
+    features = []
+
+    for i in range(20, len(data)):
+        window = data[i-20:i+1]
+        close_prices = window[:, 3]
+        volumes = window[:, 4]
+
+        returns = np.diff(close_prices) / close_prices[:-1]
+        macd, signal = predictor._calculate_macd(close_prices)
+
+        features.append([
+            close_prices[-1],
+            np.mean(close_prices[-7:]) / close_prices[-1],
+            np.mean(close_prices) / close_prices[-1],
+            predictor._calculate_ema(close_prices, 7) / close_prices[-1],
+            np.std(returns),
+            predictor._calculate_rsi(close_prices),
+            macd,
+            signal,
+            volumes[-1] / np.mean(volumes),
+            (close_prices[-1] - close_prices[0]) / close_prices[0]
+        ])
+
+    return np.array(features)
+
+
+def bench_prepare_features(n_candles: int, legacy_candles: int) -> Dict[str, float]:
+    """
+    Candles per second for the vectorized path over n_candles, and for the
+    legacy loop over a legacy_candles prefix (it is far too slow for 1M rows)
+    """
+    predictor = CryptoPricePredictor()
+    data = make_candles(n_candles)
+    report = {}
+
+    start = time.perf_counter()
+    features = predictor.prepare_features(data)
+    report['vectorized_candles_per_s'] = n_candles / (time.perf_counter() - start)
+
+    prefix = data[:legacy_candles]
+    start = time.perf_counter()
+    expected = legacy_prepare_features(predictor, prefix)
+    report['legacy_candles_per_s'] = legacy_candles / (time.perf_counter() - start)
+
+    report['speedup'] = report['vectorized_candles_per_s'] / report['legacy_candles_per_s']
+    report['max_abs_diff'] = float(np.max(np.abs(features[:len(expected)] - expected)))
+
+    return report
+
+
+def legacy_create_sequences(features: np.ndarray, sequence_length: int):
+    """Previous list-and-copy sequence builder, kept for comparison"""
+    X, y = [], []
+    for i in range(len(features) - sequence_length):
+        X.append(features[i:i + sequence_length])
+        y.append(features[i + sequence_length, 0])
+    return np.array(X), np.array(y)
+
+
+def bench_sequence_memory(n_candles: int, sequence_length: int = 60) -> Dict[str, float]:
+    """Peak NumPy allocation in MB while building training sequences"""
+    predictor = CryptoPricePredictor(sequence_length=sequence_length)
+    features = predictor.prepare_features(make_candles(n_candles))
+    report = {'feature_matrix_mb': features.nbytes / 2**20}
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    X, y = legacy_create_sequences(features, sequence_length)
+    report['legacy_s'] = time.perf_counter() - start
+    report['legacy_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    del X, y
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    X, y = predictor.create_sequences(features)
+    report['strided_s'] = time.perf_counter() - start
+    report['strided_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+
+    return report
+
+
+def bench_multi_head(
+    n_candles: int,
+    epochs: int,
+    predict_calls: int = 200,
+    sequence_length: int = 60
+) -> Dict[str, Dict[str, float]]:
+    """
+    Train time, single predict() latency and held-out RMSE (in price units,
+    averaged over horizons) for three separate models vs one multi-head model
+    """
+    data = make_candles(n_candles)
+    split = int(n_candles * 0.8)
+    train_data, test_data = data[:split], data[split:]
+    report = {}
+
+    for name, multi_head in (('three_models', False), ('multi_head', True)):
+        torch.manual_seed(0)
+        predictor = CryptoPricePredictor(sequence_length=sequence_length, multi_head=multi_head)
+
+        start = time.perf_counter()
+        predictor.train(train_data, epochs=epochs)
+        train_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(predict_calls):
+            predictor.predict(test_data)
+        predict_ms = (time.perf_counter() - start) / predict_calls * 1000
+
+        features = predictor.scaler.transform(predictor.prepare_features(test_data))
+        dataset = SequenceDataset(torch.as_tensor(features, dtype=torch.float32), sequence_length)
+        X, y = dataset[0:len(dataset)]
+        outputs = predictor._forward_horizons(X, predictor.horizons)
+
+        # Scaled close errors back to price units
+        errors = np.stack(list(outputs.values())) - y[:, 0].numpy()
+        rmse = float(np.sqrt(np.mean(errors ** 2))) / predictor.scaler.scale_[0]
+
+        report[name] = {'train_s': train_s, 'predict_ms': predict_ms, 'rmse': rmse}
+
+    return report
+
+
+def bench_predict_many(n_symbols: int, multi_head: bool = False) -> Dict[str, float]:
+    """Seconds to forecast n_symbols with a predict() loop vs one predict_many call"""
+    torch.manual_seed(0)
+    predictor = CryptoPricePredictor(multi_head=multi_head)
+    predictor.train(make_candles(1_000), epochs=1)
+
+    data = {f"SYM{i}": make_candles(200, seed=i) for i in range(n_symbols)}
+    report = {}
+
+    start = time.perf_counter()
+    expected = {symbol: predictor.predict(candles) for symbol, candles in data.items()}
+    report['loop_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = predictor.predict_many(data)
+    report['predict_many_s'] = time.perf_counter() - start
+
+    report['speedup'] = report['loop_s'] / report['predict_many_s']
+    report['max_abs_diff'] = max(
+        abs(expected[symbol][horizon]['predicted_price'] - actual[symbol][horizon]['predicted_price'])
+        for symbol in data for horizon in expected[symbol]
+    )
+
+    return report
+
+
+def bench_training(
+    n_candles: int,
+    epochs: int,
+    num_threads: Optional[int] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    Wall-clock training time and held-out RMSE for the previous fixed-epoch
+    loop (sequential batches, no validation) vs shuffled training with early
+    stopping
+    """
+    data = make_candles(n_candles)
+    split = int(n_candles * 0.8)
+    configs = {
+        'fixed_epochs': dict(validation_split=0.0, shuffle=False),
+        'early_stopping': dict(validation_split=0.1, patience=3, num_threads=num_threads)
+    }
+    report = {}
+
+    for name, options in configs.items():
+        torch.manual_seed(0)
+        predictor = CryptoPricePredictor(multi_head=True)
+
+        start = time.perf_counter()
+        history = predictor.train(data[:split], epochs=epochs, **options)
+        train_s = time.perf_counter() - start
+
+        features = predictor.scaler.transform(predictor.prepare_features(data[split:]))
+        dataset = SequenceDataset(torch.as_tensor(features, dtype=torch.float32), predictor.sequence_length)
+        X, y = dataset[0:len(dataset)]
+        outputs = predictor._forward_horizons(X, predictor.horizons)
+        errors = np.stack(list(outputs.values())) - y[:, 0].numpy()
+
+        report[name] = {
+            'train_s': train_s,
+            'epochs_run': len(history[predictor.MULTI_HEAD]['train_loss']),
+            'mean_epoch_s': float(np.mean(history[predictor.MULTI_HEAD]['epoch_seconds'])),
+            'rmse': float(np.sqrt(np.mean(errors ** 2))) / predictor.scaler.scale_[0]
+        }
+
+    return report
+
+
+def bench_parallel_training(n_candles: int, epochs: int, n_jobs: int = 3) -> Dict[str, float]:
+    """Seconds to train the three horizon models one after another vs in n_jobs processes"""
+    data = make_candles(n_candles)
+    options = dict(epochs=epochs, patience=None)
+    report = {}
+
+    start = time.perf_counter()
+    CryptoPricePredictor().train(data, **options)
+    report['sequential_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    CryptoPricePredictor().train(data, n_jobs=n_jobs, **options)
+    report['parallel_s'] = time.perf_counter() - start
+
+    report['speedup'] = report['sequential_s'] / report['parallel_s']
+    return report
+
+
+def bench_mc_dropout(mc_samples: int, multi_head: bool = False) -> Dict[str, float]:
+    """
+    Milliseconds per predict() for a plain pass, for MC dropout as one
+    batched pass, and for the same number of separate stochastic calls
+    """
+    torch.manual_seed(0)
+    predictor = CryptoPricePredictor(multi_head=multi_head)
+    predictor.train(make_candles(1_000), epochs=1)
+    data = make_candles(200, seed=1)
+    report = {}
+
+    start = time.perf_counter()
+    predictor.predict(data)
+    report['plain_ms'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    predictor.predict(data, mc_samples=mc_samples)
+    report['batched_mc_ms'] = (time.perf_counter() - start) * 1000
+
+    X = torch.rand(1, predictor.sequence_length, 10)
+    start = time.perf_counter()
+    with torch.no_grad():
+        for model in predictor.models.values():
+            model.train()
+            for _ in range(mc_samples):
+                model(X)
+            model.eval()
+    report['separate_calls_ms'] = (time.perf_counter() - start) * 1000
+
+    report['speedup'] = report['separate_calls_ms'] / report['batched_mc_ms']
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candles', type=int, default=1_000_000)
+    parser.add_argument('--legacy-candles', type=int, default=20_000)
+    parser.add_argument('--sequence-candles', type=int, default=200_000)
+    parser.add_argument('--train-candles', type=int, default=5_000)
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--max-epochs', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--mc-samples', type=int, default=100)
+    args = parser.parse_args()
+
+    print("prepare_features:")
+    for name, value in bench_prepare_features(args.candles, args.legacy_candles).items():
+        print(f"{name:>26}: {value:.6g}")
+
+    print("create_sequences:")
+    for name, value in bench_sequence_memory(args.sequence_candles).items():
+        print(f"{name:>26}: {value:.6g}")
+
+    print(f"Three models vs multi-head ({args.train_candles} candles, {args.epochs} epochs):")
+    for name, result in bench_multi_head(args.train_candles, args.epochs).items():
+        print(f"{name:>26}: train {result['train_s']:8.2f} s  predict {result['predict_ms']:7.2f} ms  "
+              f"rmse {result['rmse']:.4f}")
+
+    print(f"Training engine ({args.train_candles} candles, up to {args.max_epochs} epochs):")
+    for name, result in bench_training(args.train_candles, args.max_epochs, args.threads).items():
+        print(f"{name:>26}: train {result['train_s']:8.2f} s  epochs {result['epochs_run']:3d}  "
+              f"epoch {result['mean_epoch_s']:6.2f} s  rmse {result['rmse']:.4f}")
+
+    print(f"Parallel horizon training ({args.train_candles} candles, {args.epochs} epochs):")
+    for name, value in bench_parallel_training(args.train_candles, args.epochs).items():
+        print(f"{name:>26}: {value:.6g}")
+
+    print(f"MC dropout ({args.mc_samples} samples):")
+    for name, value in bench_mc_dropout(args.mc_samples).items():
+        print(f"{name:>26}: {value:.6g}")
+
+    print(f"predict_many ({args.symbols} symbols):")
+    for name, value in bench_predict_many(args.symbols).items():
+        print(f"{name:>26}: {value:.6g}")
+
+
+if __name__ == '__main__':
+    main()
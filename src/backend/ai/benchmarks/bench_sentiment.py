@@ -0,0 +1,144 @@
+"""
+Sentiment Analyzer Benchmarks
+Measures FinBERT inference throughput for the per-text and batched paths
+
+Run from src/backend/ai:
+    python -m benchmarks.bench_sentiment --texts 512
+"""
+
+import argparse
+import logging
+import random
+import time
+from typing import Dict, List
+
+from models.sentiment_analyzer import CryptoSentimentAnalyzer
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_TEXTS = [
+    "BTC is going to the moon, huge rally incoming!",
+    "Another exchange hack, sell everything before the crash",
+    "Ethereum upgrade scheduled for next week",
+    "Regulators announce a ban on privacy coins, fear spreading",
+    "New partnership drives adoption of the token",
+    "Market is flat today, nothing to report",
+    "Whales dumping hard, this looks like a scam",
+    "Solid gains this quarter, portfolio finally green",
+]
+
+
+def make_corpus(n_texts: int, seed: int = 42) -> List[str]:
+    """Build a synthetic tweet corpus of varying length"""
+    rng = random.Random(seed)
+    return [
+        ' '.join(rng.choice(SAMPLE_TEXTS) for _ in range(rng.randint(1, 4)))
+        for _ in range(n_texts)
+    ]
+
+
+def make_mixed_corpus(n_texts: int, seed: int = 42) -> List[str]:
+    """Mix of short headlines, tweets and long Reddit posts in random order"""
+    rng = random.Random(seed)
+    corpus = []
+
+    for _ in range(n_texts):
+        kind = rng.random()
+        if kind < 0.4:
+            n_sentences = 1  # headline
+        elif kind < 0.8:
+            n_sentences = rng.randint(2, 4)  # tweet
+        else:
+            n_sentences = rng.randint(20, 50)  # reddit post
+        corpus.append(' '.join(rng.choice(SAMPLE_TEXTS) for _ in range(n_sentences)))
+
+    return corpus
+
+
+def bench_batch_throughput(
+    analyzer: CryptoSentimentAnalyzer,
+    texts: List[str],
+    batch_sizes: List[int]
+) -> Dict[str, float]:
+    """
+    Compare texts/sec of the per-text loop against analyze_batch
+
+    Returns:
+        Mapping of run name to texts per second
+    """
+    report = {}
+
+    start = time.perf_counter()
+    for text in texts:
+        analyzer.analyze_sentiment(text)
+    report['per_text'] = len(texts) / (time.perf_counter() - start)
+
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        analyzer.analyze_batch(texts, batch_size=batch_size, max_tokens=None)
+        report[f'batch_{batch_size}'] = len(texts) / (time.perf_counter() - start)
+
+    return report
+
+
+def bench_length_bucketing(
+    analyzer: CryptoSentimentAnalyzer,
+    texts: List[str],
+    batch_size: int,
+    max_tokens_options: List[int]
+) -> Dict[str, float]:
+    """
+    Compare fixed-count chunks in input order against length-bucketed batches
+
+    Returns:
+        Mapping of run name to texts per second
+    """
+    report = {}
+
+    start = time.perf_counter()
+    analyzer.analyze_batch(texts, batch_size=batch_size, max_tokens=None)
+    report[f'fixed_{batch_size}'] = len(texts) / (time.perf_counter() - start)
+
+    for max_tokens in max_tokens_options:
+        start = time.perf_counter()
+        analyzer.analyze_batch(texts, batch_size=batch_size, max_tokens=max_tokens)
+        report[f'bucketed_{max_tokens}'] = len(texts) / (time.perf_counter() - start)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default='ProsusAI/finbert')
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--texts', type=int, default=512)
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help='Result cache size; keep 0 so repeated runs measure the model')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 16, 32, 64])
+    parser.add_argument('--max-tokens', type=int, nargs='+', default=[2048, 4096, 8192])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    analyzer = CryptoSentimentAnalyzer(
+        model_name=args.model,
+        device=args.device,
+        cache_size=args.cache_size
+    )
+    texts = make_corpus(args.texts)
+
+    # Warm up kernels before timing
+    analyzer.analyze_batch(texts[:32])
+
+    print("Throughput by batch size:")
+    for name, rate in bench_batch_throughput(analyzer, texts, args.batch_sizes).items():
+        print(f"{name:>14}: {rate:10.1f} texts/sec")
+
+    print("Mixed-length corpus:")
+    mixed = make_mixed_corpus(args.texts)
+    report = bench_length_bucketing(analyzer, mixed, max(args.batch_sizes), args.max_tokens)
+    for name, rate in report.items():
+        print(f"{name:>14}: {rate:10.1f} texts/sec")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Sentiment Backend Parity and Cost Benchmark
+Checks each inference backend against fp32 on a fixed labelled set and
+reports load time, latency and peak RSS (each backend in its own process)
+
+Run from src/backend/ai:
+    python -m benchmarks.bench_sentiment_backends --backends fp32 int8 onnx
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.bench_sentiment import make_corpus
+
+# Fixed labelled set for the parity check
+LABELLED_SET: List[Tuple[str, str]] = [
+    ("Bitcoin rallies to a new all time high as institutional adoption grows", 'positive'),
+    ("Exchange reports record profit after strong trading quarter", 'positive'),
+    ("Ethereum upgrade launches successfully, fees drop sharply", 'positive'),
+    ("Major bank announces partnership to custody crypto assets", 'positive'),
+    ("Solana ecosystem funding doubles year over year", 'positive'),
+    ("Token surges after listing on a top tier exchange", 'positive'),
+    ("Miners report higher revenue as hash price recovers", 'positive'),
+    ("ETF inflows hit their highest level this year", 'positive'),
+    ("Exchange hacked, hundreds of millions in user funds stolen", 'negative'),
+    ("Regulators ban crypto lending products, prices crash", 'negative'),
+    ("Lender halts withdrawals and files for bankruptcy", 'negative'),
+    ("Stablecoin loses its peg and falls to 60 cents", 'negative'),
+    ("Project exposed as a scam, founders disappear with funds", 'negative'),
+    ("Bitcoin slides 15 percent as liquidations mount", 'negative'),
+    ("Mining company reports heavy quarterly loss", 'negative'),
+    ("SEC sues exchange over unregistered securities", 'negative'),
+    ("Bitcoin trades sideways ahead of the Fed meeting", 'neutral'),
+    ("Network will hold its scheduled community call on Thursday", 'neutral'),
+    ("Exchange publishes its monthly proof of reserves report", 'neutral'),
+    ("Developers release the agenda for next week's conference", 'neutral'),
+    ("Trading volume was in line with the monthly average", 'neutral'),
+    ("The foundation announced a new board member", 'neutral'),
+    ("Analysts expect the decision to be published in March", 'neutral'),
+    ("Wallet app updates its terms of service", 'neutral'),
+]
+
+
+def _run_backend(model_name: str, backend: str, texts: List[str], queue: mp.Queue):
+    """Load one backend in a fresh process and measure it"""
+    from models.sentiment_analyzer import CryptoSentimentAnalyzer
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    analyzer = CryptoSentimentAnalyzer(model_name=model_name, backend=backend, cache_size=0)
+    load_time = time.perf_counter() - start
+
+    labelled = analyzer.analyze_batch([text for text, _ in LABELLED_SET])
+    analyzer.analyze_batch(texts[:32])  # warm up
+
+    latencies = []
+    for text in texts[:200]:
+        start = time.perf_counter()
+        analyzer.analyze_sentiment(text)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    analyzer.analyze_batch(texts)
+    throughput = len(texts) / (time.perf_counter() - start)
+
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    queue.put({
+        'backend': backend,
+        'load_s': load_time,
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'throughput': throughput,
+        'peak_rss_mb': rss_after / 1024,
+        'model_rss_mb': (rss_after - rss_before) / 1024,
+        'labels': [result['sentiment'] for result in labelled],
+        'probs': [
+            [result['scores'][k] for k in ('positive', 'negative', 'neutral')]
+            for result in labelled
+        ]
+    })
+
+
+def bench_backends(model_name: str, backends: List[str], texts: List[str]) -> List[Dict]:
+    """Measure each backend in a spawned process so RSS numbers do not mix"""
+    ctx = mp.get_context('spawn')
+    reports = []
+
+    for backend in backends:
+        queue = ctx.Queue()
+        process = ctx.Process(target=_run_backend, args=(model_name, backend, texts, queue))
+        process.start()
+        reports.append(queue.get())
+        process.join()
+
+    reference = next((r for r in reports if r['backend'] == 'fp32'), reports[0])
+    truth = [label for _, label in LABELLED_SET]
+
+    for report in reports:
+        report['accuracy'] = float(np.mean([p == t for p, t in zip(report['labels'], truth)]))
+        report['agreement'] = float(np.mean([
+            p == r for p, r in zip(report['labels'], reference['labels'])
+        ]))
+        report['max_prob_delta'] = float(np.max(np.abs(
+            np.array(report['probs']) - np.array(reference['probs'])
+        )))
+
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default='ProsusAI/finbert')
+    parser.add_argument('--backends', nargs='+', default=['fp32', 'int8', 'torchscript', 'onnx'])
+    parser.add_argument('--texts', type=int, default=512)
+    args = parser.parse_args()
+
+    texts = make_corpus(args.texts)
+
+    print(f"{'backend':>12} {'load s':>8} {'p50 ms':>8} {'texts/s':>9} {'RSS MB':>8} "
+          f"{'model MB':>9} {'accuracy':>9} {'agree':>6} {'max dp':>8}")
+    for r in bench_backends(args.model, args.backends, texts):
+        print(f"{r['backend']:>12} {r['load_s']:8.2f} {r['p50_ms']:8.2f} {r['throughput']:9.1f} "
+              f"{r['peak_rss_mb']:8.0f} {r['model_rss_mb']:9.0f} {r['accuracy']:9.2f} "
+              f"{r['agreement']:6.2f} {r['max_prob_delta']:8.4f}")
+
+
+if __name__ == '__main__':
+    main()
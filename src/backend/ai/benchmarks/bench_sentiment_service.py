@@ -0,0 +1,108 @@
+"""
+Sentiment Service Load Test
+Compares per-request analyze_sentiment calls against the async micro-batcher
+
+Run from src/backend/ai:
+    python -m benchmarks.bench_sentiment_service --requests 1000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.bench_sentiment import make_corpus
+from models.sentiment_analyzer import CryptoSentimentAnalyzer
+from models.sentiment_service import SentimentBatcher
+
+logger = logging.getLogger(__name__)
+
+
+async def run_load(
+    handler: Callable[[str], Awaitable[Dict[str, float]]],
+    texts: List[str],
+    concurrency: int
+) -> Dict[str, float]:
+    """
+    Fire texts at a handler from a fixed number of concurrent clients
+
+    Returns:
+        Throughput and p50/p99 latency in milliseconds
+    """
+    latencies = []
+    cursor = iter(texts)
+
+    async def client():
+        for text in cursor:
+            start = time.perf_counter()
+            await handler(text)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'throughput': len(texts) / elapsed,
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p99_ms': float(np.percentile(latencies_ms, 99))
+    }
+
+
+async def bench_service(
+    analyzer: CryptoSentimentAnalyzer,
+    texts: List[str],
+    concurrency: int,
+    max_batch_size: int,
+    max_wait_ms: float
+) -> Dict[str, Dict[str, float]]:
+    """Load test the per-request path and the micro-batcher with the same clients"""
+    report = {}
+
+    # Current path: every request runs its own blocking call in the default thread pool
+    async def per_request(text: str) -> Dict[str, float]:
+        return await asyncio.to_thread(analyzer.analyze_sentiment, text)
+
+    report['per_request'] = await run_load(per_request, texts, concurrency)
+
+    async with SentimentBatcher(analyzer, max_batch_size, max_wait_ms) as batcher:
+        report['micro_batched'] = await run_load(batcher.analyze, texts, concurrency)
+        logger.info(f"Batcher stats: {batcher.stats()}")
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default='ProsusAI/finbert')
+    parser.add_argument('--device', default='cpu')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    analyzer = CryptoSentimentAnalyzer(model_name=args.model, device=args.device, cache_size=0)
+    texts = make_corpus(args.requests)
+
+    # Warm up kernels before timing
+    analyzer.analyze_batch(texts[:32])
+
+    report = asyncio.run(bench_service(
+        analyzer, texts, args.concurrency, args.max_batch_size, args.max_wait_ms
+    ))
+
+    for name, metrics in report.items():
+        print(
+            f"{name:>14}: {metrics['throughput']:10.1f} req/sec  "
+            f"p50 {metrics['p50_ms']:8.2f} ms  p99 {metrics['p99_ms']:8.2f} ms"
+        )
+
+
+if __name__ == '__main__':
+    main()
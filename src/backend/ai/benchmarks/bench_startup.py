@@ -0,0 +1,130 @@
+"""
+Model Startup Benchmark
+Reports cold-start time and per-worker memory with and without preloading
+models into the shared registry before forking (Linux only)
+
+Run from src/backend/ai:
+    python -m benchmarks.bench_startup --workers 4
+"""
+
+import argparse
+import multiprocessing as mp
+import time
+from typing import Dict
+
+import numpy as np
+
+
+def read_memory_kb() -> Dict[str, int]:
+    """Rss, Pss and private memory of the current process from /proc"""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'private': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    }
+
+
+def bench_cold_start(model_name: str) -> Dict[str, float]:
+    """Time first and repeated construction of the model wrappers"""
+    from models.price_predictor import CryptoPricePredictor
+    from models.sentiment_analyzer import CryptoSentimentAnalyzer
+
+    report = {}
+
+    start = time.perf_counter()
+    CryptoSentimentAnalyzer(model_name=model_name)
+    report['sentiment_first_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    CryptoSentimentAnalyzer(model_name=model_name)
+    report['sentiment_shared_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    CryptoSentimentAnalyzer(model_name=model_name, shared=False)
+    report['sentiment_private_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictor = CryptoPricePredictor()
+    report['predictor_init_s'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictor.models
+    report['predictor_build_models_s'] = time.perf_counter() - start
+
+    return report
+
+
+def _worker(model_name: str, queue: mp.Queue):
+    from models.sentiment_analyzer import CryptoSentimentAnalyzer
+
+    analyzer = CryptoSentimentAnalyzer(model_name=model_name, cache_size=0)
+    analyzer.analyze_sentiment("Bitcoin breaks out to new highs")
+    queue.put(read_memory_kb())
+
+
+def _master(model_name: str, n_workers: int, preload: bool, queue: mp.Queue):
+    """Simulate a pre-forking server master and collect worker memory"""
+    if preload:
+        from models.model_registry import model_registry
+        from models.sentiment_analyzer import CryptoSentimentAnalyzer
+
+        CryptoSentimentAnalyzer(model_name=model_name)
+        model_registry.freeze()
+
+    ctx = mp.get_context('fork')
+    worker_queue = ctx.Queue()
+    workers = [ctx.Process(target=_worker, args=(model_name, worker_queue)) for _ in range(n_workers)]
+
+    # Keep every worker alive until all have reported so Pss reflects sharing
+    for worker in workers:
+        worker.start()
+    samples = [worker_queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    queue.put({
+        key: float(np.mean([sample[key] for sample in samples])) / 1024
+        for key in ('rss', 'pss', 'private')
+    })
+
+
+def bench_worker_memory(model_name: str, n_workers: int) -> Dict[str, Dict[str, float]]:
+    """Per-worker memory in MB when each worker loads vs when the master preloads"""
+    ctx = mp.get_context('spawn')
+    report = {}
+
+    for preload in (False, True):
+        queue = ctx.Queue()
+        master = ctx.Process(target=_master, args=(model_name, n_workers, preload, queue))
+        master.start()
+        report['preloaded' if preload else 'per_worker_load'] = queue.get()
+        master.join()
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default='ProsusAI/finbert')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    print("Cold start:")
+    for name, seconds in bench_cold_start(args.model).items():
+        print(f"{name:>26}: {seconds:8.3f} s")
+
+    print(f"Memory per worker ({args.workers} workers):")
+    for name, memory in bench_worker_memory(args.model, args.workers).items():
+        print(f"{name:>26}: rss {memory['rss']:7.0f} MB  pss {memory['pss']:7.0f} MB  "
+              f"private {memory['private']:7.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Text Pipeline Microbenchmark
+Compares the multi-pass preprocessing and per-keyword scan against the
+compiled single-pass cleaner and keyword matcher (no model required)
+
+Run from src/backend/ai:
+    python -m benchmarks.bench_text_pipeline --texts 1000000
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, Dict, List
+
+from models.sentiment_analyzer import KeywordMatcher, clean_text
+
+BULLISH = [
+    'moon', 'bullish', 'pump', 'rally', 'breakthrough', 'adoption',
+    'partnership', 'upgrade', 'launch', 'green', 'profit', 'gains'
+]
+BEARISH = [
+    'crash', 'dump', 'bearish', 'sell', 'scam', 'hack', 'regulation',
+    'ban', 'fear', 'loss', 'red', 'decline', 'warning'
+]
+
+TWEET_PARTS = [
+    "$BTC to the moon!!", "@whale_alert just moved 5k BTC", "#crypto #bullish",
+    "https://t.co/abc123 check this", "bored of this chop", "huge rally incoming 🚀",
+    "regulation fear again...", "www.example.com/news/123", "gm frens",
+    "scam coin, dump it", "partnership announced w/ @exchange", "red candles everywhere",
+]
+
+
+def legacy_preprocess(text: str) -> str:
+    """Previous four-pass cleaner, kept for comparison"""
+    text = re.sub(r'http\S+|www.\S+', '', text)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#', '', text)
+    text = re.sub(r'[^\w\s.,!?]', '', text)
+    text = ' '.join(text.split())
+    return text.strip()
+
+
+def legacy_boost(text_lower: str, bullish: List[str] = BULLISH, bearish: List[str] = BEARISH) -> float:
+    """Previous substring scan, one pass per keyword"""
+    boost_factor = 0.0
+    for keyword in bullish:
+        if keyword in text_lower:
+            boost_factor += 0.05
+    for keyword in bearish:
+        if keyword in text_lower:
+            boost_factor -= 0.05
+    return boost_factor
+
+
+def make_keywords(n_keywords: int, seed: int = 7) -> List[str]:
+    """Synthetic keyword list for scaling runs"""
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [
+        ''.join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+        for _ in range(n_keywords)
+    ]
+
+
+def make_tweets(n_texts: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        ' '.join(rng.choice(TWEET_PARTS) for _ in range(rng.randint(1, 5)))
+        for _ in range(n_texts)
+    ]
+
+
+def time_pipeline(
+    texts: List[str],
+    preprocess: Callable[[str], str],
+    boost: Callable[[str], float]
+) -> float:
+    """Texts per second for preprocessing plus keyword boost"""
+    start = time.perf_counter()
+    for text in texts:
+        boost(preprocess(text).lower())
+    return len(texts) / (time.perf_counter() - start)
+
+
+def bench_text_pipeline(texts: List[str], n_keywords: int) -> Dict[str, float]:
+    matcher = KeywordMatcher(BULLISH, BEARISH)
+    lowered = [clean_text(text).lower() for text in texts]
+    report = {}
+
+    start = time.perf_counter()
+    for text in texts:
+        legacy_preprocess(text)
+    report['preprocess_legacy'] = len(texts) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for text in texts:
+        clean_text(text)
+    report['preprocess_compiled'] = len(texts) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for text in lowered:
+        legacy_boost(text)
+    report['keywords_legacy'] = len(texts) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for text in lowered:
+        matcher.boost(text)
+    report['keywords_compiled'] = len(texts) / (time.perf_counter() - start)
+
+    report['pipeline_legacy'] = time_pipeline(texts, legacy_preprocess, legacy_boost)
+    report['pipeline_compiled'] = time_pipeline(texts, clean_text, matcher.boost)
+
+    # Cost of the per-keyword scan grows with the list, the token lookup does not
+    bullish = BULLISH + make_keywords(n_keywords // 2, seed=1)
+    bearish = BEARISH + make_keywords(n_keywords // 2, seed=2)
+    large_matcher = KeywordMatcher(bullish, bearish)
+
+    start = time.perf_counter()
+    for text in lowered:
+        legacy_boost(text, bullish, bearish)
+    report[f'keywords_legacy_{n_keywords}'] = len(texts) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for text in lowered:
+        large_matcher.boost(text)
+    report[f'keywords_compiled_{n_keywords}'] = len(texts) / (time.perf_counter() - start)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--texts', type=int, default=1_000_000)
+    parser.add_argument('--keywords', type=int, default=1000,
+                        help='Size of the synthetic keyword list for the scaling run')
+    args = parser.parse_args()
+
+    texts = make_tweets(args.texts)
+
+    for name, rate in bench_text_pipeline(texts, args.keywords).items():
+        print(f"{name:>24}: {rate:12.0f} texts/sec")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+"""
+Trading Signals Benchmarks
+Indicator kernels, indicator computation, multi-symbol batch signals,
+streaming per-tick signals and concurrent requests on synthetic OHLCV series
+
+Run from src/backend/ai:
+    python -m benchmarks.bench_trading_signals --bars 20000
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
+
+import numpy as np
+
+from models import indicator_engine
+from models.signal_stream import StreamingSignalsGenerator
+from models.trading_signals import TradingSignalsGenerator
+
+
+def make_ohlcv(n_bars: int, seed: int = 42) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Random-walk close, high, low and volume series"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    high = close * (1 + np.abs(rng.normal(0, 0.005, n_bars)))
+    low = close * (1 - np.abs(rng.normal(0, 0.005, n_bars)))
+    volume = rng.lognormal(10, 0.5, n_bars)
+    return close, high, low, volume
+
+
+def independent_indicators(generator: TradingSignalsGenerator, close, high, low, volume) -> Dict[str, float]:
+    """Every indicator computed on its own over the full series, as before the engine"""
+    generator.calculate_sma(close, 20)
+    generator.calculate_sma(close, 50)
+    generator.calculate_ema(close, 12)
+    generator.calculate_rsi(close)
+    generator.calculate_macd(close)
+    generator.calculate_bollinger_bands(close)
+    generator.calculate_stochastic(high, low, close)
+    return generator.calculate_sma(volume, 20)
+
+
+def legacy_ema(prices: np.ndarray, period: int) -> np.ndarray:
+    """Previous per-element EMA loop, kept for comparison"""
+    multiplier = 2 / (period + 1)
+    ema = np.zeros_like(prices)
+    ema[0] = prices[0]
+    for i in range(1, len(prices)):
+        ema[i] = (prices[i] * multiplier) + (ema[i-1] * (1 - multiplier))
+    return ema
+
+
+def legacy_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """Previous RSI with a per-element smoothing loop"""
+    deltas = np.diff(prices)
+    gain = np.where(deltas > 0, deltas, 0)
+    loss = np.where(deltas < 0, -deltas, 0)
+    avg_gain = np.zeros(len(prices))
+    avg_loss = np.zeros(len(prices))
+    avg_gain[period] = np.mean(gain[:period])
+    avg_loss[period] = np.mean(loss[:period])
+    for i in range(period + 1, len(prices)):
+        avg_gain[i] = (avg_gain[i-1] * (period - 1) + gain[i-1]) / period
+        avg_loss[i] = (avg_loss[i-1] * (period - 1) + loss[i-1]) / period
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = np.where(avg_loss != 0, avg_gain / avg_loss, 0)
+    return 100 - (100 / (1 + rs))
+
+
+def legacy_rolling_std(prices: np.ndarray, period: int) -> np.ndarray:
+    """Previous Bollinger std, one np.std per index"""
+    return np.array([
+        np.std(prices[max(0, i-period):i+1]) if i >= period else np.std(prices[:i+1])
+        for i in range(len(prices))
+    ])
+
+
+def legacy_rolling_max(values: np.ndarray, period: int) -> np.ndarray:
+    """Previous stochastic extremes, one np.max per index"""
+    result = np.full(len(values), np.nan)
+    for i in range(period - 1, len(values)):
+        result[i] = np.max(values[i - period + 1:i + 1])
+    return result
+
+
+def bench_kernels(n_bars: int) -> Dict[str, Dict[str, float]]:
+    """Per-indicator milliseconds for the previous loops vs the vectorized kernels"""
+    close, high, _, _ = make_ohlcv(n_bars)
+    cases = {
+        'ema': (legacy_ema, indicator_engine.ema, (close, 12)),
+        'rsi': (legacy_rsi, indicator_engine.rsi, (close, 14)),
+        'rolling_std': (legacy_rolling_std, indicator_engine.rolling_std, (close, 20)),
+        'rolling_max': (legacy_rolling_max, indicator_engine.rolling_max, (high, 14))
+    }
+    report = {}
+
+    for name, (legacy, vectorized, args) in cases.items():
+        start = time.perf_counter()
+        expected = legacy(*args)
+        legacy_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        actual = vectorized(*args)
+        vectorized_ms = (time.perf_counter() - start) * 1000
+
+        report[name] = {
+            'legacy_ms': legacy_ms,
+            'vectorized_ms': vectorized_ms,
+            'speedup': legacy_ms / vectorized_ms,
+            'max_rel_diff': float(np.nanmax(np.abs(actual - expected) / np.maximum(1.0, np.abs(expected))))
+        }
+
+    return report
+
+
+def bench_analyze_indicators(n_bars: int, repeats: int = 3) -> Dict[str, float]:
+    """Milliseconds per analyze_indicators call, full series vs last values only"""
+    generator = TradingSignalsGenerator()
+    close, high, low, volume = make_ohlcv(n_bars)
+    runs = {
+        'independent_ms': lambda: independent_indicators(generator, close, high, low, volume),
+        'engine_ms': lambda: generator.analyze_indicators(close, high, low, volume),
+        'last_only_ms': lambda: generator.analyze_indicators(close, high, low, volume, last_only=True)
+    }
+    report = {}
+
+    for name, run in runs.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            run()
+        report[name] = (time.perf_counter() - start) / repeats * 1000
+
+    full = generator.analyze_indicators(close, high, low, volume)
+    last = generator.analyze_indicators(close, high, low, volume, last_only=True)
+    report['last_only_max_rel_diff'] = max(
+        abs(full[key] - last[key]) / max(1.0, abs(full[key])) for key in full
+    )
+
+    return report
+
+
+def bench_batch_signals(n_symbols: int, n_bars: int, last_only: bool = True) -> Dict[str, float]:
+    """Milliseconds to score every symbol with a per-symbol loop vs the batch API"""
+    generator = TradingSignalsGenerator()
+    series = [make_ohlcv(n_bars, seed=i) for i in range(n_symbols)]
+    close, high, low, volume = (np.stack(column) for column in zip(*series))
+    report = {}
+
+    start = time.perf_counter()
+    expected = [
+        generator.generate_signals(generator.analyze_indicators(c, h, l, v, last_only=last_only))
+        for c, h, l, v in series
+    ]
+    report['loop_ms'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    indicators = generator.analyze_indicators_batch(close, high, low, volume, last_only=last_only)
+    columns = generator.generate_signals_batch(indicators)
+    report['batch_ms'] = (time.perf_counter() - start) * 1000
+
+    report['speedup'] = report['loop_ms'] / report['batch_ms']
+    report['mismatches'] = sum(
+        (e['signal'], e['confidence'], e['reasons']) != (a['signal'], a['confidence'], a['reasons'])
+        for e, a in zip(expected, columns.to_results())
+    )
+
+    return report
+
+
+def bench_streaming(n_ticks: int, check_every: int = 97) -> Dict[str, float]:
+    """
+    Microseconds per tick for StreamingSignalsGenerator.update vs re-running
+    analyze_indicators + generate_signals over the history so far, plus an
+    equivalence check of the two at every check_every-th tick
+    """
+    close, high, low, volume = make_ohlcv(n_ticks)
+    stream = StreamingSignalsGenerator()
+    batch = TradingSignalsGenerator()
+    report = {}
+
+    start = time.perf_counter()
+    outputs = [stream.update(close[i], high[i], low[i], volume[i]) for i in range(n_ticks)]
+    report['stream_us_per_tick'] = (time.perf_counter() - start) / n_ticks * 1e6
+
+    checked = list(range(stream.MIN_TICKS - 1, n_ticks, check_every))
+    start = time.perf_counter()
+    expected = [
+        batch.generate_signals(batch.analyze_indicators(close[:i+1], high[:i+1], low[:i+1], volume[:i+1]))
+        for i in checked
+    ]
+    report['recompute_us_per_tick'] = (time.perf_counter() - start) / len(checked) * 1e6
+    report['speedup'] = report['recompute_us_per_tick'] / report['stream_us_per_tick']
+
+    report['max_rel_diff'] = max(
+        abs(e['indicators'][key] - outputs[i]['indicators'][key]) / max(1.0, abs(e['indicators'][key]))
+        for i, e in zip(checked, expected) for key in e['indicators']
+    )
+    report['mismatches'] = sum(
+        (e['signal'], e['confidence'], e['reasons']) != (outputs[i]['signal'], outputs[i]['confidence'], outputs[i]['reasons'])
+        for i, e in zip(checked, expected)
+    )
+
+    return report
+
+
+def bench_concurrency(n_requests: int, n_bars: int, n_threads: int = 8) -> Dict[str, float]:
+    """
+    Requests per second from a thread pool, one shared generator vs one per
+    request, with every result checked against a single-threaded run
+
+    The thread switch interval is cut to a microsecond while the pool runs
+    so requests interleave as much as possible.
+    """
+    series = [make_ohlcv(n_bars, seed=i) for i in range(n_requests)]
+    expected = [TradingSignalsGenerator().evaluate(*ohlcv, last_only=True) for ohlcv in series]
+    shared = TradingSignalsGenerator()
+
+    def per_request(ohlcv):
+        generator = TradingSignalsGenerator()
+        generator.analyze_indicators(*ohlcv, last_only=True)
+        return generator.generate_signals()
+
+    def shared_two_step(ohlcv):
+        shared.analyze_indicators(*ohlcv, last_only=True)
+        return shared.generate_signals()
+
+    runs = {
+        'per_request': per_request,
+        'shared_two_step': shared_two_step,
+        'shared_evaluate': lambda ohlcv: shared.evaluate(*ohlcv, last_only=True)
+    }
+    report = {}
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for name, run in runs.items():
+            with ThreadPoolExecutor(max_workers=n_threads) as pool:
+                start = time.perf_counter()
+                results = list(pool.map(run, series))
+                report[f"{name}_req_per_s"] = n_requests / (time.perf_counter() - start)
+
+            report[f"{name}_mismatches"] = sum(
+                (e['signal'], e['confidence'], e['indicators']['price']) != (a['signal'], a['confidence'], a['indicators']['price'])
+                for e, a in zip(expected, results)
+            )
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bars', type=int, default=20_000)
+    parser.add_argument('--kernel-bars', type=int, default=100_000)
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--ticks', type=int, default=20_000)
+    parser.add_argument('--requests', type=int, default=2_000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"Indicator kernels ({args.kernel_bars} bars):")
+    for name, result in bench_kernels(args.kernel_bars).items():
+        print(f"{name:>26}: legacy {result['legacy_ms']:9.2f} ms  vectorized {result['vectorized_ms']:7.2f} ms  "
+              f"speedup {result['speedup']:6.1f}x  max_rel_diff {result['max_rel_diff']:.2e}")
+
+    print(f"analyze_indicators ({args.bars} bars):")
+    for name, value in bench_analyze_indicators(args.bars).items():
+        print(f"{name:>26}: {value:.6g}")
+
+    print(f"Batch signals ({args.symbols} symbols x {args.bars} bars, last values only):")
+    for name, value in bench_batch_signals(args.symbols, args.bars).items():
+        print(f"{name:>26}: {value:.6g}")
+
+    print(f"Streaming signals ({args.ticks} ticks):")
+    for name, value in bench_streaming(args.ticks).items():
+        print(f"{name:>26}: {value:.6g}")
+
+    print(f"Concurrent requests ({args.requests} requests x 500 bars, {args.threads} threads):")
+    for name, value in bench_concurrency(args.requests, 500, args.threads).items():
+        print(f"{name:>26}: {value:.6g}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+"""
+Vectorized Backtesting
+Replays the TradingSignalsGenerator rules over a whole price history as
+arrays: one indicator pass, every bar's signal, then positions, fees and PnL
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, NamedTuple, Optional, Sequence
+import itertools
+import logging
+import math
+import multiprocessing as mp
+import os
+
+import numpy as np
+
+from models.indicator_engine import IndicatorEngine
+from models.trading_signals import (
+    DEFAULT_THRESHOLDS,
+    SignalThresholds,
+    SignalType,
+    TradingSignalsGenerator
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BacktestResult(NamedTuple):
+    """
+    Per-bar simulation of one parameter set
+
+    signals: (bars,) SignalType values, hold during warm-up
+    positions: (bars,) position held from each bar's close to the next
+        (1 long, 0 flat, -1 short)
+    returns: (bars,) net strategy return of each bar, after fees
+    equity: (bars,) equity curve starting from 1
+    trade_returns: (trades,) compounded net return of each trade
+    metrics: Summary statistics (see Backtester.metrics)
+    """
+    signals: np.ndarray
+    positions: np.ndarray
+    returns: np.ndarray
+    equity: np.ndarray
+    trade_returns: np.ndarray
+    metrics: Dict[str, float]
+
+
+# Sweep worker state, set once per process by _init_sweep_worker
+_sweep_state = {}
+
+
+def _init_sweep_worker(backtester: 'Backtester', prices: np.ndarray, indicators: Dict[str, np.ndarray]):
+    """Process pool initializer for Backtester.sweep: ship the indicators once per worker"""
+    _sweep_state.update(backtester=backtester, prices=prices, indicators=indicators)
+
+
+def _sweep_worker(thresholds: SignalThresholds) -> Dict[str, float]:
+    """Process pool entry point for Backtester.sweep"""
+    return _sweep_state['backtester'].simulate(
+        _sweep_state['prices'], _sweep_state['indicators'], thresholds
+    ).metrics
+
+
+class Backtester:
+    """
+    Backtest generate_signals over a price history without a per-bar loop
+
+    Indicators come from IndicatorEngine.history() (bar t equals what
+    analyze_indicators gives for the history up to t) and signals from
+    generate_signals_batch over those series. A buy or strong buy goes long
+    at that bar's close, a sell or strong sell goes flat (or short), and a
+    hold keeps the current position.
+    """
+
+    # Bars before the first full Bollinger window, where no signal exists
+    WARMUP_BARS = 19
+
+    def __init__(self, fee: float = 0.001, allow_short: bool = False, periods_per_year: float = 365):
+        """
+        Args:
+            fee: Cost per unit of position traded, as a fraction (0.001 = 10 bps)
+            allow_short: Sell signals go short instead of flat
+            periods_per_year: Bars per year, for annualizing Sharpe (365 for
+                daily crypto bars, 525600 for minute bars)
+        """
+        self.fee = fee
+        self.allow_short = allow_short
+        self.periods_per_year = periods_per_year
+        self.generator = TradingSignalsGenerator()
+
+    def indicator_history(
+        self,
+        prices: np.ndarray,
+        high: np.ndarray = None,
+        low: np.ndarray = None,
+        volume: np.ndarray = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Every indicator at every bar, computed in one pass
+
+        Args:
+            prices: Close prices, shape (bars,)
+            high, low, volume: Optional series of the same shape
+
+        Returns:
+            Indicator name -> (bars,) values
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim != 1:
+            raise ValueError(f"Expected a 1-D price series, got shape {prices.shape}")
+        if len(prices) <= self.WARMUP_BARS:
+            raise ValueError(f"Backtests need more than {self.WARMUP_BARS} bars, got {len(prices)}")
+
+        return IndicatorEngine(prices, high, low, volume).history()
+
+    def run(
+        self,
+        prices: np.ndarray,
+        high: np.ndarray = None,
+        low: np.ndarray = None,
+        volume: np.ndarray = None,
+        thresholds: SignalThresholds = DEFAULT_THRESHOLDS
+    ) -> BacktestResult:
+        """
+        Backtest one parameter set
+
+        Args:
+            prices: Close prices, shape (bars,)
+            high, low, volume: Optional series of the same shape
+            thresholds: RSI and Bollinger levels for the signal rules
+
+        Returns:
+            BacktestResult
+        """
+        indicators = self.indicator_history(prices, high, low, volume)
+        return self.simulate(indicators['price'], indicators, thresholds)
+
+    def simulate(
+        self,
+        prices: np.ndarray,
+        indicators: Dict[str, np.ndarray],
+        thresholds: SignalThresholds = DEFAULT_THRESHOLDS
+    ) -> BacktestResult:
+        """
+        Signals, positions and PnL from precomputed indicator series
+
+        Args:
+            prices: Close prices, shape (bars,)
+            indicators: Output of indicator_history for those prices
+            thresholds: RSI and Bollinger levels for the signal rules
+
+        Returns:
+            BacktestResult
+        """
+        signals = self.generator.generate_signals_batch(indicators, thresholds).signals
+        signals[:self.WARMUP_BARS] = SignalType.HOLD.value
+
+        is_buy = (signals == SignalType.BUY.value) | (signals == SignalType.STRONG_BUY.value)
+        is_sell = (signals == SignalType.SELL.value) | (signals == SignalType.STRONG_SELL.value)
+        target = np.select([is_buy, is_sell], [1.0, -1.0 if self.allow_short else 0.0], default=np.nan)
+        target[:self.WARMUP_BARS] = 0.0
+
+        # Holds keep the last position: forward-fill the last buy/sell target
+        last_set = np.where(np.isnan(target), 0, np.arange(len(target)))
+        np.maximum.accumulate(last_set, out=last_set)
+        positions = target[last_set]
+
+        # Bar t earns the move from close t-1 to close t on the position held
+        # since t-1, and pays the fee for trading to positions[t] at close t
+        previous = np.concatenate([[0.0], positions[:-1]])
+        bar_returns = np.zeros(len(prices))
+        bar_returns[1:] = np.diff(prices) / prices[:-1]
+        returns = previous * bar_returns - self.fee * np.abs(positions - previous)
+        equity = np.cumprod(1 + returns)
+
+        trade_returns = self._trade_returns(positions, previous, bar_returns, self.fee)
+        metrics = self.metrics(returns, equity, positions, trade_returns)
+        metrics['buy_and_hold_return'] = float(prices[-1] / prices[self.WARMUP_BARS] - 1)
+
+        return BacktestResult(
+            signals=signals,
+            positions=positions,
+            returns=returns,
+            equity=equity,
+            trade_returns=trade_returns,
+            metrics=metrics
+        )
+
+    @staticmethod
+    def _trade_returns(
+        positions: np.ndarray,
+        previous: np.ndarray,
+        bar_returns: np.ndarray,
+        fee: float
+    ) -> np.ndarray:
+        """
+        Compounded net return of each trade, including its entry and exit fees
+
+        A trade earns the bars it is held into and pays fee * |position| to
+        enter and again to exit. On a bar that flips long to short (or back)
+        the fee for the whole trade splits that way: the closing trade pays
+        for its exit and the new trade pays for its entry.
+        """
+        entries = (positions != 0) & (positions != previous)
+        n_trades = int(entries.sum())
+        if n_trades == 0:
+            return np.empty(0)
+
+        trade_id = np.cumsum(entries) - 1
+        previous_id = np.concatenate([[-1], trade_id[:-1]])
+
+        # Held bars go to the trade held into them, less its exit fee if it closes there
+        held = previous != 0
+        exits = held & (positions != previous)
+        held_returns = previous * bar_returns - fee * np.abs(previous) * exits
+        log_returns = np.bincount(previous_id[held], weights=np.log1p(held_returns[held]), minlength=n_trades)
+
+        # Entry fees go to the trade being opened
+        entry_fees = fee * np.abs(positions[entries])
+        log_returns += np.log1p(-entry_fees)
+
+        return np.expm1(log_returns)
+
+    def metrics(
+        self,
+        returns: np.ndarray,
+        equity: np.ndarray,
+        positions: np.ndarray,
+        trade_returns: np.ndarray
+    ) -> Dict[str, float]:
+        """
+        Summary statistics of a simulated run
+
+        Returns:
+            total_return, annualized sharpe, max_drawdown (as a positive
+            fraction), hit_rate (share of trades that made money), n_trades,
+            exposure (share of bars in the market) and turnover (position
+            units traded)
+        """
+        std = returns[1:].std()
+        running_peak = np.maximum.accumulate(equity)
+
+        return {
+            'total_return': float(equity[-1] - 1),
+            'sharpe': float(returns[1:].mean() / std * math.sqrt(self.periods_per_year)) if std > 0 else 0.0,
+            'max_drawdown': float(np.max(1 - equity / running_peak)),
+            'hit_rate': float(np.mean(trade_returns > 0)) if len(trade_returns) else 0.0,
+            'n_trades': len(trade_returns),
+            'exposure': float(np.mean(positions != 0)),
+            'turnover': float(np.abs(np.diff(positions, prepend=0.0)).sum())
+        }
+
+    def sweep(
+        self,
+        prices: np.ndarray,
+        high: np.ndarray = None,
+        low: np.ndarray = None,
+        volume: np.ndarray = None,
+        grid: Dict[str, Sequence[float]] = None,
+        n_jobs: Optional[int] = None
+    ) -> Dict[SignalThresholds, Dict[str, float]]:
+        """
+        Backtest every combination of threshold values, in parallel processes
+
+        Indicators do not depend on the thresholds, so they are computed once
+        here and sent to each worker once; workers only re-score signals and
+        re-simulate. Workers are spawned, so scripts calling this need the
+        usual if __name__ == '__main__' guard.
+
+        Args:
+            prices: Close prices, shape (bars,)
+            high, low, volume: Optional series of the same shape
+            grid: SignalThresholds field -> values to try (fields left out
+                keep their defaults)
+            n_jobs: Worker processes (default: CPU count; 1 runs in-process)
+
+        Returns:
+            SignalThresholds -> metrics, in grid order
+        """
+        grid = grid or {}
+        unknown = set(grid) - set(SignalThresholds._fields)
+        if unknown:
+            raise ValueError(f"Unknown thresholds {sorted(unknown)}, expected some of {SignalThresholds._fields}")
+
+        names = list(grid)
+        candidates = [
+            DEFAULT_THRESHOLDS._replace(**dict(zip(names, values)))
+            for values in itertools.product(*(grid[name] for name in names))
+        ]
+
+        indicators = self.indicator_history(prices, high, low, volume)
+        prices = indicators['price']
+
+        n_jobs = min(n_jobs or os.cpu_count() or 1, len(candidates))
+        logger.info(f"Backtesting {len(candidates)} parameter sets in {n_jobs} processes...")
+
+        if n_jobs <= 1:
+            results = [self.simulate(prices, indicators, thresholds).metrics for thresholds in candidates]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=n_jobs,
+                mp_context=mp.get_context('spawn'),
+                initializer=_init_sweep_worker,
+                initargs=(self, prices, indicators)
+            ) as pool:
+                chunksize = max(1, len(candidates) // (n_jobs * 4))
+                results = list(pool.map(_sweep_worker, candidates, chunksize=chunksize))
+
+        return dict(zip(candidates, results))
@@ -0,0 +1,376 @@
+"""
+Technical Indicator Engine
+Computes each indicator primitive once per series and shares it between the
+indicators built on top of it
+"""
+
+import math
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Simple moving average over full windows only (len(values) - period + 1 values)
+
+    Fewer values than period give an empty result, so analyze_indicators
+    falls back to the current price as it always meant to. np.convolve in
+    'valid' mode, used before, swapped its operands for short series and
+    returned period - len(values) + 1 copies of sum(values) / period instead.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_windows = values.shape[-1] - period + 1
+    if n_windows <= 0:
+        return np.empty(values.shape[:-1] + (0,))
+
+    # Fixed summation order, so a row of a matrix gives the same bits as the 1-D series
+    weight = 1 / period
+    result = values[..., :n_windows] * weight
+    for offset in range(1, period):
+        result += values[..., offset:offset + n_windows] * weight
+
+    return result
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average seeded with the first value"""
+    multiplier = 2 / (period + 1)
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[-1] == 0:
+        raise IndexError("ema of an empty series")
+
+    # y[i] = m * x[i] + (1 - m) * y[i-1] as a first-order IIR filter, with the
+    # state set up so that y[0] = x[0]
+    result, _ = lfilter(
+        [multiplier], [1, -(1 - multiplier)], values, axis=-1, zi=(1 - multiplier) * values[..., :1]
+    )
+    return result
+
+
+def _rolling(values: np.ndarray, window: int, reduce: Callable, chunk_size: int = 65536) -> np.ndarray:
+    """reduce(windows, axis=-1) over every full window, chunk_size windows at a time"""
+    values = np.asarray(values, dtype=np.float64)
+    n_windows = values.shape[-1] - window + 1
+    if n_windows <= 0:
+        return np.empty(values.shape[:-1] + (0,))
+
+    windows = sliding_window_view(values, window, axis=-1)
+    result = np.empty(values.shape[:-1] + (n_windows,))
+    for start in range(0, n_windows, chunk_size):
+        result[..., start:start + chunk_size] = reduce(windows[..., start:start + chunk_size, :], axis=-1)
+
+    return result
+
+
+def rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Population standard deviation of the last period + 1 values at every
+    index (all values so far before index period), as the Bollinger bands use
+    """
+    values = np.asarray(values, dtype=np.float64)
+    head = min(period, values.shape[-1])
+
+    # Growing windows for the first period values, then fixed period + 1 windows.
+    # Two-pass std over window views: cumulative-sum variance loses ~1e-6
+    # relative accuracy on price-level data
+    result = np.empty(values.shape)
+    for i in range(head):
+        result[..., i] = np.std(values[..., :i+1], axis=-1)
+    result[..., head:] = _rolling(values, period + 1, np.std)
+
+    return result
+
+
+def rolling_max(values: np.ndarray, period: int) -> np.ndarray:
+    """Maximum of the period values ending at each index (NaN before the first full window)"""
+    result = np.full(np.shape(values), np.nan)
+    result[..., period - 1:] = _rolling(values, period, np.max)
+    return result
+
+
+def rolling_min(values: np.ndarray, period: int) -> np.ndarray:
+    """Minimum of the period values ending at each index (NaN before the first full window)"""
+    result = np.full(np.shape(values), np.nan)
+    result[..., period - 1:] = _rolling(values, period, np.min)
+    return result
+
+
+def rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """Relative Strength Index (0-100) with Wilder smoothing"""
+    prices = np.asarray(prices, dtype=np.float64)
+    n = prices.shape[-1]
+
+    deltas = np.diff(prices, axis=-1)
+    gain = np.where(deltas > 0, deltas, 0)
+    loss = np.where(deltas < 0, -deltas, 0)
+
+    # Calculate average gain and loss
+    avg_gain = np.zeros(prices.shape)
+    avg_loss = np.zeros(prices.shape)
+
+    if n <= period:
+        raise ValueError(f"RSI needs more than {period} prices, got {n}")
+
+    # First average
+    avg_gain[..., period] = np.mean(gain[..., :period], axis=-1)
+    avg_loss[..., period] = np.mean(loss[..., :period], axis=-1)
+
+    # Smoothed averages: avg[i] = (avg[i-1] * (period - 1) + x[i-1]) / period,
+    # a first-order IIR filter continuing from the first average
+    decay = (period - 1) / period
+    for avg, values in ((avg_gain, gain), (avg_loss, loss)):
+        if n > period + 1:
+            avg[..., period + 1:], _ = lfilter(
+                [1 / period], [1, -decay], values[..., period:n - 1],
+                axis=-1, zi=decay * avg[..., period:period + 1]
+            )
+
+    # Calculate RS and RSI (the leading zero averages give 0/0, masked by the where)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = np.where(avg_loss != 0, avg_gain / avg_loss, 0)
+    return 100 - (100 / (1 + rs))
+
+
+def stochastic_k(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                 highest_high: np.ndarray, lowest_low: np.ndarray, period: int) -> np.ndarray:
+    """
+    %K from precomputed rolling extremes: 0 before the first full window and
+    50 where the window has no range
+    """
+    k_values = np.zeros(np.shape(close))
+
+    full = slice(period - 1, None)
+    price_range = highest_high[..., full] - lowest_low[..., full]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k_values[..., full] = np.where(
+            price_range != 0,
+            100 * (close[..., full] - lowest_low[..., full]) / price_range,
+            50
+        )
+
+    return k_values
+
+
+def ema_warmup(period: int, tolerance: float) -> int:
+    """Values after which an EMA's seed weighs less than tolerance"""
+    return math.ceil(math.log(tolerance) / math.log(1 - 2 / (period + 1)))
+
+
+class IndicatorEngine:
+    """
+    Memoized indicator primitives over a set of named series
+
+    Series are 1-D, or 2-D (symbols x bars) to compute every symbol at once
+    along the time axis; each row of a 2-D result equals the 1-D result for
+    that symbol bit for bit.
+
+    Every primitive (SMA, EMA, rolling std/min/max, RSI) is computed once per
+    (series, period) and reused by whatever is built on it: MACD reads the
+    same EMA(12) as the ema_12 indicator, the Bollinger middle band is the
+    SMA(20) and so on. Derived series (the MACD line, %K) are registered as
+    series themselves so their EMAs are cached the same way.
+
+    With last_only=True the inputs are cut to the tail the current values
+    depend on. SMA, std and min/max windows are exact; recursive indicators
+    (EMA, MACD, Wilder RSI) get enough warm-up that the dropped history
+    weighs less than tolerance.
+    """
+
+    def __init__(
+        self,
+        close: np.ndarray,
+        high: Optional[np.ndarray] = None,
+        low: Optional[np.ndarray] = None,
+        volume: Optional[np.ndarray] = None,
+        last_only: bool = False,
+        tolerance: float = 1e-12
+    ):
+        """
+        Args:
+            close: Close prices, shape (bars,) or (symbols, bars)
+            high: High prices (default close), same shape
+            low: Low prices (default close), same shape
+            volume: Volume data (optional), same shape
+            last_only: Only evaluate the tail needed for the latest values
+            tolerance: Relative weight of dropped history allowed in last_only mode
+        """
+        series = {'close': close, 'high': close if high is None else high, 'low': close if low is None else low}
+        if volume is not None:
+            series['volume'] = volume
+
+        if last_only:
+            tail = self.tail_length(tolerance)
+            series = {name: np.asarray(values)[..., -tail:] for name, values in series.items()}
+
+        self._series: Dict[str, np.ndarray] = {name: np.asarray(values) for name, values in series.items()}
+        self._cache: Dict[Hashable, object] = {}
+
+    @staticmethod
+    def tail_length(tolerance: float = 1e-12) -> int:
+        """Rows of history the latest value of every indicator in summary() depends on"""
+        wilder_warmup = math.ceil(math.log(tolerance) / math.log(1 - 1 / 14))
+
+        return max(
+            50,  # SMA(50)
+            21,  # Bollinger std window
+            ema_warmup(26, tolerance) + ema_warmup(9, tolerance),  # MACD signal over the MACD line
+            ema_warmup(12, tolerance),
+            14 + 1 + wilder_warmup,  # RSI
+            14 + ema_warmup(3, tolerance)  # %D over %K
+        ) + 1
+
+    def series(self, name: str) -> np.ndarray:
+        return self._series[name]
+
+    def add_series(self, name: str, values: np.ndarray):
+        """Register a derived series so primitives over it are cached too"""
+        self._series[name] = values
+
+    def _cached(self, key: Hashable, compute: Callable[[], object]):
+        value = self._cache.get(key)
+        if value is None:
+            value = self._cache[key] = compute()
+        return value
+
+    # Primitives
+
+    def sma(self, name: str, period: int) -> np.ndarray:
+        return self._cached(('sma', name, period), lambda: sma(self._series[name], period))
+
+    def ema(self, name: str, period: int) -> np.ndarray:
+        return self._cached(('ema', name, period), lambda: ema(self._series[name], period))
+
+    def rolling_std(self, name: str, period: int) -> np.ndarray:
+        return self._cached(('std', name, period), lambda: rolling_std(self._series[name], period))
+
+    def rolling_max(self, name: str, period: int) -> np.ndarray:
+        return self._cached(('max', name, period), lambda: rolling_max(self._series[name], period))
+
+    def rolling_min(self, name: str, period: int) -> np.ndarray:
+        return self._cached(('min', name, period), lambda: rolling_min(self._series[name], period))
+
+    def rsi(self, period: int = 14) -> np.ndarray:
+        return self._cached(('rsi', 'close', period), lambda: rsi(self._series['close'], period))
+
+    # Composite indicators
+
+    def macd(
+        self,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """MACD, signal line and histogram, sharing the close EMAs"""
+        def compute():
+            line = self.ema('close', fast_period) - self.ema('close', slow_period)
+            name = f"macd_{fast_period}_{slow_period}"
+            self.add_series(name, line)
+            signal = self.ema(name, signal_period)
+            return line, signal, line - signal
+
+        return self._cached(('macd', fast_period, slow_period, signal_period), compute)
+
+    def bollinger_bands(
+        self,
+        period: int = 20,
+        std_dev: float = 2.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Upper band, middle band (the shared SMA) and lower band"""
+        def compute():
+            middle_band = self.sma('close', period)
+            close = self._series['close']
+            if middle_band.shape[-1] == 0:
+                raise ValueError(f"Bollinger bands need at least {period} prices, got {close.shape[-1]}")
+
+            # Pad to match price length
+            missing = close.shape[-1] - middle_band.shape[-1]
+            if missing > 0:
+                padding = np.repeat(middle_band[..., :1], missing, axis=-1)
+                middle_band = np.concatenate([padding, middle_band], axis=-1)
+
+            std = self.rolling_std('close', period)
+            return middle_band + (std_dev * std), middle_band, middle_band - (std_dev * std)
+
+        return self._cached(('bollinger', period, std_dev), compute)
+
+    def stochastic(self, period: int = 14) -> Tuple[np.ndarray, np.ndarray]:
+        """%K and %D (3-period EMA of %K)"""
+        def compute():
+            k_values = stochastic_k(
+                self._series['high'],
+                self._series['low'],
+                self._series['close'],
+                self.rolling_max('high', period),
+                self.rolling_min('low', period),
+                period
+            )
+            name = f"stoch_k_{period}"
+            self.add_series(name, k_values)
+            return k_values, self.ema(name, 3)
+
+        return self._cached(('stochastic', period), compute)
+
+    def history(self) -> Dict[str, np.ndarray]:
+        """
+        Every indicator at every bar, shaped like the close series
+
+        Bar t holds what summary() (and so analyze_indicators) gives for the
+        series cut after bar t. The first 19 bars are warm-up: they have no
+        full Bollinger window, and analyze_indicators would raise there.
+        """
+        close = self._series['close']
+
+        def full_length(values: np.ndarray, fallback: np.ndarray) -> np.ndarray:
+            # Windowed series start once the first window is full; before
+            # that summary() falls back to the current value
+            missing = fallback.shape[-1] - values.shape[-1]
+            return np.concatenate([fallback[..., :missing], values], axis=-1) if missing else values
+
+        upper_bb, middle_bb, lower_bb = self.bollinger_bands()
+        macd, signal, histogram = self.macd()
+        stoch_k, stoch_d = self.stochastic()
+
+        band_width = upper_bb - lower_bb
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bb_position = np.where(band_width != 0, (close - lower_bb) / band_width, 0.5)
+
+        indicators = {
+            'price': close,
+            'sma_20': full_length(self.sma('close', 20), close),
+            'sma_50': full_length(self.sma('close', 50), close),
+            'ema_12': self.ema('close', 12),
+            'rsi': self.rsi(),
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_histogram': histogram,
+            'bb_upper': upper_bb,
+            'bb_middle': middle_bb,
+            'bb_lower': lower_bb,
+            'stoch_k': stoch_k,
+            'stoch_d': stoch_d,
+            'bb_position': bb_position
+        }
+
+        if 'volume' in self._series:
+            volume = self._series['volume']
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = volume[..., 19:] / self.sma('volume', 20)
+            indicators['volume_ratio'] = full_length(ratio, np.ones(volume.shape))
+
+        return indicators
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Latest value of every indicator, as TradingSignalsGenerator.analyze_indicators
+        returns (arrays with one value per symbol for 2-D series)
+        """
+        indicators = {key: values[..., -1] for key, values in self.history().items()}
+
+        # Scalars rather than 0-d arrays for a single series
+        if self._series['close'].ndim == 1:
+            indicators = {key: np.float64(value) for key, value in indicators.items()}
+
+        return indicators
@@ -0,0 +1,110 @@
+"""
+Single-file Model Bundles
+Flat safetensors-layout files of named arrays plus a string metadata header,
+read back as zero-copy memory-mapped views
+"""
+
+from typing import Dict, Tuple
+import json
+import struct
+
+import numpy as np
+
+# safetensors dtype names for the dtypes we store
+DTYPES = {
+    'F64': np.float64,
+    'F32': np.float32,
+    'F16': np.float16,
+    'I64': np.int64,
+    'I32': np.int32,
+    'U8': np.uint8,
+    'BOOL': np.bool_
+}
+_DTYPE_NAMES = {np.dtype(dtype): name for name, dtype in DTYPES.items()}
+
+# Header size is padded to this, so the data section starts 8-byte aligned
+_ALIGNMENT = 8
+
+
+def write_bundle(path: str, arrays: Dict[str, np.ndarray], metadata: Dict[str, str]):
+    """
+    Write named arrays and metadata to one file
+
+    The layout is the safetensors one: an 8-byte little-endian header size,
+    a JSON header with each array's dtype, shape and byte range (plus
+    '__metadata__'), then the raw little-endian array bytes back to back.
+
+    Args:
+        path: Output file
+        arrays: Name -> array (any dtype in DTYPES)
+        metadata: String key/value pairs stored in the header
+    """
+    header = {'__metadata__': {key: str(value) for key, value in metadata.items()}}
+    blobs = []
+    offset = 0
+
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    for name, array in arrays.items():
+        if array.dtype not in _DTYPE_NAMES:
+            raise ValueError(f"Unsupported dtype {array.dtype} for '{name}'")
+
+    # Widest dtypes first keeps every array aligned to its itemsize without
+    # padding (safetensors requires the byte ranges to be back to back)
+    for name in sorted(arrays, key=lambda name: -arrays[name].dtype.itemsize):
+        array = arrays[name]
+
+        blob = array.astype(array.dtype.newbyteorder('<'), copy=False).tobytes()
+        header[name] = {
+            'dtype': _DTYPE_NAMES[array.dtype],
+            'shape': list(array.shape),
+            'data_offsets': [offset, offset + len(blob)]
+        }
+        blobs.append(blob)
+        offset += len(blob)
+
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    header_bytes += b' ' * (-len(header_bytes) % _ALIGNMENT)
+
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for blob in blobs:
+            f.write(blob)
+
+
+def read_bundle(path: str) -> Tuple[Dict[str, np.ndarray], Dict[str, str]]:
+    """
+    Memory-map a bundle written by write_bundle
+
+    Nothing is copied or unpickled: every array is a view into one
+    copy-on-write mapping of the file, so pages are read from disk on first
+    touch and shared between processes mapping the same file.
+
+    Args:
+        path: Bundle file
+
+    Returns:
+        Name -> array view, and the metadata header
+    """
+    with open(path, 'rb') as f:
+        (header_size,) = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_size))
+
+    metadata = header.pop('__metadata__', {})
+    data_start = 8 + header_size
+
+    if not header:
+        return {}, metadata
+
+    mapping = np.memmap(path, dtype=np.uint8, mode='c', offset=data_start)
+
+    arrays = {}
+    for name, info in header.items():
+        if info['dtype'] not in DTYPES:
+            raise ValueError(f"Unsupported dtype {info['dtype']} for '{name}' in {path}")
+
+        begin, end = info['data_offsets']
+        dtype = np.dtype(DTYPES[info['dtype']]).newbyteorder('<')
+        arrays[name] = mapping[begin:end].view(dtype).reshape(info['shape'])
+
+    return arrays, metadata
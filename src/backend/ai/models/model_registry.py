@@ -0,0 +1,122 @@
+"""
+Process-wide Model Registry
+Loads each model once on first use and shares it read-only across instances
+"""
+
+import gc
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Cache of loaded models keyed by what was loaded (name, device, backend, path)
+
+    Models handed out by the registry are shared by every instance in the
+    process, so callers must treat them as read-only. Populate the registry
+    in the master process before forking workers (gunicorn --preload, or a
+    uvicorn factory) and call freeze() so the weights stay shared
+    copy-on-write instead of being duplicated per worker.
+    """
+
+    def __init__(self):
+        self._models: Dict[Hashable, Any] = {}
+        self._load_times: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the model stored under key, loading it on first use
+
+        Args:
+            key: Hashable description of the model
+            loader: Zero-argument callable that loads the model
+
+        Returns:
+            The shared model object
+        """
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        # Per-key lock so concurrent first calls load once without blocking other keys
+        while True:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+            with key_lock:
+                # Evicted while waiting: start over with the key's new lock
+                if self._key_locks.get(key) is not key_lock:
+                    continue
+
+                model = self._models.get(key)
+                if model is None:
+                    start = time.perf_counter()
+                    model = loader()
+                    self._load_times[key] = time.perf_counter() - start
+                    self._models[key] = model
+                    logger.info(f"Loaded {key} in {self._load_times[key]:.2f}s")
+
+                return model
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._models
+
+    def evict(self, key: Hashable):
+        """
+        Drop a model so the next get() reloads it
+
+        Waits for a load of the key in progress, so that load cannot store
+        its model after the eviction.
+        """
+        while True:
+            with self._lock:
+                key_lock = self._key_locks.get(key)
+            if key_lock is None:
+                return
+
+            with key_lock:
+                with self._lock:
+                    # Evicted and reloaded under a new lock while waiting
+                    if self._key_locks.get(key) is not key_lock:
+                        continue
+
+                    self._models.pop(key, None)
+                    self._load_times.pop(key, None)
+                    # Callers still waiting on this lock see it is gone and retry
+                    del self._key_locks[key]
+                    return
+
+    def clear(self):
+        """Drop every loaded model (see evict)"""
+        with self._lock:
+            keys = list(self._key_locks)
+        for key in keys:
+            self.evict(key)
+
+    def freeze(self):
+        """
+        Move everything allocated so far out of the garbage collector's reach
+
+        Call after preloading and before forking. Otherwise the collector's
+        refcount and flag writes would touch the shared pages and each worker
+        would end up with private copies.
+        """
+        gc.collect()
+        gc.freeze()
+
+    def stats(self) -> Dict[str, Any]:
+        """Loaded keys with their load times in seconds"""
+        return {
+            'loaded': len(self._models),
+            'load_times': {str(key): t for key, t in self._load_times.items()}
+        }
+
+
+# Shared by every model wrapper in the process
+model_registry = ModelRegistry()
@@ -0,0 +1,300 @@
+"""
+Columnar OHLCV Store
+Append-only per-symbol candle files, memory-mapped so every worker reads the
+same pages as zero-copy NumPy views and sees live appends without reloading
+"""
+
+from typing import Dict, List, Optional, Tuple
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Column order on disk; open..volume are adjacent so they also form an
+# (n, 5) [open, high, low, close, volume] matrix view
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+DTYPES = {'timestamp': np.int64, 'open': np.float64, 'high': np.float64,
+          'low': np.float64, 'close': np.float64, 'volume': np.float64}
+
+MAGIC = int.from_bytes(b'OHLCV\x00\x00\x01', 'little')
+HEADER_BYTES = 64
+# Header slots (int64): magic, capacity, committed rows, superseded flag
+_MAGIC, _CAPACITY, _LENGTH, _SUPERSEDED = range(4)
+
+FILE_SUFFIX = '.ohlcv'
+
+
+class OHLCVSeries:
+    """
+    One symbol's candle file
+
+    Layout: a 64-byte header, then one block of `capacity` 8-byte slots per
+    column in COLUMNS order. The writer fills rows past the committed length
+    and only then bumps the length in the header, so readers never see a
+    partial row. Every reader maps the file shared, so each access to a
+    column sees rows appended since without reopening. When a file runs out
+    of capacity the writer moves the data to a bigger file and flags the old
+    one superseded, and readers switch over on their next access.
+
+    One writer per symbol; any number of readers in any process.
+    """
+
+    def __init__(self, path: str, writable: bool = False):
+        """
+        Args:
+            path: Candle file (create it with OHLCVSeries.create)
+            writable: Open for append (only the single writer should)
+        """
+        self.path = path
+        self.writable = writable
+        self._map()
+
+    @classmethod
+    def create(cls, path: str, capacity: int = 1 << 16) -> 'OHLCVSeries':
+        """
+        Create an empty candle file and open it for append
+
+        Args:
+            path: File to create (must not exist)
+            capacity: Rows to reserve before the file has to grow
+
+        Returns:
+            Writable OHLCVSeries
+        """
+        if os.path.exists(path):
+            raise ValueError(f"{path} already exists")
+
+        cls._write_empty(path, capacity)
+        return cls(path, writable=True)
+
+    @staticmethod
+    def _write_empty(path: str, capacity: int):
+        header = np.zeros(HEADER_BYTES // 8, dtype='<i8')
+        header[_MAGIC] = MAGIC
+        header[_CAPACITY] = capacity
+
+        with open(path, 'wb') as f:
+            f.write(header.tobytes())
+            # Unwritten column space stays sparse on disk
+            f.truncate(HEADER_BYTES + len(COLUMNS) * capacity * 8)
+
+    def _map(self):
+        self._mapping = np.memmap(self.path, dtype=np.uint8, mode='r+' if self.writable else 'r')
+        self._header = self._mapping[:HEADER_BYTES].view('<i8')
+        if self._header[_MAGIC] != MAGIC:
+            raise ValueError(f"{self.path} is not an OHLCV candle file")
+
+        self.capacity = int(self._header[_CAPACITY])
+        self._columns: Dict[str, np.ndarray] = {}
+        for i, name in enumerate(COLUMNS):
+            start = HEADER_BYTES + i * self.capacity * 8
+            self._columns[name] = self._mapping[start:start + self.capacity * 8].view(
+                np.dtype(DTYPES[name]).newbyteorder('<')
+            )
+
+    def _current(self):
+        """Follow the writer to a grown file"""
+        if self._header[_SUPERSEDED]:
+            self._map()
+
+    def __len__(self) -> int:
+        self._current()
+        return int(self._header[_LENGTH])
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Zero-copy, read-only view of one column's committed rows
+
+        The view is fixed at the length when it was taken; call again (or use
+        the properties) to include later appends. It is read-only even on the
+        writer's series; write through append().
+        """
+        if name not in self._columns:
+            raise ValueError(f"Unknown column '{name}', expected one of {COLUMNS}")
+        n_rows = len(self)
+        view = self._columns[name][:n_rows].view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self.column('timestamp')
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.column('open')
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.column('high')
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.column('low')
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.column('close')
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.column('volume')
+
+    def ohlcv(self) -> np.ndarray:
+        """
+        Zero-copy (n, 5) [open, high, low, close, volume] view, the candle
+        matrix CryptoPricePredictor takes (strided: one column block apart)
+        """
+        n_rows = len(self)
+        first = self._columns['open']
+        return np.lib.stride_tricks.as_strided(
+            first, shape=(n_rows, 5), strides=(8, self.capacity * 8), writeable=False
+        )
+
+    def signal_inputs(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """close, high, low and volume views, in TradingSignalsGenerator.analyze_indicators order"""
+        return self.close, self.high, self.low, self.volume
+
+    def append(
+        self,
+        timestamp,
+        open,
+        high,
+        low,
+        close,
+        volume,
+        flush: bool = False
+    ):
+        """
+        Append one candle or a batch of candles
+
+        Args:
+            timestamp: Candle open time(s), integers strictly after the last stored one
+            open, high, low, close, volume: Value(s) matching timestamp
+            flush: Write the pages to disk before returning
+        """
+        if not self.writable:
+            raise ValueError(f"{self.path} is open read-only")
+
+        values = {
+            'timestamp': np.atleast_1d(np.asarray(timestamp, dtype=np.int64)),
+            'open': open, 'high': high, 'low': low, 'close': close, 'volume': volume
+        }
+        n_new = len(values['timestamp'])
+        for name in COLUMNS[1:]:
+            values[name] = np.atleast_1d(np.asarray(values[name], dtype=np.float64))
+            if len(values[name]) != n_new:
+                raise ValueError(f"Expected {n_new} {name} values, got {len(values[name])}")
+        if n_new == 0:
+            return
+
+        n_rows = int(self._header[_LENGTH])
+        timestamps = values['timestamp']
+        if np.any(np.diff(timestamps) <= 0) or (n_rows and timestamps[0] <= self._columns['timestamp'][n_rows - 1]):
+            raise ValueError("Timestamps must be strictly increasing")
+
+        if n_rows + n_new > self.capacity:
+            self._grow(max(2 * self.capacity, n_rows + n_new))
+
+        for name in COLUMNS:
+            self._columns[name][n_rows:n_rows + n_new] = values[name]
+
+        # Publish the rows only once they are all written
+        self._header[_LENGTH] = n_rows + n_new
+
+        if flush:
+            self._mapping.flush()
+
+    def _grow(self, capacity: int):
+        """Move the data to a file with more capacity and point readers at it"""
+        n_rows = int(self._header[_LENGTH])
+        logger.info(f"Growing {self.path} from {self.capacity} to {capacity} rows")
+
+        staging = self.path + '.grow'
+        self._write_empty(staging, capacity)
+        grown = OHLCVSeries(staging, writable=True)
+        for name in COLUMNS:
+            grown._columns[name][:n_rows] = self._columns[name][:n_rows]
+        grown._header[_LENGTH] = n_rows
+        grown._mapping.flush()
+        del grown
+
+        old_header = self._header
+        os.replace(staging, self.path)
+        # Readers still mapping the old file re-open the path on next access
+        old_header[_SUPERSEDED] = 1
+        self._mapping.flush()
+        self._map()
+
+
+class OHLCVStore:
+    """
+    Directory of per-symbol candle files (<root>/<symbol>.ohlcv)
+
+    Opened series are cached, so repeated reads in a worker reuse one
+    mapping.
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Store directory (created if missing)
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._series: Dict[Tuple[str, bool], OHLCVSeries] = {}
+
+    def path(self, symbol: str) -> str:
+        if not symbol or os.sep in symbol or symbol.startswith('.'):
+            raise ValueError(f"Invalid symbol '{symbol}'")
+        return os.path.join(self.root, symbol + FILE_SUFFIX)
+
+    def symbols(self) -> List[str]:
+        """Symbols with a candle file, sorted"""
+        return sorted(
+            name[:-len(FILE_SUFFIX)] for name in os.listdir(self.root) if name.endswith(FILE_SUFFIX)
+        )
+
+    def series(self, symbol: str, writable: bool = False) -> OHLCVSeries:
+        """
+        Open a symbol's candle file
+
+        Args:
+            symbol: Symbol name
+            writable: Open for append, creating the file if needed (one
+                writer per symbol)
+
+        Returns:
+            OHLCVSeries
+        """
+        key = (symbol, writable)
+        if key not in self._series:
+            path = self.path(symbol)
+            if writable and not os.path.exists(path):
+                self._series[key] = OHLCVSeries.create(path)
+            elif not os.path.exists(path):
+                raise ValueError(f"No candle file for '{symbol}' in {self.root}")
+            else:
+                self._series[key] = OHLCVSeries(path, writable=writable)
+
+        return self._series[key]
+
+    def append(self, symbol: str, timestamp, open, high, low, close, volume, flush: bool = False):
+        """Append candles for a symbol (see OHLCVSeries.append)"""
+        self.series(symbol, writable=True).append(timestamp, open, high, low, close, volume, flush=flush)
+
+    def ohlcv(self, symbol: str, last: Optional[int] = None) -> np.ndarray:
+        """
+        Zero-copy (n, 5) candle matrix for CryptoPricePredictor
+
+        Args:
+            symbol: Symbol name
+            last: Only the most recent rows (default all; 0 gives no rows)
+        """
+        if last is not None and last < 0:
+            raise ValueError(f"last must be non-negative, got {last}")
+
+        data = self.series(symbol).ohlcv()
+        return data if last is None else data[max(len(data) - last, 0):]
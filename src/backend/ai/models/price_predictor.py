@@ -5,12 +5,23 @@ Provides 24h, 7d, and 30d price forecasts with confidence intervals
 
 import torch
 import torch.nn as nn
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler, SequentialSampler
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import itertools
+import json
+import multiprocessing as mp
+import time
 import joblib
+import os
 from sklearn.preprocessing import MinMaxScaler
 import logging
 
+from models.model_bundle import read_bundle, write_bundle
+from models.model_registry import model_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,84 +81,301 @@ class LSTMPricePredictor(nn.Module):
         return out
 
 
+class MultiHeadPricePredictor(nn.Module):
+    """
+    Shared LSTM + attention trunk with one fully connected head per horizon
+
+    Same layers as LSTMPricePredictor, but the recurrent trunk runs once per
+    input and every head reads the same attention context. forward returns
+    one column per head.
+    """
+
+    def __init__(
+        self,
+        n_heads: int = 3,
+        input_size: int = 10,
+        hidden_size: int = 128,
+        num_layers: int = 3,
+        dropout: float = 0.2
+    ):
+        super(MultiHeadPricePredictor, self).__init__()
+
+        self.hidden_size = hidden_size
+        self.num_layers = num_layers
+
+        # Shared trunk
+        self.lstm = nn.LSTM(
+            input_size=input_size,
+            hidden_size=hidden_size,
+            num_layers=num_layers,
+            dropout=dropout,
+            batch_first=True
+        )
+        self.attention = nn.Linear(hidden_size, 1)
+
+        # Per-horizon heads
+        self.heads = nn.ModuleList([
+            nn.Sequential(
+                nn.Linear(hidden_size, 64),
+                nn.ReLU(),
+                nn.Dropout(dropout),
+                nn.Linear(64, 32),
+                nn.ReLU(),
+                nn.Dropout(dropout),
+                nn.Linear(32, 1)
+            )
+            for _ in range(n_heads)
+        ])
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        lstm_out, (hidden, cell) = self.lstm(x)
+
+        attention_weights = torch.softmax(self.attention(lstm_out), dim=1)
+        context = torch.sum(attention_weights * lstm_out, dim=1)
+
+        return torch.cat([head(context) for head in self.heads], dim=1)
+
+
+class SequenceDataset(Dataset):
+    """
+    Lazy LSTM training windows over a feature matrix
+
+    Windows are a strided view of the features, so only the indexed
+    mini-batch is ever materialized. Indexing with a slice, list or tensor
+    of indices returns a whole batch in one gather.
+    """
+
+    def __init__(self, features: torch.Tensor, sequence_length: int):
+        """
+        Args:
+            features: Scaled feature matrix of shape (n_rows, n_features)
+            sequence_length: Rows per input sequence
+        """
+        self.features = features
+        self.sequence_length = sequence_length
+
+        # (n_windows, sequence_length, n_features) view, no copy
+        self.windows = features.unfold(0, sequence_length, 1).transpose(1, 2)
+
+        # Predict the close price of the row after each window
+        self.targets = features[sequence_length:, :1]
+
+    def __len__(self) -> int:
+        return max(0, len(self.features) - self.sequence_length)
+
+    def __getitem__(self, index) -> Tuple[torch.Tensor, torch.Tensor]:
+        if isinstance(index, slice):
+            index = range(*index.indices(len(self)))
+        if isinstance(index, range):
+            return self.windows[index.start:index.stop].contiguous(), self.targets[index.start:index.stop]
+        return self.windows[index], self.targets[index]
+
+
+def _fit_model_worker(job: Dict) -> Tuple[Dict[str, torch.Tensor], Dict[str, List[float]]]:
+    """Process pool entry point for CryptoPricePredictor.train_many"""
+    torch.set_num_threads(job['num_threads'])
+    torch.manual_seed(job['seed'])
+
+    model = job['model']
+    device = next(model.parameters()).device
+    dataset = SequenceDataset(torch.as_tensor(job['features'], device=device), job['sequence_length'])
+
+    history = CryptoPricePredictor._fit_model(model, dataset, job['n_train'], **job['options'])
+    return model.state_dict(), history
+
+
+class _RingBuffer:
+    """
+    Fixed number of most recent rows, readable oldest-first as a contiguous view
+
+    Every row is written twice, length apart, so the last `length` rows are
+    always one contiguous slice and push/view never copy the history.
+    """
+
+    def __init__(self, length: int, width: int):
+        self.length = length
+        self.buffer = np.zeros((2 * length, width))
+        self.position = 0
+        self.count = 0
+
+    def push(self, row: np.ndarray):
+        self.buffer[self.position] = row
+        self.buffer[self.position + self.length] = row
+        self.position = (self.position + 1) % self.length
+        self.count += 1
+
+    def view(self) -> np.ndarray:
+        return self.buffer[self.position:self.position + self.length]
+
+
 class CryptoPricePredictor:
     """
     Wrapper class for price prediction with data preprocessing and postprocessing
     """
 
+    # models key of the shared-trunk network in multi-head mode
+    MULTI_HEAD = 'multi_head'
+
     def __init__(
         self,
         sequence_length: int = 60,
-        device: str = 'cpu'
+        device: str = 'cpu',
+        multi_head: bool = False
     ):
+        """
+        Args:
+            sequence_length: Feature rows per input sequence
+            device: Torch device
+            multi_head: Use one shared-trunk network with a head per horizon
+                instead of a separate LSTM per horizon
+        """
         self.sequence_length = sequence_length
         self.device = torch.device(device)
         self.scaler = MinMaxScaler()
+        self.multi_head = multi_head
 
-        # Initialize models for different time horizons
-        self.models = {
-            '24h': LSTMPricePredictor(input_size=10).to(self.device),
-            '7d': LSTMPricePredictor(input_size=10).to(self.device),
-            '30d': LSTMPricePredictor(input_size=10).to(self.device)
-        }
+        # Optional per-symbol scalers for predict_many, see fit_asset_scaler
+        self.asset_scalers: Dict[str, MinMaxScaler] = {}
+
+        # Models for different time horizons are built on first use
+        self.horizons = ['24h', '7d', '30d']
+        self._models = None
+        self._shared_models = False
+
+        # Train-mode twins of the models for MC dropout, see _dropout_model
+        self._dropout_twins: Dict[str, Tuple[nn.Module, nn.Module]] = {}
 
         self.is_trained = False
+        self.training_history: Dict[str, Dict[str, List[float]]] = {}
+
+        # Streaming state, set up by start_stream
+        self._stream_candles = None
+        self._stream_rows = None
+        self._stream_ema_weights = None
+
+    @property
+    def models(self) -> Dict[str, nn.Module]:
+        """Per-horizon models (or the single multi-head model), built on first access"""
+        if self._models is None:
+            self._models = self._build_models()
+        return self._models
+
+    @models.setter
+    def models(self, models: Dict[str, nn.Module]):
+        self._models = models
+        self._shared_models = False
+
+    def _build_models(self) -> Dict[str, nn.Module]:
+        """Fresh, untrained models for every horizon, in eval mode like loaded ones"""
+        if self.multi_head:
+            return {
+                self.MULTI_HEAD: MultiHeadPricePredictor(n_heads=len(self.horizons), input_size=10).to(self.device).eval()
+            }
+        return {
+            horizon: LSTMPricePredictor(input_size=10).to(self.device).eval()
+            for horizon in self.horizons
+        }
+
+    # Rows of history each feature vector looks at (current row included)
+    FEATURE_WINDOW = 21
 
-    def prepare_features(self, data: np.ndarray) -> np.ndarray:
+    # Bump whenever prepare_features changes what the models were trained on
+    FEATURE_VERSION = 1
+
+    def prepare_features(self, data: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
         """
         Extract technical features from raw price data
 
+        Every row from index 20 on gets features computed over the 21 rows
+        ending at it. Windows are strided views of data and are processed
+        chunk_size rows at a time, so temporaries stay bounded.
+
         Args:
             data: Array of shape (n_samples, n_features)
+            chunk_size: Rows of output computed per vectorized step
 
         Returns:
             Feature array with additional technical indicators
         """
         # Assuming input has: [open, high, low, close, volume]
-        features = []
-
-        for i in range(len(data)):
-            if i < 20:  # Need history for indicators
-                continue
-
-            window = data[i-20:i+1]
-
-            # Price features
-            close_prices = window[:, 3]  # Close price
-            volumes = window[:, 4]
-
-            # Moving averages
-            sma_7 = np.mean(close_prices[-7:])
-            sma_20 = np.mean(close_prices)
-            ema_7 = self._calculate_ema(close_prices, 7)
-
-            # Volatility
-            returns = np.diff(close_prices) / close_prices[:-1]
-            volatility = np.std(returns)
-
-            # Momentum indicators
-            rsi = self._calculate_rsi(close_prices)
-            macd, signal = self._calculate_macd(close_prices)
-
-            # Volume indicators
-            volume_sma = np.mean(volumes)
-
-            feature_vector = [
-                close_prices[-1],  # Current price
-                sma_7 / close_prices[-1],  # SMA ratio
-                sma_20 / close_prices[-1],
-                ema_7 / close_prices[-1],
-                volatility,
-                rsi,
-                macd,
-                signal,
-                volumes[-1] / volume_sma,  # Volume ratio
-                (close_prices[-1] - close_prices[0]) / close_prices[0]  # Period return
-            ]
-
-            features.append(feature_vector)
+        data = np.asarray(data, dtype=np.float64)
+        window = self.FEATURE_WINDOW
+
+        if len(data) < window:
+            return np.empty((0, 10))
+
+        windows = np.lib.stride_tricks.sliding_window_view(data, (window, data.shape[1]))[:, 0]
+
+        # EMA over a window as a fixed linear filter
+        weights = {period: self._ema_weights(period, window) for period in (7, 12, 26)}
+
+        features = np.empty((len(windows), 10))
+        for start in range(0, len(windows), chunk_size):
+            chunk = windows[start:start + chunk_size]
+            features[start:start + len(chunk)] = self._window_features(chunk, weights)
+
+        return features
+
+    def _window_features(self, windows: np.ndarray, ema_weights: Dict[int, np.ndarray]) -> np.ndarray:
+        """Feature vectors for a stack of windows of shape (m, 21, n_features)"""
+        close_prices = windows[:, :, 3]  # Close price
+        volumes = windows[:, :, 4]
+        current = close_prices[:, -1]
+
+        # Moving averages
+        sma_7 = close_prices[:, -7:].mean(axis=1)
+        sma_20 = close_prices.mean(axis=1)
+        ema_7 = close_prices @ ema_weights[7]
+
+        # Volatility
+        returns = np.diff(close_prices, axis=1) / close_prices[:, :-1]
+        volatility = returns.std(axis=1)
+
+        # Momentum indicators
+        rsi = self._window_rsi(close_prices)
+        macd = close_prices @ ema_weights[12] - close_prices @ ema_weights[26]
+        signal = macd * 0.9  # Simplified signal (normally would be EMA of MACD)
+
+        # Volume indicators
+        volume_sma = volumes.mean(axis=1)
+
+        return np.column_stack([
+            current,  # Current price
+            sma_7 / current,  # SMA ratio
+            sma_20 / current,
+            ema_7 / current,
+            volatility,
+            rsi,
+            macd,
+            signal,
+            volumes[:, -1] / volume_sma,  # Volume ratio
+            (current - close_prices[:, 0]) / close_prices[:, 0]  # Period return
+        ])
+
+    @staticmethod
+    def _window_rsi(close_prices: np.ndarray, period: int = 14) -> np.ndarray:
+        """Row-wise _calculate_rsi for a stack of close windows"""
+        deltas = np.diff(close_prices, axis=1)[:, -period:]
+        avg_gain = np.where(deltas > 0, deltas, 0).mean(axis=1)
+        avg_loss = np.where(deltas < 0, -deltas, 0).mean(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+        return np.where(avg_loss == 0, 100.0, rsi)
+
+    @staticmethod
+    def _ema_weights(period: int, length: int) -> np.ndarray:
+        """
+        Weights w such that prices @ w equals _calculate_ema(prices, period)
+        for a window of the given length
+        """
+        multiplier = 2 / (period + 1)
+        decay = (1 - multiplier) ** np.arange(length - 1, -1, -1)
 
-        return np.array(features)
+        weights = multiplier * decay
+        weights[0] = decay[0]  # The seed value is the first price itself
+        return weights
 
     def _calculate_rsi(self, prices: np.ndarray, period: int = 14) -> float:
         """Calculate Relative Strength Index"""
@@ -194,78 +422,310 @@ class CryptoPricePredictor:
             features: Feature array
 
         Returns:
-            X: Input sequences, y: Target values
+            X: Input sequences as a read-only strided view of features (no copy),
+            y: Target values
         """
-        X, y = [], []
+        n_sequences = max(0, len(features) - self.sequence_length)
 
-        for i in range(len(features) - self.sequence_length):
-            X.append(features[i:i + self.sequence_length])
-            y.append(features[i + self.sequence_length, 0])  # Predict close price
+        windows = np.lib.stride_tricks.sliding_window_view(features, self.sequence_length, axis=0)
+        X = windows[:n_sequences].transpose(0, 2, 1)
+        y = features[self.sequence_length:, 0]  # Predict close price
 
-        return np.array(X), np.array(y)
+        return X, y
 
     def train(
         self,
         data: np.ndarray,
         epochs: int = 100,
         batch_size: int = 32,
-        learning_rate: float = 0.001
-    ):
+        learning_rate: float = 0.001,
+        validation_split: float = 0.1,
+        patience: Optional[int] = 10,
+        shuffle: bool = True,
+        num_threads: Optional[int] = None,
+        n_jobs: Optional[int] = None
+    ) -> Dict[str, Dict[str, List[float]]]:
         """
         Train the prediction models
 
+        The most recent validation_split of the sequences is held out. Each
+        model stops once the validation loss has not improved for patience
+        epochs, and ends with the weights from its best validation epoch.
+
         Args:
             data: Historical price data [open, high, low, close, volume]
-            epochs: Number of training epochs
+            epochs: Maximum number of training epochs
             batch_size: Batch size for training
             learning_rate: Learning rate
+            validation_split: Fraction of sequences held out for validation
+                (0 trains on everything for the full number of epochs)
+            patience: Epochs without validation improvement before stopping
+                (None to always run every epoch)
+            shuffle: Shuffle training batches every epoch
+            num_threads: Torch intra-op threads while training (default unchanged;
+                with n_jobs, the default is the CPU count split across processes)
+            n_jobs: Train each horizon model in its own process, up to n_jobs
+                at a time (None or 1 trains them one after another here)
+
+        Returns:
+            Per-model history with 'train_loss', 'val_loss' and 'epoch_seconds'
+            lists (one entry per epoch run)
         """
-        logger.info("Preparing features for training...")
-        features = self.prepare_features(data)
+        options = dict(
+            epochs=epochs,
+            batch_size=batch_size,
+            learning_rate=learning_rate,
+            patience=patience,
+            shuffle=shuffle
+        )
+        if n_jobs is not None and n_jobs > 1:
+            return self.train_many(
+                {None: self}, {None: data}, n_jobs, num_threads,
+                validation_split=validation_split, **options
+            )[None]
+
+        features_scaled, n_train = self._prepare_training(data, validation_split)
+
+        # Only the feature matrix goes to the device; windows are built per batch
+        dataset = SequenceDataset(
+            torch.as_tensor(features_scaled, device=self.device),
+            self.sequence_length
+        )
 
-        # Scale features
-        features_scaled = self.scaler.fit_transform(features)
+        previous_threads = torch.get_num_threads()
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+
+        history = {}
+        try:
+            # Train each model (a single pass per batch for the multi-head model)
+            for horizon, model in self.models.items():
+                logger.info(f"Training model for {horizon} horizon...")
+                history[horizon] = self._fit_model(model, dataset, n_train, **options)
+        finally:
+            torch.set_num_threads(previous_threads)
 
-        # Create sequences
-        X, y = self.create_sequences(features_scaled)
+        self.is_trained = True
+        self.training_history = history
+        logger.info("Training completed!")
 
-        # Convert to PyTorch tensors
-        X_tensor = torch.FloatTensor(X).to(self.device)
-        y_tensor = torch.FloatTensor(y).reshape(-1, 1).to(self.device)
+        return history
 
-        # Train each model
-        for horizon, model in self.models.items():
-            logger.info(f"Training model for {horizon} horizon...")
+    @classmethod
+    def train_many(
+        cls,
+        predictors: Dict[str, 'CryptoPricePredictor'],
+        data: Dict[str, np.ndarray],
+        n_jobs: Optional[int] = None,
+        num_threads: Optional[int] = None,
+        epochs: int = 100,
+        batch_size: int = 32,
+        learning_rate: float = 0.001,
+        validation_split: float = 0.1,
+        patience: Optional[int] = 10,
+        shuffle: bool = True
+    ) -> Dict[str, Dict[str, Dict[str, List[float]]]]:
+        """
+        Train several predictors (e.g. one per asset) with every model of
+        every predictor in its own process
 
-            optimizer = torch.optim.Adam(model.parameters(), lr=learning_rate)
-            criterion = nn.MSELoss()
+        Workers are spawned, so scripts calling this need the usual
+        if __name__ == '__main__' guard.
 
-            model.train()
-            for epoch in range(epochs):
-                total_loss = 0
+        Args:
+            predictors: Symbol -> predictor to train
+            data: Symbol -> historical price data for that predictor
+            n_jobs: Worker processes (default: one per model, at most the CPU count)
+            num_threads: Torch threads per worker (default: CPU count / workers)
+            epochs, batch_size, learning_rate, validation_split, patience,
+            shuffle: As in train()
 
-                for i in range(0, len(X_tensor), batch_size):
-                    batch_X = X_tensor[i:i + batch_size]
-                    batch_y = y_tensor[i:i + batch_size]
+        Returns:
+            Symbol -> the history train() would return for that predictor
+        """
+        options = dict(
+            epochs=epochs,
+            batch_size=batch_size,
+            learning_rate=learning_rate,
+            patience=patience,
+            shuffle=shuffle
+        )
 
-                    optimizer.zero_grad()
-                    outputs = model(batch_X)
-                    loss = criterion(outputs, batch_y)
-                    loss.backward()
-                    optimizer.step()
+        jobs = []
+        for symbol, predictor in predictors.items():
+            features_scaled, n_train = predictor._prepare_training(data[symbol], validation_split)
+            for name, model in predictor.models.items():
+                jobs.append({
+                    'symbol': symbol,
+                    'name': name,
+                    'model': model,
+                    'features': features_scaled,
+                    'sequence_length': predictor.sequence_length,
+                    'n_train': n_train,
+                    'options': options,
+                    # Drawn from the parent's RNG so a seeded run stays reproducible
+                    'seed': int(torch.randint(2**31 - 1, ()).item())
+                })
+
+        cpu_count = os.cpu_count() or 1
+        n_jobs = min(n_jobs or cpu_count, len(jobs)) or 1
+        # Cap threads per worker so n_jobs processes do not oversubscribe the cores
+        threads = num_threads or max(1, cpu_count // n_jobs)
+        for job in jobs:
+            job['num_threads'] = threads
+
+        logger.info(f"Training {len(jobs)} models in {n_jobs} processes with {threads} threads each...")
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=mp.get_context('spawn')) as pool:
+            results = list(pool.map(_fit_model_worker, jobs))
+
+        histories = {symbol: {} for symbol in predictors}
+        for job, (state_dict, history) in zip(jobs, results):
+            predictors[job['symbol']].models[job['name']].load_state_dict(state_dict)
+            histories[job['symbol']][job['name']] = history
+
+        for symbol, predictor in predictors.items():
+            predictor.is_trained = True
+            predictor.training_history = histories[symbol]
+        logger.info("Training completed!")
 
-                    total_loss += loss.item()
+        return histories
 
-                if (epoch + 1) % 10 == 0:
-                    logger.info(f"Epoch [{epoch+1}/{epochs}], Loss: {total_loss/len(X_tensor):.6f}")
+    def _prepare_training(self, data: np.ndarray, validation_split: float) -> Tuple[np.ndarray, int]:
+        """
+        Fit the scaler on data and return the scaled float32 features with the
+        number of training sequences (the rest are held out for validation)
+        """
+        if not 0 <= validation_split < 1:
+            raise ValueError("validation_split must be in [0, 1)")
 
-        self.is_trained = True
-        logger.info("Training completed!")
+        # Shared models and scaler are read-only, so train private copies
+        if self._shared_models:
+            self.models = {horizon: copy.deepcopy(model) for horizon, model in self.models.items()}
+            self.scaler = copy.deepcopy(self.scaler)
+
+        # Loaded models come back frozen
+        for model in self.models.values():
+            model.requires_grad_(True)
+
+        logger.info("Preparing features for training...")
+        features = self.prepare_features(data)
+
+        # Scale features
+        features_scaled = self.scaler.fit_transform(features).astype(np.float32)
+
+        # Hold out the most recent sequences so validation is always later than training
+        n_sequences = max(0, len(features_scaled) - self.sequence_length)
+        n_train = n_sequences - int(n_sequences * validation_split)
+        if n_train <= 0:
+            raise ValueError(f"Not enough data. Need more than {self.sequence_length} feature rows")
+
+        return features_scaled, n_train
+
+    @staticmethod
+    def _fit_model(
+        model: nn.Module,
+        dataset: SequenceDataset,
+        n_train: int,
+        epochs: int,
+        batch_size: int,
+        learning_rate: float,
+        patience: Optional[int],
+        shuffle: bool
+    ) -> Dict[str, List[float]]:
+        """
+        Train one model on the first n_train sequences of dataset, validating
+        on the rest
+
+        Returns:
+            Per-epoch 'train_loss', 'val_loss' and 'epoch_seconds'
+        """
+        # Whole mini-batches come out of one gather on the dataset
+        sampler = RandomSampler(range(n_train)) if shuffle else SequentialSampler(range(n_train))
+        loader = DataLoader(dataset, sampler=BatchSampler(sampler, batch_size, drop_last=False), batch_size=None)
+
+        optimizer = torch.optim.Adam(model.parameters(), lr=learning_rate)
+        criterion = nn.MSELoss()
+
+        history = {'train_loss': [], 'val_loss': [], 'epoch_seconds': []}
+        best_loss = float('inf')
+        best_state = None
+        stale_epochs = 0
+
+        for epoch in range(epochs):
+            start = time.perf_counter()
+
+            model.train()
+            total_loss = 0.0
+            for batch_X, batch_y in loader:
+                optimizer.zero_grad()
+                outputs = model(batch_X)
+                # Averaged over heads when the model has several
+                loss = criterion(outputs, batch_y.expand_as(outputs))
+                loss.backward()
+                optimizer.step()
+
+                total_loss += loss.item()
+
+            history['train_loss'].append(total_loss / len(loader))
+            history['val_loss'].append(CryptoPricePredictor._validation_loss(model, dataset, n_train))
+            history['epoch_seconds'].append(time.perf_counter() - start)
+
+            val_loss = history['val_loss'][-1]
+            if (epoch + 1) % 10 == 0:
+                logger.info(
+                    f"Epoch [{epoch+1}/{epochs}], Loss: {history['train_loss'][-1]:.6f}, "
+                    f"Val Loss: {val_loss:.6f}, Time: {history['epoch_seconds'][-1]:.2f}s"
+                )
+
+            if n_train == len(dataset):
+                continue
+
+            if val_loss < best_loss:
+                best_loss = val_loss
+                best_state = copy.deepcopy(model.state_dict())
+                stale_epochs = 0
+            else:
+                stale_epochs += 1
+                if patience is not None and stale_epochs >= patience:
+                    logger.info(f"Early stopping at epoch {epoch+1}, best Val Loss: {best_loss:.6f}")
+                    break
+
+        if best_state is not None:
+            model.load_state_dict(best_state)
+
+        # Predictions never switch modes themselves (see _dropout_model)
+        model.eval()
+
+        return history
+
+    @staticmethod
+    def _validation_loss(
+        model: nn.Module,
+        dataset: SequenceDataset,
+        start: int,
+        batch_size: int = 1024
+    ) -> float:
+        """Mean squared error over sequences from start to the end of dataset"""
+        if start >= len(dataset):
+            return float('nan')
+
+        model.eval()
+        total = 0.0
+        with torch.no_grad():
+            for i in range(start, len(dataset), batch_size):
+                batch_X, batch_y = dataset[i:i + batch_size]
+                outputs = model(batch_X)
+                total += torch.sum((outputs - batch_y) ** 2).item() / outputs.shape[1]
+
+        return total / (len(dataset) - start)
 
     def predict(
         self,
         data: np.ndarray,
-        horizons: List[str] = ['24h', '7d', '30d']
+        horizons: List[str] = ['24h', '7d', '30d'],
+        mc_samples: int = 0,
+        quantiles: Tuple[float, float] = (0.025, 0.975),
+        symbol: Optional[str] = None
     ) -> Dict[str, Dict[str, float]]:
         """
         Make predictions for specified time horizons
@@ -273,6 +733,14 @@ class CryptoPricePredictor:
         Args:
             data: Recent price data for prediction
             horizons: List of prediction horizons
+            mc_samples: Monte Carlo dropout samples per prediction. With 0 the
+                interval is the simplified +-1.96 std of recent closes; with K > 0
+                the inputs are repeated K times in one batched forward pass with
+                dropout on and the interval comes from the sample quantiles
+            quantiles: Lower and upper sample quantiles for the MC interval
+            symbol: Asset symbol; selects its scaler from fit_asset_scaler as in
+                predict_many. Without one, or for symbols without an asset
+                scaler, the scaler fitted in train() is used
 
         Returns:
             Dictionary with predictions and confidence intervals
@@ -280,38 +748,225 @@ class CryptoPricePredictor:
         if not self.is_trained:
             raise ValueError("Model must be trained before making predictions")
 
-        # Prepare features
-        features = self.prepare_features(data)
-        features_scaled = self.scaler.transform(features)
+        # Only the rows feeding the last sequence affect the prediction
+        history = self.sequence_length + self.FEATURE_WINDOW - 1
+        features = self.prepare_features(data[-history:])
 
         # Get last sequence
-        if len(features_scaled) < self.sequence_length:
+        if len(features) < self.sequence_length:
             raise ValueError(f"Not enough data. Need at least {self.sequence_length} samples")
 
+        scaler = self.asset_scalers.get(symbol, self.scaler)
+        features_scaled = scaler.transform(features)
         last_sequence = features_scaled[-self.sequence_length:]
-        X = torch.FloatTensor(last_sequence).unsqueeze(0).to(self.device)
 
-        predictions = {}
+        current_price = data[-1, 3]  # Close price
+        volatility = np.std(data[-20:, 3])
 
-        for horizon in horizons:
-            if horizon not in self.models:
-                continue
+        return self._predict_sequence(
+            last_sequence, current_price, volatility, horizons, mc_samples, quantiles, scaler
+        )
 
-            model = self.models[horizon]
-            model.eval()
+    def predict_many(
+        self,
+        data: Dict[str, np.ndarray],
+        horizons: List[str] = ['24h', '7d', '30d'],
+        mc_samples: int = 0,
+        quantiles: Tuple[float, float] = (0.025, 0.975)
+    ) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Make predictions for many assets with one forward pass per model
+
+        The last sequence of every symbol is stacked into a single batch, so
+        each horizon model runs once regardless of the number of symbols.
+        Symbols with a scaler from fit_asset_scaler use it; the rest use the
+        scaler fitted in train().
+
+        Args:
+            data: Symbol -> recent price data [open, high, low, close, volume]
+            horizons: List of prediction horizons
+            mc_samples, quantiles: Monte Carlo dropout options as in predict()
+
+        Returns:
+            Symbol -> the same dictionary predict() returns for that symbol
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
+
+        symbols = list(data)
+        if not symbols:
+            return {}
+
+        history = self.sequence_length + self.FEATURE_WINDOW - 1
+        candles = np.empty((len(symbols), history, 5))
+        for i, symbol in enumerate(symbols):
+            if len(data[symbol]) < history:
+                raise ValueError(f"Not enough data for {symbol}. Need at least {history} candles")
+            # Extra columns after volume are ignored, as in prepare_features
+            candles[i] = data[symbol][-history:, :5]
+
+        # Feature windows of every symbol in one vectorized pass:
+        # (n_symbols, sequence_length, 21, 5) -> (n_symbols * sequence_length, 21, 5)
+        windows = np.lib.stride_tricks.sliding_window_view(candles, self.FEATURE_WINDOW, axis=1)
+        windows = windows.transpose(0, 1, 3, 2).reshape(-1, self.FEATURE_WINDOW, candles.shape[2])
+        weights = {period: self._ema_weights(period, self.FEATURE_WINDOW) for period in (7, 12, 26)}
+        features = self._window_features(windows, weights).reshape(len(symbols), self.sequence_length, -1)
+
+        # MinMaxScaler.transform with each symbol's scale and offset
+        scalers = [self.asset_scalers.get(symbol, self.scaler) for symbol in symbols]
+        scale = np.stack([scaler.scale_ for scaler in scalers])[:, np.newaxis]
+        offset = np.stack([scaler.min_ for scaler in scalers])[:, np.newaxis]
+        sequences = (features * scale + offset).astype(np.float32)
+
+        current_prices = candles[:, -1, 3]  # Close price
+        volatilities = candles[:, -20:, 3].std(axis=1)
+
+        X = torch.from_numpy(sequences).to(self.device)
+        outputs = self._forward_horizons(X, horizons, mc_samples)
+
+        return {
+            symbol: self._format_predictions(
+                {horizon: pred[i] for horizon, pred in outputs.items()},
+                current_prices[i],
+                volatilities[i],
+                scalers[i],
+                quantiles
+            )
+            for i, symbol in enumerate(symbols)
+        }
+
+    def fit_asset_scaler(self, symbol: str, data: np.ndarray):
+        """
+        Fit a feature scaler for one symbol, used by predict_many instead of
+        the shared scaler so assets on very different price scales map into
+        the range the models were trained on
+
+        Args:
+            symbol: Asset symbol as used in predict_many
+            data: Historical price data for the symbol [open, high, low, close, volume]
+        """
+        self.asset_scalers[symbol] = MinMaxScaler().fit(self.prepare_features(data))
+
+    def start_stream(self, history: np.ndarray):
+        """
+        Prime streaming mode so each new candle costs O(1) work plus one forward pass
+
+        Every feature row only looks at the last 21 candles (indicators restart
+        in each window), so the streaming state is a ring buffer of those
+        candles plus a ring buffer of the last sequence_length scaled rows.
+
+        Args:
+            history: At least sequence_length + 20 recent candles [open, high, low, close, volume]
+        """
+        if not self.is_trained:
+            raise ValueError("Model must be trained before making predictions")
+
+        needed = self.sequence_length + self.FEATURE_WINDOW - 1
+        if len(history) < needed:
+            raise ValueError(f"Not enough data. Need at least {needed} candles to start a stream")
+
+        history = np.asarray(history[-needed:], dtype=np.float64)
+        features_scaled = self.scaler.transform(self.prepare_features(history))
+
+        self._stream_ema_weights = {
+            period: self._ema_weights(period, self.FEATURE_WINDOW) for period in (7, 12, 26)
+        }
+        self._stream_candles = _RingBuffer(self.FEATURE_WINDOW, history.shape[1])
+        self._stream_rows = _RingBuffer(self.sequence_length, features_scaled.shape[1])
+
+        for candle in history[-self.FEATURE_WINDOW:]:
+            self._stream_candles.push(candle)
+        for row in features_scaled:
+            self._stream_rows.push(row)
+
+    def update(
+        self,
+        candle: np.ndarray,
+        horizons: List[str] = ['24h', '7d', '30d'],
+        mc_samples: int = 0,
+        quantiles: Tuple[float, float] = (0.025, 0.975)
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Ingest one new candle in streaming mode and predict
+
+        Args:
+            candle: [open, high, low, close, volume]
+            horizons: List of prediction horizons
+            mc_samples, quantiles: Monte Carlo dropout options as in predict()
 
-            with torch.no_grad():
-                pred_scaled = model(X).cpu().numpy()[0, 0]
+        Returns:
+            Same dictionary as predict() over the full history
+        """
+        if self._stream_candles is None:
+            raise ValueError("Streaming mode not started. Call start_stream first.")
+
+        self._stream_candles.push(candle)
+        window = self._stream_candles.view()
+
+        features = self._window_features(window[np.newaxis], self._stream_ema_weights)
+
+        # MinMaxScaler.transform without the per-call validation overhead
+        self._stream_rows.push(features[0] * self.scaler.scale_ + self.scaler.min_)
+
+        current_price = window[-1, 3]
+        volatility = np.std(window[-20:, 3])
+
+        return self._predict_sequence(
+            self._stream_rows.view(), current_price, volatility, horizons, mc_samples, quantiles
+        )
+
+    def _predict_sequence(
+        self,
+        sequence: np.ndarray,
+        current_price: float,
+        volatility: float,
+        horizons: List[str],
+        mc_samples: int = 0,
+        quantiles: Tuple[float, float] = (0.025, 0.975),
+        scaler: Optional[MinMaxScaler] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Run the horizon models on one scaled sequence and build the result dict;
+        scaler is the one the sequence was scaled with (default: self.scaler)
+        """
+        X = torch.FloatTensor(sequence).unsqueeze(0).to(self.device)
+        outputs = self._forward_horizons(X, horizons, mc_samples)
+
+        return self._format_predictions(
+            {horizon: pred[0] for horizon, pred in outputs.items()},
+            current_price,
+            volatility,
+            scaler if scaler is not None else self.scaler,
+            quantiles
+        )
+
+    @staticmethod
+    def _format_predictions(
+        outputs: Dict[str, np.ndarray],
+        current_price: float,
+        volatility: float,
+        scaler: MinMaxScaler,
+        quantiles: Tuple[float, float] = (0.025, 0.975)
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Result dict for one asset from its scaled per-horizon predictions
 
+        A scalar prediction gets the simplified volatility band. An array of
+        MC dropout samples gets a predictive interval instead: the mean as the
+        prediction, the given sample quantiles as the bounds, and as the
+        confidence score the share of samples agreeing on the direction of
+        the move.
+        """
+        predictions = {}
+
+        for horizon, pred_scaled in outputs.items():
+            if np.ndim(pred_scaled) == 0:
                 # Inverse transform to get actual price
-                dummy = np.zeros((1, features_scaled.shape[1]))
+                dummy = np.zeros((1, scaler.n_features_in_))
                 dummy[0, 0] = pred_scaled
-                pred_price = self.scaler.inverse_transform(dummy)[0, 0]
+                pred_price = scaler.inverse_transform(dummy)[0, 0]
 
                 # Calculate confidence interval (simplified)
-                current_price = data[-1, 3]  # Close price
-                volatility = np.std(data[-20:, 3])
-
                 predictions[horizon] = {
                     'predicted_price': float(pred_price),
                     'current_price': float(current_price),
@@ -320,23 +975,295 @@ class CryptoPricePredictor:
                     'confidence_upper': float(pred_price + 1.96 * volatility),
                     'confidence_score': float(min(0.95, 1.0 - abs(pred_scaled) * 0.1))
                 }
+                continue
+
+            # MinMaxScaler.inverse_transform of the close column for every sample
+            samples = (np.asarray(pred_scaled, dtype=np.float64) - scaler.min_[0]) / scaler.scale_[0]
+            pred_price = samples.mean()
+            lower, upper = np.quantile(samples, quantiles)
+            direction = np.sign(pred_price - current_price)
+
+            predictions[horizon] = {
+                'predicted_price': float(pred_price),
+                'current_price': float(current_price),
+                'change_percent': float((pred_price - current_price) / current_price * 100),
+                'confidence_lower': float(lower),
+                'confidence_upper': float(upper),
+                'confidence_score': float(np.mean(np.sign(samples - current_price) == direction)),
+                'prediction_std': float(samples.std())
+            }
 
         return predictions
 
+    def _forward_horizons(
+        self,
+        X: torch.Tensor,
+        horizons: List[str],
+        mc_samples: int = 0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Scaled predictions for a batch of sequences
+
+        Args:
+            X: Scaled sequences of shape (batch, sequence_length, n_features)
+            horizons: Requested horizons; unknown ones are skipped
+            mc_samples: Stochastic forward passes with dropout on (0 for one
+                deterministic pass)
+
+        Returns:
+            Horizon -> predictions of shape (batch,), or (batch, mc_samples)
+            with MC dropout, in the order requested
+        """
+        with torch.no_grad():
+            if self.multi_head:
+                # Every head comes out of one forward call
+                outputs = self._run_model(self._model_for(self.MULTI_HEAD, mc_samples), X, mc_samples)
+                columns = {horizon: i for i, horizon in enumerate(self.horizons)}
+                return {horizon: outputs[..., columns[horizon]] for horizon in horizons if horizon in columns}
+
+            predictions = {}
+            for horizon in horizons:
+                if horizon not in self.models:
+                    continue
+
+                predictions[horizon] = self._run_model(self._model_for(horizon, mc_samples), X, mc_samples)[..., 0]
+
+            return predictions
+
+    # Upper bound on sequences per forward call when repeating inputs for MC dropout
+    MC_CHUNK_ROWS = 8192
+
+    def _model_for(self, name: str, mc_samples: int) -> nn.Module:
+        """The model to run: the eval-mode model, or its dropout twin for MC dropout"""
+        if not mc_samples:
+            return self.models[name]
+        return self._dropout_model(name)
+
+    def _dropout_model(self, name: str) -> nn.Module:
+        """
+        Train-mode twin of self.models[name] for MC dropout
+
+        The twin copies the module tree but shares the original's parameter
+        and buffer tensors, so dropout is switched on without flipping the
+        mode of a model that other threads and predictors may be running
+        (loaded models are shared process-wide by default). Train mode only
+        switches dropout on, as the models have no batch norm.
+        """
+        model = self.models[name]
+        cached = self._dropout_twins.get(name)
+        if cached is not None and cached[0] is model and all(
+            a is b for a, b in zip(model.parameters(), cached[1].parameters())
+        ):
+            return cached[1]
+
+        tensors = itertools.chain(model.parameters(), model.buffers())
+        twin = copy.deepcopy(model, {id(tensor): tensor for tensor in tensors}).train()
+        self._dropout_twins[name] = (model, twin)
+        return twin
+
+    @classmethod
+    def _run_model(cls, model: nn.Module, X: torch.Tensor, mc_samples: int) -> np.ndarray:
+        """
+        Model outputs of shape (batch, heads), or (batch, mc_samples, heads)
+        with every sequence repeated mc_samples times in one batched pass
+        (model must then be a dropout twin from _dropout_model)
+        """
+        if not mc_samples:
+            return model(X).cpu().numpy()
+
+        step = max(1, cls.MC_CHUNK_ROWS // mc_samples)
+        outputs = [
+            model(X[i:i + step].repeat_interleave(mc_samples, dim=0))
+            for i in range(0, len(X), step)
+        ]
+
+        return torch.cat(outputs).reshape(len(X), mc_samples, -1).cpu().numpy()
+
     def save_models(self, path: str):
         """Save trained models to disk"""
         for horizon, model in self.models.items():
             torch.save(model.state_dict(), f"{path}/lstm_{horizon}.pth")
 
         joblib.dump(self.scaler, f"{path}/scaler.pkl")
+        if self.asset_scalers:
+            joblib.dump(self.asset_scalers, f"{path}/asset_scalers.pkl")
         logger.info(f"Models saved to {path}")
 
-    def load_models(self, path: str):
-        """Load trained models from disk"""
-        for horizon, model in self.models.items():
-            model.load_state_dict(torch.load(f"{path}/lstm_{horizon}.pth", map_location=self.device))
-            model.eval()
+    def load_models(self, path: str, shared: bool = True):
+        """
+        Load trained models from disk
 
-        self.scaler = joblib.load(f"{path}/scaler.pkl")
+        Args:
+            path: Directory written by save_models
+            shared: Reuse the process-wide copy from model_registry, so every
+                predictor loading the same path shares one set of weights
+        """
+        if shared:
+            key = ('price', os.path.abspath(path), str(self.device), self.sequence_length, self.multi_head)
+            models, scaler, asset_scalers = model_registry.get(key, lambda: self._read_models(path))
+            self._models = models
+            self._shared_models = True
+        else:
+            self.models, scaler, asset_scalers = self._read_models(path)
+
+        self.scaler = scaler
+        # Own dict so fit_asset_scaler never touches the shared copy
+        self.asset_scalers = dict(asset_scalers)
         self.is_trained = True
         logger.info(f"Models loaded from {path}")
+
+    # MinMaxScaler state stored in bundles
+    SCALER_ARRAYS = ('min_', 'scale_', 'data_min_', 'data_max_', 'data_range_')
+
+    def save_bundle(self, path: str):
+        """
+        Save the whole model set to one memory-mappable file
+
+        Weights and scaler parameters are stored as flat arrays (safetensors
+        layout, see models.model_bundle) with a metadata header, so loading
+        needs no unpickling and no copies.
+
+        Args:
+            path: Output file, e.g. 'btc.bundle'
+        """
+        arrays = {}
+        for name, model in self.models.items():
+            for key, tensor in model.state_dict().items():
+                arrays[f"model.{name}.{key}"] = tensor.detach().cpu().numpy()
+
+        scalers = {'scaler': self.scaler}
+        scalers.update({f"asset_scaler.{symbol}": scaler for symbol, scaler in self.asset_scalers.items()})
+        for prefix, scaler in scalers.items():
+            for attribute in self.SCALER_ARRAYS:
+                arrays[f"{prefix}.{attribute}"] = getattr(scaler, attribute)
+
+        metadata = {
+            'format': 'crypto-price-predictor',
+            'feature_version': self.FEATURE_VERSION,
+            'sequence_length': self.sequence_length,
+            'input_size': 10,
+            'multi_head': int(self.multi_head),
+            'horizons': json.dumps(self.horizons),
+            'models': json.dumps(list(self.models)),
+            'asset_symbols': json.dumps(list(self.asset_scalers)),
+            'scaler_samples_seen': int(self.scaler.n_samples_seen_),
+            'feature_range': json.dumps(list(self.scaler.feature_range))
+        }
+
+        write_bundle(path, arrays, metadata)
+        logger.info(f"Model bundle saved to {path}")
+
+    def load_bundle(self, path: str, shared: bool = True):
+        """
+        Load a model set written by save_bundle
+
+        On CPU the weights are used in place from the memory-mapped file:
+        models are built without allocating weights and each parameter is a
+        view of the mapping, so loading costs a header parse and pages are
+        read on first use. sequence_length, multi_head and horizons are taken
+        from the bundle.
+
+        Args:
+            path: Bundle file
+            shared: Reuse the process-wide copy from model_registry
+        """
+        if shared:
+            key = ('price-bundle', os.path.abspath(path), str(self.device))
+            bundle = model_registry.get(key, lambda: self._read_bundle(path))
+        else:
+            bundle = self._read_bundle(path)
+
+        models, scaler, asset_scalers, metadata = bundle
+        self.sequence_length = int(metadata['sequence_length'])
+        self.multi_head = bool(int(metadata['multi_head']))
+        self.horizons = json.loads(metadata['horizons'])
+
+        self._models = models
+        self._shared_models = shared
+        self.scaler = scaler
+        # Own dict so fit_asset_scaler never touches the shared copy
+        self.asset_scalers = dict(asset_scalers)
+        self.is_trained = True
+        logger.info(f"Model bundle loaded from {path}")
+
+    def _read_bundle(
+        self,
+        path: str
+    ) -> Tuple[Dict[str, nn.Module], MinMaxScaler, Dict[str, MinMaxScaler], Dict[str, str]]:
+        """Map a bundle into frozen models, scalers and its metadata"""
+        arrays, metadata = read_bundle(path)
+
+        if metadata.get('format') != 'crypto-price-predictor':
+            raise ValueError(f"{path} is not a price predictor bundle")
+        if int(metadata['feature_version']) != self.FEATURE_VERSION:
+            raise ValueError(
+                f"{path} was trained on feature version {metadata['feature_version']}, "
+                f"this code computes version {self.FEATURE_VERSION}"
+            )
+        input_size = int(metadata['input_size'])
+        if input_size != 10:
+            raise ValueError(f"{path} expects {input_size} input features, prepare_features produces 10")
+
+        horizons = json.loads(metadata['horizons'])
+        on_cpu = self.device.type == 'cpu'
+
+        models = {}
+        for name in json.loads(metadata['models']):
+            prefix = f"model.{name}."
+            state_dict = {
+                key[len(prefix):]: torch.from_numpy(array)
+                for key, array in arrays.items() if key.startswith(prefix)
+            }
+
+            if name == self.MULTI_HEAD:
+                build = lambda: MultiHeadPricePredictor(n_heads=len(horizons), input_size=input_size)
+            else:
+                build = lambda: LSTMPricePredictor(input_size=input_size)
+
+            if on_cpu:
+                # No weight allocation or init; parameters become views of the mapping
+                with torch.device('meta'):
+                    model = build()
+                model.load_state_dict(state_dict, assign=True)
+            else:
+                model = build()
+                model.load_state_dict(state_dict)
+                model.to(self.device)
+
+            model.eval()
+            model.requires_grad_(False)
+            models[name] = model
+
+        feature_range = tuple(json.loads(metadata['feature_range']))
+        samples_seen = int(metadata['scaler_samples_seen'])
+
+        def make_scaler(prefix: str) -> MinMaxScaler:
+            scaler = MinMaxScaler(feature_range=feature_range)
+            for attribute in self.SCALER_ARRAYS:
+                setattr(scaler, attribute, np.array(arrays[f"{prefix}.{attribute}"]))
+            scaler.n_features_in_ = len(scaler.min_)
+            scaler.n_samples_seen_ = samples_seen
+            return scaler
+
+        asset_scalers = {
+            symbol: make_scaler(f"asset_scaler.{symbol}")
+            for symbol in json.loads(metadata['asset_symbols'])
+        }
+
+        return models, make_scaler('scaler'), asset_scalers, metadata
+
+    def _read_models(
+        self,
+        path: str
+    ) -> Tuple[Dict[str, nn.Module], MinMaxScaler, Dict[str, MinMaxScaler]]:
+        """Read per-horizon weights and the scalers into new, frozen models"""
+        models = self._build_models()
+        for horizon, model in models.items():
+            model.load_state_dict(torch.load(f"{path}/lstm_{horizon}.pth", map_location=self.device))
+            model.eval()
+            model.requires_grad_(False)
+
+        asset_scalers_path = f"{path}/asset_scalers.pkl"
+        asset_scalers = joblib.load(asset_scalers_path) if os.path.exists(asset_scalers_path) else {}
+
+        return models, joblib.load(f"{path}/scaler.pkl"), asset_scalers
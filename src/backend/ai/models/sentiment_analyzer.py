@@ -6,32 +6,307 @@ Analyzes social media sentiment from Twitter, Reddit, and news
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import numpy as np
-from typing import Dict, List
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+import hashlib
+import inspect
 import logging
+import os
 import re
+import threading
+import time
+
+from models.model_registry import model_registry
 
 logger = logging.getLogger(__name__)
 
 
+# URLs, mentions and special characters removed in one pass. The URL
+# alternatives come first and mentions stop where a URL starts, which keeps
+# the result identical to stripping URLs, mentions, hashtags and special
+# characters in separate passes.
+_CLEANUP_PATTERN = re.compile(
+    r'http\S+|www.\S+'
+    r'|@(?:(?!http\S|www.\S)\w)+'
+    r'|[^\w\s.,!?]'
+)
+
+
+def clean_text(text: str) -> str:
+    """Strip URLs, mentions, hashtag signs and special characters, collapse whitespace"""
+    return ' '.join(_CLEANUP_PATTERN.sub('', text).split())
+
+
+class KeywordMatcher:
+    """
+    Single-pass whole-word matcher for bullish/bearish keywords
+
+    Single-word keywords are looked up per word token, so the cost does not
+    grow with the keyword list. Multi-word phrases share one alternation.
+    """
+
+    _WORD_PATTERN = re.compile(r'\w+')
+
+    def __init__(self, bullish_keywords: List[str], bearish_keywords: List[str], step: float = 0.05):
+        """
+        Compile keyword lists for matching
+
+        Args:
+            bullish_keywords: Words or phrases that push sentiment positive
+            bearish_keywords: Words or phrases that push sentiment negative
+            step: Boost per distinct keyword found
+        """
+        self.step = step
+        self.polarity = {keyword.lower(): 1 for keyword in bullish_keywords}
+        self.polarity.update({keyword.lower(): -1 for keyword in bearish_keywords})
+
+        self.words = frozenset(k for k in self.polarity if self._WORD_PATTERN.fullmatch(k))
+        phrases = [k for k in self.polarity if k not in self.words]
+
+        # Longest first so a phrase never loses to one of its own prefixes
+        self.phrase_pattern = None
+        if phrases:
+            alternation = '|'.join(re.escape(p) for p in sorted(phrases, key=len, reverse=True))
+            self.phrase_pattern = re.compile(rf'\b(?:{alternation})\b')
+
+    def boost(self, text_lower: str) -> float:
+        """Net boost for a lowercased text, counting each keyword once"""
+        found = self.words.intersection(self._WORD_PATTERN.findall(text_lower))
+
+        if self.phrase_pattern is not None:
+            found = found.union(self.phrase_pattern.findall(text_lower))
+
+        return self.step * sum(self.polarity[keyword] for keyword in found)
+
+
+# Where the onnx backend keeps graphs it exports, one per model name and
+# version of its files, so processes and restarts reuse one export instead
+# of redoing it
+ONNX_CACHE_DIR = os.environ.get(
+    'SENTIMENT_ONNX_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'crypto-sentiment', 'onnx')
+)
+
+
+# Column order of SentimentColumns.probs and values of SentimentColumns.labels
+SENTIMENT_LABELS = ('positive', 'negative', 'neutral')
+
+# Scores given to texts that are empty after preprocessing
+_EMPTY_PROBS = (0.33, 0.33, 0.34)
+
+
+class SentimentColumns(NamedTuple):
+    """
+    Columnar sentiment results for N texts
+
+    probs: (N, 3) boosted probabilities in SENTIMENT_LABELS order
+    labels: (N,) index of the dominant sentiment in SENTIMENT_LABELS
+    text_lengths: (N,) cleaned text length, 0 for texts empty after preprocessing
+    """
+    probs: np.ndarray
+    labels: np.ndarray
+    text_lengths: np.ndarray
+
+    def to_results(self) -> List[Dict[str, float]]:
+        """Per-text result dicts, as returned by analyze_sentiment"""
+        results = []
+
+        for row, label, text_length in zip(self.probs.tolist(), self.labels.tolist(), self.text_lengths.tolist()):
+            if text_length == 0:
+                results.append(CryptoSentimentAnalyzer._empty_result())
+            else:
+                results.append(_result_from_row(row, label, text_length))
+
+        return results
+
+
+def _result_from_row(row: List[float], label: int, text_length: int) -> Dict[str, float]:
+    """Result dict for one row of boosted probabilities"""
+    scores = {
+        'positive': float(row[0]),
+        'negative': float(row[1]),
+        'neutral': float(row[2])
+    }
+    sentiment = SENTIMENT_LABELS[label]
+
+    return {
+        'sentiment': sentiment,
+        'confidence': scores[sentiment],
+        'scores': scores,
+        'text_length': text_length
+    }
+
+
+def _copy_result(result: Dict[str, float]) -> Dict[str, float]:
+    """Copy a sentiment result so callers cannot mutate cached scores"""
+    return {**result, 'scores': dict(result['scores'])}
+
+
+class SentimentCache:
+    """
+    Bounded LRU cache of sentiment results with optional time-to-live
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None):
+        """
+        Initialize result cache
+
+        Args:
+            max_size: Maximum number of cached results (0 disables caching)
+            ttl: Seconds before an entry expires (None for no expiry)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(model_name: str, cleaned_text: str) -> str:
+        """Content hash of a preprocessed text for a given model"""
+        payload = f"{model_name}\0{cleaned_text}".encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        """Return a copy of the cached result, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, result = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return _copy_result(result)
+
+    def put(self, key: str, result: Dict[str, float]):
+        """Store a result, evicting the least recently used entries if full"""
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            self._entries[key] = (expires_at, _copy_result(result))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss/eviction counters for sizing the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups > 0 else 0.0
+            }
+
+
+class _LogitsOnly(torch.nn.Module):
+    """Tensor-in, tensor-out wrapper so the classifier can be traced and exported"""
+
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: torch.Tensor,
+        token_type_ids: Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
+        return self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            token_type_ids=token_type_ids,
+            return_dict=False
+        )[0]
+
+
 class CryptoSentimentAnalyzer:
     """
     Financial sentiment analysis specialized for cryptocurrency
     """
 
-    def __init__(self, model_name: str = "ProsusAI/finbert", device: str = 'cpu'):
+    # fp32: eager PyTorch, int8: dynamically quantized linear layers (CPU),
+    # torchscript: traced graph, onnx: exported graph run by onnxruntime
+    BACKENDS = ('fp32', 'int8', 'torchscript', 'onnx')
+
+    # Per-sample weight of each source in the overall sentiment
+    # (Reddit slightly higher, news highest)
+    SOURCE_WEIGHTS = {'twitter': 1.0, 'reddit': 1.2, 'news': 2.0}
+
+    def __init__(
+        self,
+        model_name: str = "ProsusAI/finbert",
+        device: str = 'cpu',
+        cache_size: int = 10000,
+        cache_ttl: Optional[float] = None,
+        backend: str = 'fp32',
+        onnx_path: Optional[str] = None,
+        shared: bool = True
+    ):
         """
         Initialize sentiment analyzer with FinBERT
 
         Args:
             model_name: HuggingFace model name
             device: Device to run model on ('cpu' or 'cuda')
+            cache_size: Maximum number of cached results (0 disables caching)
+            cache_ttl: Seconds before a cached result expires (None for no expiry)
+            backend: Inference backend, one of BACKENDS
+            onnx_path: Exported graph for the onnx backend (reused if it exists,
+                exported there otherwise). Defaults to a file in ONNX_CACHE_DIR
+                keyed by model_name and a fingerprint of its files (see
+                default_onnx_path), so changed weights are re-exported.
+            shared: Reuse the process-wide copy of the model from model_registry
+                instead of loading a private one
         """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Choose from {self.BACKENDS}")
+
+        self.model_name = model_name
+        self.backend = backend
         self.device = torch.device(device)
+        self.cache = SentimentCache(max_size=cache_size, ttl=cache_ttl)
+        self.cache_namespace = f"{model_name}:{backend}"
+
+        if shared:
+            key = ('sentiment', model_name, str(self.device), backend, onnx_path)
+            loaded = model_registry.get(key, lambda: self._load_model(onnx_path))
+        else:
+            loaded = self._load_model(onnx_path)
 
-        logger.info(f"Loading sentiment model: {model_name}")
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.model = AutoModelForSequenceClassification.from_pretrained(model_name).to(self.device)
-        self.model.eval()
+        self.tokenizer, self.model, self.onnx_session = loaded
+        if self.onnx_session is not None:
+            self.onnx_inputs = [node.name for node in self.onnx_session.get_inputs()]
 
         # Sentiment labels: [positive, negative, neutral]
         self.label_mapping = {0: 'positive', 1: 'negative', 2: 'neutral'}
@@ -47,6 +322,8 @@ class CryptoSentimentAnalyzer:
             'ban', 'fear', 'loss', 'red', 'decline', 'warning'
         ]
 
+        self.keyword_matcher = KeywordMatcher(self.bullish_keywords, self.bearish_keywords)
+
     def preprocess_text(self, text: str) -> str:
         """
         Clean and preprocess text for sentiment analysis
@@ -57,20 +334,7 @@ class CryptoSentimentAnalyzer:
         Returns:
             Cleaned text
         """
-        # Remove URLs
-        text = re.sub(r'http\S+|www.\S+', '', text)
-
-        # Remove mentions and hashtags (but keep the words)
-        text = re.sub(r'@\w+', '', text)
-        text = re.sub(r'#', '', text)
-
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?]', '', text)
-
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-
-        return text.strip()
+        return clean_text(text)
 
     def analyze_sentiment(self, text: str) -> Dict[str, float]:
         """
@@ -86,91 +350,429 @@ class CryptoSentimentAnalyzer:
         cleaned_text = self.preprocess_text(text)
 
         if not cleaned_text:
-            return {
-                'sentiment': 'neutral',
-                'confidence': 0.33,
-                'scores': {'positive': 0.33, 'negative': 0.33, 'neutral': 0.34}
-            }
+            return self._empty_result()
 
-        # Tokenize
-        inputs = self.tokenizer(
-            cleaned_text,
-            return_tensors='pt',
-            truncation=True,
-            max_length=512,
-            padding=True
-        ).to(self.device)
+        key = SentimentCache.make_key(self.cache_namespace, cleaned_text)
+        result = self.cache.get(key)
 
-        # Get prediction
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            probabilities = torch.softmax(outputs.logits, dim=1)[0]
-
-        # Convert to dict
-        scores = {
-            'positive': float(probabilities[0]),
-            'negative': float(probabilities[1]),
-            'neutral': float(probabilities[2])
-        }
+        if result is None:
+            result = self._score_texts([cleaned_text])[0]
+            self.cache.put(key, result)
 
-        # Get dominant sentiment
-        sentiment = max(scores, key=scores.get)
-        confidence = scores[sentiment]
+        return result
 
-        # Apply crypto-specific keyword boosting
-        text_lower = cleaned_text.lower()
-        boost_factor = 0.0
+    def analyze_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 64,
+        max_tokens: int = 4096
+    ) -> List[Dict[str, float]]:
+        """
+        Analyze sentiment for multiple texts
 
-        for keyword in self.bullish_keywords:
-            if keyword in text_lower:
-                boost_factor += 0.05
+        Texts are bucketed by tokenized length so each forward pass pads to a
+        similar length, and batches are sized by a padded-token budget.
 
-        for keyword in self.bearish_keywords:
-            if keyword in text_lower:
-                boost_factor -= 0.05
+        Args:
+            texts: List of texts to analyze
+            batch_size: Maximum number of texts per forward pass
+            max_tokens: Padded-token budget per forward pass (None for fixed
+                batch_size chunks in input order)
 
-        # Adjust scores with boost
-        if boost_factor > 0:
-            scores['positive'] = min(1.0, scores['positive'] + boost_factor)
-            scores['negative'] = max(0.0, scores['negative'] - boost_factor/2)
-        elif boost_factor < 0:
-            scores['negative'] = min(1.0, scores['negative'] - boost_factor)
-            scores['positive'] = max(0.0, scores['positive'] + boost_factor/2)
+        Returns:
+            List of sentiment results in input order
+        """
+        return self.analyze_batch_columns(texts, batch_size, max_tokens).to_results()
 
-        # Renormalize
-        total = sum(scores.values())
-        scores = {k: v/total for k, v in scores.items()}
+    def analyze_batch_columns(
+        self,
+        texts: List[str],
+        batch_size: int = 64,
+        max_tokens: int = 4096
+    ) -> SentimentColumns:
+        """
+        Analyze sentiment for multiple texts, returning columnar arrays
 
-        # Recalculate sentiment after boosting
-        sentiment = max(scores, key=scores.get)
-        confidence = scores[sentiment]
+        Same scheduling, caching and scores as analyze_batch, without building
+        a dict per text.
+
+        Args:
+            texts: List of texts to analyze
+            batch_size: Maximum number of texts per forward pass
+            max_tokens: Padded-token budget per forward pass (None for fixed
+                batch_size chunks in input order)
+
+        Returns:
+            SentimentColumns in input order
+        """
+        n_texts = len(texts)
+        probs = np.tile(np.array(_EMPTY_PROBS), (n_texts, 1))
+        labels = np.full(n_texts, SENTIMENT_LABELS.index('neutral'), dtype=np.int64)
+        text_lengths = np.zeros(n_texts, dtype=np.int64)
+
+        # Empty texts keep the neutral default, cached texts skip the model,
+        # and duplicates within the call are scored once
+        pending = OrderedDict()
+        for idx, text in enumerate(texts):
+            cleaned_text = self.preprocess_text(text)
+            if not cleaned_text:
+                continue
+
+            key = SentimentCache.make_key(self.cache_namespace, cleaned_text)
+            if key in pending:
+                pending[key][1].append(idx)
+                continue
+
+            cached = self.cache.get(key)
+            if cached is not None:
+                probs[idx] = [cached['scores'][label] for label in SENTIMENT_LABELS]
+                labels[idx] = SENTIMENT_LABELS.index(cached['sentiment'])
+                text_lengths[idx] = cached['text_length']
+            else:
+                pending[key] = (cleaned_text, [idx])
+
+        if not pending:
+            return SentimentColumns(probs, labels, text_lengths)
+
+        keys = list(pending)
+        cleaned = [pending[key][0] for key in keys]
+        encoded = self._encode(cleaned)
+
+        if max_tokens is None:
+            batches = [
+                list(range(i, min(i + batch_size, len(cleaned))))
+                for i in range(0, len(cleaned), batch_size)
+            ]
+        else:
+            lengths = [len(features['input_ids']) for features in encoded]
+            batches = self._plan_batches(lengths, max_tokens, batch_size)
+
+        for batch in batches:
+            batch_probs, batch_labels = self._score_probs(
+                [cleaned[j] for j in batch],
+                [encoded[j] for j in batch]
+            )
+            for j, row, label in zip(batch, batch_probs, batch_labels):
+                text_length = len(cleaned[j])
+                self.cache.put(keys[j], _result_from_row(row, int(label), text_length))
+
+                idxs = pending[keys[j]][1]
+                probs[idxs] = row
+                labels[idxs] = label
+                text_lengths[idxs] = text_length
+
+        return SentimentColumns(probs, labels, text_lengths)
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Result cache counters (size, hits, misses, evictions, hit rate)"""
+        return self.cache.stats()
+
+    @staticmethod
+    def _plan_batches(
+        lengths: List[int],
+        max_tokens: int,
+        max_batch_size: int
+    ) -> List[List[int]]:
+        """
+        Group texts of similar token length under a padded-token budget
+
+        Args:
+            lengths: Tokenized length of each text
+            max_tokens: Upper bound on batch size times longest length in the batch
+            max_batch_size: Upper bound on texts per batch
 
+        Returns:
+            Batches of indices into lengths; a text longer than the budget gets its own batch
+        """
+        order = np.argsort(lengths, kind='stable')
+        batches = []
+        batch = []
+
+        for idx in order:
+            # Sorted ascending, so the newest text sets the padded length
+            padded = (len(batch) + 1) * lengths[idx]
+            if batch and (padded > max_tokens or len(batch) >= max_batch_size):
+                batches.append(batch)
+                batch = []
+            batch.append(int(idx))
+
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    @staticmethod
+    def _empty_result() -> Dict[str, float]:
+        """Neutral result for texts that are empty after preprocessing"""
         return {
-            'sentiment': sentiment,
-            'confidence': confidence,
-            'scores': scores,
-            'text_length': len(cleaned_text)
+            'sentiment': 'neutral',
+            'confidence': 0.33,
+            'scores': {'positive': 0.33, 'negative': 0.33, 'neutral': 0.34}
         }
 
-    def analyze_batch(self, texts: List[str], batch_size: int = 16) -> List[Dict[str, float]]:
+    def _encode(self, cleaned_texts: List[str]) -> List[Dict[str, List[int]]]:
+        """Tokenize texts without padding, one feature dict per text"""
+        encodings = self.tokenizer(cleaned_texts, truncation=True, max_length=512)
+        keys = list(encodings.keys())
+
+        return [
+            {key: encodings[key][i] for key in keys}
+            for i in range(len(cleaned_texts))
+        ]
+
+    def _score_texts(
+        self,
+        cleaned_texts: List[str],
+        encoded: List[Dict[str, List[int]]] = None
+    ) -> List[Dict[str, float]]:
         """
-        Analyze sentiment for multiple texts
+        Run one forward pass over already cleaned texts and apply keyword boosting
 
         Args:
-            texts: List of texts to analyze
-            batch_size: Number of texts to process at once
+            cleaned_texts: Non-empty texts returned by preprocess_text
+            encoded: Unpadded tokenizer output for the texts (tokenized here if None)
 
         Returns:
-            List of sentiment results
+            List of sentiment results in input order
         """
-        results = []
+        probs, labels = self._score_probs(cleaned_texts, encoded)
 
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_results = [self.analyze_sentiment(text) for text in batch]
-            results.extend(batch_results)
+        return [
+            _result_from_row(row, label, len(text))
+            for text, row, label in zip(cleaned_texts, probs.tolist(), labels.tolist())
+        ]
 
-        return results
+    def _score_probs(
+        self,
+        cleaned_texts: List[str],
+        encoded: List[Dict[str, List[int]]] = None
+    ):
+        """
+        Boosted probabilities and dominant label indices for already cleaned texts
+
+        Returns:
+            probs of shape (n_texts, 3), labels of shape (n_texts,)
+        """
+        if encoded is None:
+            encoded = self._encode(cleaned_texts)
+
+        # Pad only to the longest text in the batch
+        inputs = self.tokenizer.pad(encoded, padding=True, return_tensors='pt').to(self.device)
+
+        # Get predictions
+        with torch.no_grad():
+            probabilities = torch.softmax(self._forward_logits(inputs), dim=1)
+
+        probs = probabilities.cpu().numpy().astype(np.float64)
+        boosts = np.array([self._keyword_boost(text.lower()) for text in cleaned_texts])
+        probs = self._apply_boost(probs, boosts)
+
+        # Recalculate sentiment after boosting
+        return probs, np.argmax(probs, axis=1)
+
+    def _load_model(self, onnx_path: Optional[str]):
+        """
+        Load tokenizer and model and convert them to the selected backend
+
+        Returns:
+            (tokenizer, model, onnx_session) with the model frozen for read-only
+            sharing. The onnx backend has no model: the session replaces it.
+        """
+        logger.info(f"Loading sentiment model: {self.model_name} ({self.backend})")
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        # The onnx backend only loads the eager model if it has to export it
+        self.model = None if self.backend == 'onnx' else self._load_fp32()
+
+        self.onnx_session = None
+        self._prepare_backend(onnx_path)
+
+        return self.tokenizer, self.model, self.onnx_session
+
+    def _load_fp32(self) -> torch.nn.Module:
+        """Eager fp32 model in eval mode with gradients off"""
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name).to(self.device)
+        model.eval()
+        model.requires_grad_(False)
+        return model
+
+    def _prepare_backend(self, onnx_path: Optional[str]):
+        """
+        Convert the loaded fp32 model into the selected inference backend; the
+        onnx backend loads its cached graph instead, exporting it if missing
+        """
+        if self.backend == 'int8':
+            if self.device.type != 'cpu':
+                raise ValueError("int8 dynamic quantization is only supported on CPU")
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        elif self.backend == 'torchscript':
+            example = dict(self.tokenizer(['bitcoin price'], return_tensors='pt').to(self.device))
+            with torch.no_grad():
+                self.model = torch.jit.trace(_LogitsOnly(self.model).eval(), example_kwarg_inputs=example)
+
+        elif self.backend == 'onnx':
+            try:
+                import onnxruntime
+            except ImportError as e:
+                raise ImportError("The onnx backend requires onnxruntime (pip install onnxruntime)") from e
+
+            cached = onnx_path is None
+            if cached:
+                onnx_path = self.default_onnx_path(self.model_name)
+
+            if not os.path.exists(onnx_path):
+                self._export_onnx(onnx_path)
+                if cached:
+                    self._remove_stale_exports(onnx_path)
+
+            providers = ['CUDAExecutionProvider'] if self.device.type == 'cuda' else []
+            self.onnx_session = onnxruntime.InferenceSession(
+                onnx_path,
+                providers=providers + ['CPUExecutionProvider']
+            )
+            logger.info(f"ONNX sentiment graph loaded from {onnx_path}")
+
+    @staticmethod
+    def default_onnx_path(model_name: str) -> str:
+        """
+        Cached export location for a model in ONNX_CACHE_DIR
+
+        The file name carries a fingerprint of the model's files, so a local
+        model directory retrained in place (or a new hub revision) gets a new
+        export instead of the stale graph.
+        """
+        readable = re.sub(r'[^\w.-]', '_', model_name)
+        digest = hashlib.blake2b(model_name.encode('utf-8'), digest_size=8).hexdigest()
+        fingerprint = CryptoSentimentAnalyzer._model_fingerprint(model_name)
+        return os.path.join(ONNX_CACHE_DIR, f"{readable}-{digest}-{fingerprint}.onnx")
+
+    @staticmethod
+    def _model_fingerprint(model_name: str) -> str:
+        """
+        Version of a model's files: for a local directory a hash of the name,
+        size and mtime of every file in it, for a hub model the commit of its
+        cached snapshot ('nocache' before the first download)
+        """
+        if not os.path.isdir(model_name):
+            from huggingface_hub import try_to_load_from_cache
+
+            config_path = try_to_load_from_cache(model_name, 'config.json')
+            # .../snapshots/<commit>/config.json
+            return os.path.basename(os.path.dirname(config_path)) if isinstance(config_path, str) else 'nocache'
+
+        digest = hashlib.blake2b(digest_size=8)
+        for name in sorted(os.listdir(model_name)):
+            path = os.path.join(model_name, name)
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _export_onnx(self, onnx_path: str):
+        """
+        Export the model with dynamic batch and sequence axes
+
+        The graph is written next to onnx_path and renamed into place, so
+        processes exporting at the same time never load a partial file. The
+        eager model is loaded just for the export and dropped afterwards.
+        """
+        model = self._load_fp32()
+        encoded = self.tokenizer(['bitcoin price'], return_tensors='pt').to(self.device)
+
+        # Graph inputs follow the wrapper's forward signature, not the tokenizer's key order
+        input_names = [
+            name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in encoded
+        ]
+        example = {name: encoded[name] for name in input_names}
+        dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+        dynamic_axes['logits'] = {0: 'batch'}
+
+        directory = os.path.dirname(os.path.abspath(onnx_path))
+        os.makedirs(directory, exist_ok=True)
+        staging = f"{onnx_path}.{os.getpid()}.tmp"
+
+        # Newer torch defaults to the dynamo exporter, which needs onnxscript
+        # and writes the weights to a side file named after the output; the
+        # TorchScript exporter writes one self-contained graph
+        options = {'dynamo': False} if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+
+        try:
+            with torch.no_grad():
+                torch.onnx.export(
+                    _LogitsOnly(model).eval(),
+                    (example,),
+                    staging,
+                    input_names=input_names,
+                    output_names=['logits'],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=14,
+                    **options
+                )
+            os.replace(staging, onnx_path)
+        finally:
+            if os.path.exists(staging):
+                os.remove(staging)
+        logger.info(f"Exported sentiment model to {onnx_path}")
+
+    @staticmethod
+    def _remove_stale_exports(onnx_path: str):
+        """Delete ONNX_CACHE_DIR exports of the same model from earlier versions of its files"""
+        current = os.path.basename(onnx_path)
+        prefix = current.rsplit('-', 1)[0] + '-'
+        for name in os.listdir(ONNX_CACHE_DIR):
+            path = os.path.join(ONNX_CACHE_DIR, name)
+            if name.startswith(prefix) and name.endswith('.onnx') and name != current:
+                logger.info(f"Removing stale sentiment export {path}")
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def _forward_logits(self, inputs) -> torch.Tensor:
+        """Logits for a padded tokenizer batch on the selected backend"""
+        if self.onnx_session is not None:
+            feed = {name: inputs[name].cpu().numpy() for name in self.onnx_inputs}
+            return torch.from_numpy(self.onnx_session.run(['logits'], feed)[0])
+
+        if self.backend == 'torchscript':
+            return self.model(**inputs)
+
+        return self.model(**inputs).logits
+
+    def _keyword_boost(self, text_lower: str) -> float:
+        """Crypto-specific keyword boost for a lowercased text"""
+        return self.keyword_matcher.boost(text_lower)
+
+    @staticmethod
+    def _apply_boost(probs: np.ndarray, boosts: np.ndarray) -> np.ndarray:
+        """
+        Adjust [positive, negative, neutral] probabilities by keyword boost and renormalize
+
+        Args:
+            probs: Array of shape (n_texts, 3)
+            boosts: Boost factor per text
+
+        Returns:
+            Boosted and renormalized probabilities
+        """
+        probs = probs.copy()
+        positive, negative = probs[:, 0], probs[:, 1]
+        bullish = boosts > 0
+        bearish = boosts < 0
+
+        probs[:, 0] = np.where(
+            bullish, np.minimum(1.0, positive + boosts),
+            np.where(bearish, np.maximum(0.0, positive + boosts / 2), positive)
+        )
+        probs[:, 1] = np.where(
+            bullish, np.maximum(0.0, negative - boosts / 2),
+            np.where(bearish, np.minimum(1.0, negative - boosts), negative)
+        )
+
+        # Renormalize
+        return probs / probs.sum(axis=1, keepdims=True)
 
     def aggregate_sentiment(
         self,
@@ -188,15 +790,7 @@ class CryptoSentimentAnalyzer:
             Aggregated sentiment scores
         """
         if not sentiments:
-            return {
-                'overall_sentiment': 'neutral',
-                'sentiment_score': 0.0,
-                'confidence': 0.33,
-                'positive_ratio': 0.33,
-                'negative_ratio': 0.33,
-                'neutral_ratio': 0.34,
-                'sample_size': 0
-            }
+            return self.empty_aggregate()
 
         if weights is None:
             weights = [1.0] * len(sentiments)
@@ -216,25 +810,89 @@ class CryptoSentimentAnalyzer:
             for key in weighted_scores:
                 weighted_scores[key] += sentiment['scores'][key] * weight
 
+        # Count ratios
+        label_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
+        for s in sentiments:
+            label_counts[s['sentiment']] += 1
+
+        return self.summarize_sentiment(weighted_scores, label_counts, len(sentiments))
+
+    def aggregate_columns(
+        self,
+        columns: SentimentColumns,
+        weights: Optional[np.ndarray] = None
+    ) -> Dict[str, float]:
+        """
+        Aggregate columnar results with NumPy reductions
+
+        Args:
+            columns: Output of analyze_batch_columns
+            weights: Optional weight per text (e.g., by follower count)
+
+        Returns:
+            Aggregated sentiment scores, same shape as aggregate_sentiment
+        """
+        n_texts = len(columns.labels)
+        if n_texts == 0:
+            return self.empty_aggregate()
+
+        if weights is None:
+            weights = np.full(n_texts, 1.0 / n_texts)
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+            weights = weights / weights.sum()
+
+        weighted = weights @ columns.probs
+        counts = np.bincount(columns.labels, minlength=len(SENTIMENT_LABELS))
+
+        weighted_scores = {label: float(weighted[i]) for i, label in enumerate(SENTIMENT_LABELS)}
+        label_counts = {label: int(counts[i]) for i, label in enumerate(SENTIMENT_LABELS)}
+
+        return self.summarize_sentiment(weighted_scores, label_counts, n_texts)
+
+    @staticmethod
+    def empty_aggregate() -> Dict[str, float]:
+        """Aggregate returned when there is nothing to aggregate"""
+        return {
+            'overall_sentiment': 'neutral',
+            'sentiment_score': 0.0,
+            'confidence': 0.33,
+            'positive_ratio': 0.33,
+            'negative_ratio': 0.33,
+            'neutral_ratio': 0.34,
+            'sample_size': 0
+        }
+
+    @staticmethod
+    def summarize_sentiment(
+        weighted_scores: Dict[str, float],
+        label_counts: Dict[str, int],
+        total_count: int
+    ) -> Dict[str, float]:
+        """
+        Build the aggregate dict from normalized weighted scores and label counts
+
+        Args:
+            weighted_scores: Weight-normalized positive/negative/neutral scores
+            label_counts: Number of results per dominant label
+            total_count: Number of results aggregated
+
+        Returns:
+            Aggregated sentiment scores
+        """
         # Calculate sentiment score (-1 to +1)
         sentiment_score = weighted_scores['positive'] - weighted_scores['negative']
 
         # Determine overall sentiment
         overall_sentiment = max(weighted_scores, key=weighted_scores.get)
 
-        # Count ratios
-        positive_count = sum(1 for s in sentiments if s['sentiment'] == 'positive')
-        negative_count = sum(1 for s in sentiments if s['sentiment'] == 'negative')
-        neutral_count = sum(1 for s in sentiments if s['sentiment'] == 'neutral')
-        total_count = len(sentiments)
-
         return {
             'overall_sentiment': overall_sentiment,
             'sentiment_score': sentiment_score,
             'confidence': weighted_scores[overall_sentiment],
-            'positive_ratio': positive_count / total_count,
-            'negative_ratio': negative_count / total_count,
-            'neutral_ratio': neutral_count / total_count,
+            'positive_ratio': label_counts['positive'] / total_count,
+            'negative_ratio': label_counts['negative'] / total_count,
+            'neutral_ratio': label_counts['neutral'] / total_count,
             'sample_size': total_count,
             'weighted_scores': weighted_scores
         }
@@ -260,50 +918,60 @@ class CryptoSentimentAnalyzer:
 
         if tweets:
             logger.info(f"Analyzing {len(tweets)} tweets...")
-            tweet_sentiments = self.analyze_batch(tweets)
-            results['twitter'] = self.aggregate_sentiment(tweet_sentiments)
+            tweet_columns = self.analyze_batch_columns(tweets)
+            results['twitter'] = self.aggregate_columns(tweet_columns)
 
         if reddit_posts:
             logger.info(f"Analyzing {len(reddit_posts)} Reddit posts...")
-            reddit_sentiments = self.analyze_batch(reddit_posts)
-            results['reddit'] = self.aggregate_sentiment(reddit_sentiments)
+            reddit_columns = self.analyze_batch_columns(reddit_posts)
+            results['reddit'] = self.aggregate_columns(reddit_columns)
 
         if news_headlines:
             logger.info(f"Analyzing {len(news_headlines)} news headlines...")
             # News headlines get higher weight
-            news_sentiments = self.analyze_batch(news_headlines)
-            news_weights = [2.0] * len(news_sentiments)
-            results['news'] = self.aggregate_sentiment(news_sentiments, news_weights)
+            news_columns = self.analyze_batch_columns(news_headlines)
+            news_weights = np.full(len(news_headlines), 2.0)
+            results['news'] = self.aggregate_columns(news_columns, news_weights)
 
         # Overall aggregated sentiment
-        all_sentiments = []
-        all_weights = []
+        overall = self.combine_sources(results)
+        if overall is not None:
+            results['overall'] = overall
+
+        return results
 
-        if 'twitter' in results:
-            all_sentiments.append(results['twitter'])
-            all_weights.append(results['twitter']['sample_size'])
+    @classmethod
+    def combine_sources(cls, results: Dict[str, Dict]) -> Optional[Dict[str, float]]:
+        """
+        Combine per-source aggregates, weighting each source by sample size
+
+        Args:
+            results: Aggregates keyed by source name ('twitter', 'reddit', 'news')
 
-        if 'reddit' in results:
-            all_sentiments.append(results['reddit'])
-            all_weights.append(results['reddit']['sample_size'] * 1.2)  # Slightly higher weight
+        Returns:
+            Overall sentiment, or None if no known source is present
+        """
+        all_sentiments = []
+        all_weights = []
 
-        if 'news' in results:
-            all_sentiments.append(results['news'])
-            all_weights.append(results['news']['sample_size'] * 2.0)  # Highest weight
+        for source, source_weight in cls.SOURCE_WEIGHTS.items():
+            if source in results:
+                all_sentiments.append(results[source])
+                all_weights.append(results[source]['sample_size'] * source_weight)
 
-        if all_sentiments:
-            # Aggregate across sources
-            total_weight = sum(all_weights)
-            overall_score = sum(
-                s['sentiment_score'] * w / total_weight
-                for s, w in zip(all_sentiments, all_weights)
-            )
+        if not all_sentiments:
+            return None
 
-            results['overall'] = {
-                'sentiment_score': overall_score,
-                'sentiment': 'positive' if overall_score > 0.15 else 'negative' if overall_score < -0.15 else 'neutral',
-                'confidence': sum(s['confidence'] * w / total_weight for s, w in zip(all_sentiments, all_weights)),
-                'sources_analyzed': len(all_sentiments)
-            }
+        # Aggregate across sources
+        total_weight = sum(all_weights)
+        overall_score = sum(
+            s['sentiment_score'] * w / total_weight
+            for s, w in zip(all_sentiments, all_weights)
+        )
 
-        return results
+        return {
+            'sentiment_score': overall_score,
+            'sentiment': 'positive' if overall_score > 0.15 else 'negative' if overall_score < -0.15 else 'neutral',
+            'confidence': sum(s['confidence'] * w / total_weight for s, w in zip(all_sentiments, all_weights)),
+            'sources_analyzed': len(all_sentiments)
+        }
@@ -0,0 +1,184 @@
+"""
+Async Micro-Batching Front-End for Sentiment Analysis
+Gathers concurrent single-text requests into batched FinBERT forward passes
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from models.sentiment_analyzer import CryptoSentimentAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentBatcher:
+    """
+    Queue concurrent analyze requests and flush them as one analyze_batch call
+
+    A batch is flushed when it reaches max_batch_size or when max_wait_ms has
+    passed since its first request arrived. Model calls run in a single worker
+    thread so the event loop is never blocked.
+    """
+
+    def __init__(
+        self,
+        analyzer: CryptoSentimentAnalyzer,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            analyzer: Sentiment analyzer used for the batched calls
+            max_batch_size: Maximum number of requests per forward pass
+            max_wait_ms: Maximum time the first request in a batch waits for company
+        """
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.batches_run = 0
+        self.requests_served = 0
+
+    async def start(self):
+        """Start the batching worker on the running event loop"""
+        if self._worker is not None:
+            return
+
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sentiment')
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Sentiment batcher started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait * 1000:.1f})"
+        )
+
+    async def stop(self):
+        """Flush pending requests and stop the worker"""
+        if self._worker is None:
+            return
+
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+        self._executor.shutdown(wait=True)
+        self._worker = None
+        self._executor = None
+        logger.info("Sentiment batcher stopped")
+
+    async def __aenter__(self) -> 'SentimentBatcher':
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def analyze(self, text: str) -> Dict[str, float]:
+        """
+        Analyze a single text as part of the next batch
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Same result dict as CryptoSentimentAnalyzer.analyze_sentiment
+        """
+        if self._worker is None:
+            raise RuntimeError("SentimentBatcher is not running. Call start() first.")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        """Collect requests until the batch is full or the deadline passes, then flush"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]):
+        """
+        Run one analyze_batch call in the worker thread and resolve each caller
+
+        If the batch call fails, each text is retried on its own so only the
+        callers whose text fails get the exception. Callers that gave up
+        (cancelled) while queued are skipped and not counted as served.
+        """
+        pending = [(text, future) for text, future in batch if not future.done()]
+
+        try:
+            if not pending:
+                return
+
+            try:
+                results = await self._analyze([text for text, _ in pending])
+            except Exception as e:
+                logger.warning(f"Sentiment batch of {len(pending)} failed ({e}), retrying texts one by one")
+                await self._flush_each(pending)
+            else:
+                self.batches_run += 1
+                for (_, future), result in zip(pending, results):
+                    self._resolve(future, result)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _flush_each(self, pending: List[Tuple[str, asyncio.Future]]):
+        """Analyze texts one per call, failing only the callers whose text raises"""
+        for text, future in pending:
+            if future.done():
+                continue
+
+            try:
+                results = await self._analyze([text])
+            except Exception as e:
+                logger.error(f"Sentiment analysis failed for one text: {e}")
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.batches_run += 1
+                self._resolve(future, results[0])
+
+    async def _analyze(self, texts: List[str]) -> List[Dict[str, float]]:
+        """analyze_batch in the worker thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.analyzer.analyze_batch, texts, self.max_batch_size)
+
+    def _resolve(self, future: asyncio.Future, result: Dict[str, float]):
+        """Hand a result to a caller still waiting for it"""
+        if not future.done():
+            future.set_result(result)
+            self.requests_served += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Batching counters"""
+        return {
+            'batches_run': self.batches_run,
+            'requests_served': self.requests_served,
+            'avg_batch_size': self.requests_served / self.batches_run if self.batches_run > 0 else 0.0,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0
+        }
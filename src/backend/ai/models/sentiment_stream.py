@@ -0,0 +1,243 @@
+"""
+Streaming Sentiment Aggregation
+Keeps running per-source sentiment totals over cumulative, sliding or tumbling
+time windows without storing raw texts or per-text results
+"""
+
+from collections import deque
+from typing import Deque, Dict, List, Optional
+import math
+import time
+import logging
+
+from models.sentiment_analyzer import CryptoSentimentAnalyzer, SENTIMENT_LABELS as LABELS
+
+logger = logging.getLogger(__name__)
+
+
+class _Totals:
+    """Weighted score sums and label counts for a set of results"""
+
+    __slots__ = ('weight', 'scores', 'counts', 'n')
+
+    def __init__(self):
+        self.weight = 0.0
+        self.scores = [0.0, 0.0, 0.0]
+        self.counts = [0, 0, 0]
+        self.n = 0
+
+    def add(self, result: Dict[str, float], weight: float):
+        scores = result['scores']
+        self.weight += weight
+        self.scores[0] += scores['positive'] * weight
+        self.scores[1] += scores['negative'] * weight
+        self.scores[2] += scores['neutral'] * weight
+        self.counts[LABELS.index(result['sentiment'])] += 1
+        self.n += 1
+
+    def merge(self, other: '_Totals', sign: int = 1):
+        self.weight += sign * other.weight
+        for i in range(3):
+            self.scores[i] += sign * other.scores[i]
+            self.counts[i] += sign * other.counts[i]
+        self.n += sign * other.n
+
+
+class _SourceWindow:
+    """Time buckets for one source plus running totals over the live buckets"""
+
+    __slots__ = ('buckets', 'totals', 'completed')
+
+    def __init__(self):
+        self.buckets: Deque[List] = deque()  # [bucket_index, _Totals]
+        self.totals = _Totals()
+        self.completed: Optional[_Totals] = None
+
+
+class StreamingSentimentAggregator:
+    """
+    Incremental replacement for aggregate_sentiment over a continuous stream
+
+    Results are folded into fixed-size time buckets per source. Adding a
+    result and evicting an expired bucket are both O(1). Any time, aggregate()
+    returns the same dict as CryptoSentimentAnalyzer.aggregate_sentiment over
+    the results in the current window.
+
+    Modes:
+        cumulative: window_seconds is None, everything ever added
+        sliding: the last window_seconds, expired bucket by bucket
+        tumbling: fixed back-to-back windows of window_seconds; the last
+            finished window stays available via completed()
+    """
+
+    MODES = ('sliding', 'tumbling')
+
+    def __init__(
+        self,
+        window_seconds: Optional[float] = None,
+        mode: str = 'sliding',
+        bucket_seconds: Optional[float] = None
+    ):
+        """
+        Initialize aggregator
+
+        Args:
+            window_seconds: Window length (None for a cumulative aggregate)
+            mode: 'sliding' or 'tumbling'
+            bucket_seconds: Sliding-window granularity (default window_seconds / 60)
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown mode '{mode}'. Choose from {self.MODES}")
+
+        self.window_seconds = window_seconds
+        self.mode = mode
+
+        if window_seconds is None:
+            self.bucket_seconds = math.inf
+        elif mode == 'tumbling':
+            self.bucket_seconds = window_seconds
+        else:
+            self.bucket_seconds = bucket_seconds or window_seconds / 60
+
+        self.sources: Dict[str, _SourceWindow] = {}
+        self.latest_timestamp = -math.inf
+
+    def add(
+        self,
+        result: Dict[str, float],
+        source: str = 'twitter',
+        weight: float = 1.0,
+        timestamp: Optional[float] = None
+    ):
+        """
+        Fold one sentiment result into the running totals
+
+        Args:
+            result: Output of analyze_sentiment / analyze_batch
+            source: Source name, one of CryptoSentimentAnalyzer.SOURCE_WEIGHTS
+                ('twitter', 'reddit', 'news'); summary() weights the sources
+                with it, so other names are rejected
+            weight: Weight of this result (e.g. follower count)
+            timestamp: Event time in seconds (default now)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        window = self.sources.get(source)
+        if window is None:
+            if source not in CryptoSentimentAnalyzer.SOURCE_WEIGHTS:
+                raise ValueError(
+                    f"Unknown source '{source}'. Choose from {tuple(CryptoSentimentAnalyzer.SOURCE_WEIGHTS)}"
+                )
+            window = self.sources[source] = _SourceWindow()
+
+        bucket_index = self._bucket_index(timestamp)
+        if not window.buckets or window.buckets[-1][0] < bucket_index:
+            window.buckets.append([bucket_index, _Totals()])
+
+        # Late results land in the newest bucket rather than reopening an old one
+        window.buckets[-1][1].add(result, weight)
+        window.totals.add(result, weight)
+
+        self.latest_timestamp = max(self.latest_timestamp, timestamp)
+        self._evict(window, self.latest_timestamp)
+
+    def add_batch(
+        self,
+        results: List[Dict[str, float]],
+        source: str = 'twitter',
+        weights: Optional[List[float]] = None,
+        timestamp: Optional[float] = None
+    ):
+        """Fold a batch of results that share a source and timestamp"""
+        if timestamp is None:
+            timestamp = time.time()
+        if weights is None:
+            weights = [1.0] * len(results)
+
+        for result, weight in zip(results, weights):
+            self.add(result, source, weight, timestamp)
+
+    def aggregate(self, source: str, now: Optional[float] = None) -> Dict[str, float]:
+        """
+        Current window for one source, shaped like aggregate_sentiment output
+
+        Args:
+            source: Source name
+            now: Evaluation time for expiring old buckets (default latest event time)
+        """
+        window = self.sources.get(source)
+        if window is None:
+            return CryptoSentimentAnalyzer.empty_aggregate()
+
+        self._evict(window, self.latest_timestamp if now is None else now)
+        return self._summarize(window.totals)
+
+    def completed(self, source: str) -> Dict[str, float]:
+        """Last finished tumbling window for one source"""
+        window = self.sources.get(source)
+        if window is None or window.completed is None:
+            return CryptoSentimentAnalyzer.empty_aggregate()
+        return self._summarize(window.completed)
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Per-source aggregates plus the combined 'overall' entry, shaped like
+        analyze_social_feed output
+        """
+        results = {}
+        for source in self.sources:
+            aggregate = self.aggregate(source, now)
+            if aggregate['sample_size'] > 0:
+                results[source] = aggregate
+
+        overall = CryptoSentimentAnalyzer.combine_sources(results)
+        if overall is not None:
+            results['overall'] = overall
+
+        return results
+
+    def reset(self):
+        """Forget all sources"""
+        self.sources.clear()
+        self.latest_timestamp = -math.inf
+
+    def _bucket_index(self, timestamp: float) -> int:
+        if math.isinf(self.bucket_seconds):
+            return 0
+        return int(timestamp // self.bucket_seconds)
+
+    def _evict(self, window: _SourceWindow, now: float):
+        """Drop buckets that have left the window, subtracting them from the totals"""
+        if self.window_seconds is None or math.isinf(now):
+            return
+
+        if self.mode == 'tumbling':
+            current = self._bucket_index(now)
+            while window.buckets and window.buckets[0][0] < current:
+                _, expired = window.buckets.popleft()
+                window.totals.merge(expired, sign=-1)
+                window.completed = expired
+        else:
+            # Keep every bucket that overlaps (now - window_seconds, now], so the
+            # window is exact to within one bucket
+            oldest = self._bucket_index(now - self.window_seconds)
+            while window.buckets and window.buckets[0][0] < oldest:
+                _, expired = window.buckets.popleft()
+                window.totals.merge(expired, sign=-1)
+
+        # Start from exact zeros once empty so subtraction error cannot accumulate
+        if not window.buckets:
+            window.totals = _Totals()
+
+    @staticmethod
+    def _summarize(totals: _Totals) -> Dict[str, float]:
+        if totals.n == 0:
+            return CryptoSentimentAnalyzer.empty_aggregate()
+
+        weighted_scores = {
+            label: totals.scores[i] / totals.weight for i, label in enumerate(LABELS)
+        }
+        label_counts = {label: totals.counts[i] for i, label in enumerate(LABELS)}
+
+        return CryptoSentimentAnalyzer.summarize_sentiment(weighted_scores, label_counts, totals.n)
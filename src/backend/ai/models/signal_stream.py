@@ -0,0 +1,317 @@
+"""
+Streaming Trading Signals
+Keeps running indicator state so each new tick costs constant time instead of
+a full analyze_indicators pass over the price history
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import math
+import logging
+
+import numpy as np
+
+from models.trading_signals import TradingSignalsGenerator
+
+logger = logging.getLogger(__name__)
+
+
+class _RollingWindow:
+    """
+    Last `size` values with O(1) mean and population std
+
+    Sums are kept relative to a shift near the window mean, and recomputed
+    exactly once per `size` pushes, so neither cancellation in the variance
+    nor add/subtract drift can build up.
+    """
+
+    __slots__ = ('size', 'values', 'shift', 'sum', 'sum_sq', 'pushes')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: Deque[float] = deque(maxlen=size)
+        self.shift = 0.0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.pushes = 0
+
+    def push(self, value: float):
+        if not self.values:
+            self.shift = value
+
+        if len(self.values) == self.size:
+            old = self.values[0] - self.shift
+            self.sum -= old
+            self.sum_sq -= old * old
+
+        self.values.append(value)
+        new = value - self.shift
+        self.sum += new
+        self.sum_sq += new * new
+
+        self.pushes += 1
+        if self.pushes >= self.size:
+            self._resync()
+
+    def _resync(self):
+        self.shift = math.fsum(self.values) / len(self.values)
+        deviations = [value - self.shift for value in self.values]
+        self.sum = math.fsum(deviations)
+        self.sum_sq = math.fsum(d * d for d in deviations)
+        self.pushes = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    def mean(self) -> float:
+        return self.shift + self.sum / len(self.values)
+
+    def std(self) -> float:
+        n = len(self.values)
+        mean = self.sum / n
+        return math.sqrt(max(self.sum_sq / n - mean * mean, 0.0))
+
+
+class _RollingExtreme:
+    """Max (or min) of the last `size` values via a monotonic deque, amortized O(1)"""
+
+    __slots__ = ('size', 'sign', 'entries', 'count')
+
+    def __init__(self, size: int, maximum: bool = True):
+        self.size = size
+        self.sign = 1.0 if maximum else -1.0
+        self.entries: Deque[Tuple[int, float]] = deque()  # (index, signed value), decreasing
+        self.count = 0
+
+    def push(self, value: float):
+        signed = self.sign * value
+        while self.entries and self.entries[-1][1] <= signed:
+            self.entries.pop()
+        self.entries.append((self.count, signed))
+
+        # Drop the front once it falls out of the window
+        if self.entries[0][0] <= self.count - self.size:
+            self.entries.popleft()
+        self.count += 1
+
+    def value(self) -> float:
+        return self.sign * self.entries[0][1]
+
+
+class _Ema:
+    """EMA seeded with the first value, as indicator_engine.ema"""
+
+    __slots__ = ('multiplier', 'value')
+
+    def __init__(self, period: int):
+        self.multiplier = 2 / (period + 1)
+        self.value: Optional[float] = None
+
+    def push(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value = (x * self.multiplier) + (self.value * (1 - self.multiplier))
+        return self.value
+
+
+class StreamingSignalsGenerator(TradingSignalsGenerator):
+    """
+    Incremental analyze_indicators + generate_signals for a live feed
+
+    Holds running EMAs (EMA 12, MACD fast/slow/signal, %D), Wilder RSI
+    averages, rolling windows for the SMAs, Bollinger std and volume SMA, and
+    monotonic deques for the stochastic high/low. update() folds in one
+    tick in O(1) and returns the same indicators and signal that
+    analyze_indicators + generate_signals give over the full history (to
+    floating-point tolerance; tests/test_signal_stream.py checks this on
+    every prefix).
+
+    Use one instance per feed: unlike the base generator, the running state
+    here is not safe to update from several threads at once.
+    """
+
+    RSI_PERIOD = 14
+    STOCH_PERIOD = 14
+    BB_PERIOD = 20
+    BB_STD_DEV = 2.0
+
+    # analyze_indicators needs a full Bollinger window before it can score
+    MIN_TICKS = BB_PERIOD
+
+    def __init__(self):
+        super().__init__()
+        self.reset()
+
+    def reset(self):
+        """Forget all history"""
+        self.indicators = {}
+        self.count = 0
+        self.has_volume: Optional[bool] = None
+
+        self._price = None
+        self._sma_20 = _RollingWindow(20)
+        self._sma_50 = _RollingWindow(50)
+        # The Bollinger std looks at period + 1 prices
+        self._bb_window = _RollingWindow(self.BB_PERIOD + 1)
+        self._volume = _RollingWindow(20)
+
+        self._ema_12 = _Ema(12)
+        self._macd_fast = _Ema(12)
+        self._macd_slow = _Ema(26)
+        self._macd_signal = _Ema(9)
+
+        self._first_gains = []
+        self._first_losses = []
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+        self._highest = _RollingExtreme(self.STOCH_PERIOD, maximum=True)
+        self._lowest = _RollingExtreme(self.STOCH_PERIOD, maximum=False)
+        # %K is 0 until the first full window, like the batch kernel
+        self._stoch_k = 0.0
+        self._stoch_d = _Ema(3)
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether enough ticks have arrived to produce indicators"""
+        return self.count >= self.MIN_TICKS
+
+    def update(
+        self,
+        price: float,
+        high: Optional[float] = None,
+        low: Optional[float] = None,
+        volume: Optional[float] = None
+    ) -> Optional[Dict[str, any]]:
+        """
+        Fold in one tick and score it
+
+        Args:
+            price: Close price
+            high: High price (default price)
+            low: Low price (default price)
+            volume: Volume (give it on every tick or on none)
+
+        Returns:
+            generate_signals output for the history so far (its 'indicators'
+            are also stored in self.indicators), or None until MIN_TICKS
+            ticks have arrived
+        """
+        self._push(price, high, low, volume)
+        if not self.is_ready:
+            return None
+
+        self.indicators = self._snapshot()
+        return self.generate_signals(self.indicators)
+
+    def warm_up(
+        self,
+        prices: np.ndarray,
+        high: np.ndarray = None,
+        low: np.ndarray = None,
+        volume: np.ndarray = None
+    ):
+        """Fold in a history of ticks without scoring each one"""
+        for i in range(len(prices)):
+            self._push(
+                prices[i],
+                None if high is None else high[i],
+                None if low is None else low[i],
+                None if volume is None else volume[i]
+            )
+
+        if self.is_ready:
+            self.indicators = self._snapshot()
+
+    def _push(self, price: float, high: Optional[float], low: Optional[float], volume: Optional[float]):
+        price = float(price)
+        high = price if high is None else float(high)
+        low = price if low is None else float(low)
+
+        if self.has_volume is None:
+            self.has_volume = volume is not None
+        elif self.has_volume != (volume is not None):
+            raise ValueError("Volume must be given on every tick or on none")
+
+        # Wilder RSI: plain mean of the first period moves, then smoothing
+        if self._price is not None:
+            delta = price - self._price
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            period = self.RSI_PERIOD
+
+            if len(self._first_gains) < period:
+                self._first_gains.append(gain)
+                self._first_losses.append(loss)
+                if len(self._first_gains) == period:
+                    self._avg_gain = float(np.mean(self._first_gains))
+                    self._avg_loss = float(np.mean(self._first_losses))
+            else:
+                self._avg_gain = (self._avg_gain * (period - 1) + gain) / period
+                self._avg_loss = (self._avg_loss * (period - 1) + loss) / period
+
+        self._price = price
+        self._sma_20.push(price)
+        self._sma_50.push(price)
+        self._bb_window.push(price)
+        if volume is not None:
+            self._volume.push(float(volume))
+
+        self._ema_12.push(price)
+        macd = self._macd_fast.push(price) - self._macd_slow.push(price)
+        self._macd_signal.push(macd)
+
+        self._highest.push(high)
+        self._lowest.push(low)
+        if self.count >= self.STOCH_PERIOD - 1:
+            price_range = self._highest.value() - self._lowest.value()
+            stoch_k = 100 * (price - self._lowest.value()) / price_range if price_range != 0 else 50
+        else:
+            stoch_k = 0.0
+        self._stoch_k = stoch_k
+        self._stoch_d.push(stoch_k)
+
+        self.count += 1
+
+    def _snapshot(self) -> Dict[str, float]:
+        """Current indicators shaped like analyze_indicators output"""
+        price = self._price
+
+        # RSI is 0 until the first average exists, like the batch kernel
+        rs = self._avg_gain / self._avg_loss if self._avg_loss != 0 else 0
+        rsi = 100 - (100 / (1 + rs))
+
+        macd = self._macd_fast.value - self._macd_slow.value
+        signal = self._macd_signal.value
+
+        middle = self._sma_20.mean()
+        std = self._bb_window.std()
+        upper = middle + self.BB_STD_DEV * std
+        lower = middle - self.BB_STD_DEV * std
+
+        indicators = {
+            'price': price,
+            'sma_20': middle,
+            'sma_50': self._sma_50.mean() if self._sma_50.full else price,
+            'ema_12': self._ema_12.value,
+            'rsi': rsi,
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_histogram': macd - signal,
+            'bb_upper': upper,
+            'bb_middle': middle,
+            'bb_lower': lower,
+            'stoch_k': self._stoch_k,
+            'stoch_d': self._stoch_d.value,
+            'bb_position': (price - lower) / (upper - lower) if upper != lower else 0.5
+        }
+
+        if self.has_volume:
+            indicators['volume_ratio'] = self._volume.values[-1] / self._volume.mean() if self._volume.full else 1.0
+
+        return indicators
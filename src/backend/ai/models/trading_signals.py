@@ -4,10 +4,14 @@ Generates buy/sell/hold signals with confidence scores
 """
 
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 import logging
+import threading
 from enum import Enum
 
+from models import indicator_engine
+from models.indicator_engine import IndicatorEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,28 +24,152 @@ class SignalType(Enum):
     STRONG_SELL = "strong_sell"
 
 
+class SignalColumns(NamedTuple):
+    """
+    Columnar generate_signals output for N symbols
+
+    signals: (N,) SignalType values
+    confidence, buy_score, sell_score, hold_score: (N,) floats
+    reason_codes: (n_rules, N) index into SIGNAL_RULES[rule] branches of the
+        branch that fired, -1 where it does not count as a reason
+    indicators: Indicator name -> (N,) latest values
+    """
+    signals: np.ndarray
+    confidence: np.ndarray
+    buy_score: np.ndarray
+    sell_score: np.ndarray
+    hold_score: np.ndarray
+    reason_codes: np.ndarray
+    indicators: Dict[str, np.ndarray]
+
+    def to_results(self, symbols: Optional[Sequence[str]] = None) -> List[Dict[str, any]]:
+        """
+        Per-symbol result dicts, as returned by generate_signals
+
+        Args:
+            symbols: Optional names; when given, a dict keyed by symbol is returned
+        """
+        results = []
+
+        for i in range(len(self.signals)):
+            reasons = [
+                SIGNAL_RULES[rule][1][code][2]
+                for rule, code in enumerate(self.reason_codes[:, i].tolist()) if code >= 0
+            ]
+            results.append({
+                'signal': str(self.signals[i]),
+                'confidence': float(self.confidence[i]),
+                'buy_score': float(self.buy_score[i]),
+                'sell_score': float(self.sell_score[i]),
+                'hold_score': float(self.hold_score[i]),
+                'reasons': reasons,
+                'indicators': {name: values[i] for name, values in self.indicators.items()}
+            })
+
+        if symbols is not None:
+            return dict(zip(symbols, results))
+        return results
+
+
+class SignalThresholds(NamedTuple):
+    """Indicator levels the RSI and Bollinger rules of generate_signals test against"""
+    rsi_oversold: float = 30
+    rsi_near_oversold: float = 40
+    rsi_overbought: float = 70
+    rsi_near_overbought: float = 60
+    bb_near_lower: float = 0.1
+    bb_below_middle: float = 0.3
+    bb_near_upper: float = 0.9
+    bb_above_middle: float = 0.7
+
+
+DEFAULT_THRESHOLDS = SignalThresholds()
+
+# Scoring rules of generate_signals and generate_signals_batch, the one
+# definition both evaluate. Per rule: the indicator tests in order (given the
+# indicators and SignalThresholds; scalars or per-symbol arrays), then
+# (signal, weight, reason) for each test plus a final default branch.
+SIGNAL_RULES = [
+    (
+        lambda ind, th: [ind['rsi'] < th.rsi_oversold, ind['rsi'] < th.rsi_near_oversold,
+                         ind['rsi'] > th.rsi_overbought, ind['rsi'] > th.rsi_near_overbought],
+        [('buy', 2.0, 'RSI oversold'), ('buy', 1.0, 'RSI approaching oversold'),
+         ('sell', 2.0, 'RSI overbought'), ('sell', 1.0, 'RSI approaching overbought'),
+         ('hold', 0.5, 'RSI neutral')]
+    ),
+    (
+        lambda ind, th: [
+            (ind['macd'] > ind['macd_signal']) & (ind['macd_histogram'] > 0),
+            (ind['macd'] < ind['macd_signal']) & (ind['macd_histogram'] < 0)
+        ],
+        [('buy', 1.5, 'MACD bullish crossover'), ('sell', 1.5, 'MACD bearish crossover'),
+         ('hold', 0.5, 'MACD neutral')]
+    ),
+    (
+        lambda ind, th: [ind['bb_position'] < th.bb_near_lower, ind['bb_position'] < th.bb_below_middle,
+                         ind['bb_position'] > th.bb_near_upper, ind['bb_position'] > th.bb_above_middle],
+        [('buy', 1.5, 'Price near lower Bollinger Band'), ('buy', 0.8, 'Price below middle Bollinger Band'),
+         ('sell', 1.5, 'Price near upper Bollinger Band'), ('sell', 0.8, 'Price above middle Bollinger Band'),
+         ('hold', 0.5, 'Price in Bollinger Band middle')]
+    ),
+    (
+        lambda ind, th: [ind['stoch_k'] < 20, ind['stoch_k'] > 80],
+        [('buy', 1.2, 'Stochastic oversold'), ('sell', 1.2, 'Stochastic overbought'),
+         ('hold', 0.3, 'Stochastic neutral')]
+    ),
+    (
+        lambda ind, th: [
+            (ind['price'] > ind['sma_20']) & (ind['ema_12'] > ind['sma_20']),
+            (ind['price'] < ind['sma_20']) & (ind['ema_12'] < ind['sma_20'])
+        ],
+        [('buy', 1.0, 'Price above moving averages'), ('sell', 1.0, 'Price below moving averages'),
+         ('hold', 0.3, 'Mixed moving average signals')]
+    )
+    # There is no volume rule: high volume only ever added a 'confirm' entry
+    # of weight 0.5, which counted towards no score and was never a reason
+]
+
+
 class TradingSignalsGenerator:
     """
     Generate trading signals based on technical indicators
+
+    One instance can serve a thread pool: the indicators that
+    analyze_indicators stores for a later generate_signals() call are kept
+    per thread, and everything else is stateless. Coroutines sharing a thread
+    should use evaluate() or pass the indicators to generate_signals
+    explicitly.
     """
 
     def __init__(self):
-        self.indicators = {}
+        self._local = threading.local()
+
+    @property
+    def indicators(self) -> Dict[str, any]:
+        """Indicators from this thread's last analyze_indicators call"""
+        return getattr(self._local, 'indicators', {})
+
+    @indicators.setter
+    def indicators(self, indicators: Dict[str, any]):
+        self._local.indicators = indicators
+
+    def __getstate__(self):
+        # Thread-local storage cannot be pickled (e.g. to process pool workers)
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
 
     def calculate_sma(self, prices: np.ndarray, period: int) -> np.ndarray:
         """Calculate Simple Moving Average"""
-        return np.convolve(prices, np.ones(period)/period, mode='valid')
+        return indicator_engine.sma(prices, period)
 
     def calculate_ema(self, prices: np.ndarray, period: int) -> np.ndarray:
         """Calculate Exponential Moving Average"""
-        multiplier = 2 / (period + 1)
-        ema = np.zeros_like(prices)
-        ema[0] = prices[0]
-
-        for i in range(1, len(prices)):
-            ema[i] = (prices[i] * multiplier) + (ema[i-1] * (1 - multiplier))
-
-        return ema
+        return indicator_engine.ema(prices, period)
 
     def calculate_rsi(self, prices: np.ndarray, period: int = 14) -> np.ndarray:
         """
@@ -50,28 +178,7 @@ class TradingSignalsGenerator:
         Returns:
             RSI values (0-100)
         """
-        deltas = np.diff(prices)
-        gain = np.where(deltas > 0, deltas, 0)
-        loss = np.where(deltas < 0, -deltas, 0)
-
-        # Calculate average gain and loss
-        avg_gain = np.zeros(len(prices))
-        avg_loss = np.zeros(len(prices))
-
-        # First average
-        avg_gain[period] = np.mean(gain[:period])
-        avg_loss[period] = np.mean(loss[:period])
-
-        # Smoothed averages
-        for i in range(period + 1, len(prices)):
-            avg_gain[i] = (avg_gain[i-1] * (period - 1) + gain[i-1]) / period
-            avg_loss[i] = (avg_loss[i-1] * (period - 1) + loss[i-1]) / period
-
-        # Calculate RS and RSI
-        rs = np.where(avg_loss != 0, avg_gain / avg_loss, 0)
-        rsi = 100 - (100 / (1 + rs))
-
-        return rsi
+        return indicator_engine.rsi(prices, period)
 
     def calculate_macd(
         self,
@@ -86,14 +193,7 @@ class TradingSignalsGenerator:
         Returns:
             macd, signal, histogram
         """
-        ema_fast = self.calculate_ema(prices, fast_period)
-        ema_slow = self.calculate_ema(prices, slow_period)
-
-        macd = ema_fast - ema_slow
-        signal = self.calculate_ema(macd, signal_period)
-        histogram = macd - signal
-
-        return macd, signal, histogram
+        return IndicatorEngine(prices).macd(fast_period, slow_period, signal_period)
 
     def calculate_bollinger_bands(
         self,
@@ -107,24 +207,7 @@ class TradingSignalsGenerator:
         Returns:
             upper_band, middle_band (SMA), lower_band
         """
-        middle_band = self.calculate_sma(prices, period)
-
-        # Pad to match price length
-        if len(middle_band) < len(prices):
-            padding = np.full(len(prices) - len(middle_band), middle_band[0])
-            middle_band = np.concatenate([padding, middle_band])
-
-        # Calculate standard deviation
-        std = np.array([
-            np.std(prices[max(0, i-period):i+1]) if i >= period
-            else np.std(prices[:i+1])
-            for i in range(len(prices))
-        ])
-
-        upper_band = middle_band + (std_dev * std)
-        lower_band = middle_band - (std_dev * std)
-
-        return upper_band, middle_band, lower_band
+        return IndicatorEngine(prices).bollinger_bands(period, std_dev)
 
     def calculate_stochastic(
         self,
@@ -139,177 +222,185 @@ class TradingSignalsGenerator:
         Returns:
             %K, %D
         """
-        k_values = np.zeros(len(close))
-
-        for i in range(period - 1, len(close)):
-            highest_high = np.max(high[i - period + 1:i + 1])
-            lowest_low = np.min(low[i - period + 1:i + 1])
-
-            if highest_high - lowest_low != 0:
-                k_values[i] = 100 * (close[i] - lowest_low) / (highest_high - lowest_low)
-            else:
-                k_values[i] = 50
-
-        # %D is 3-period SMA of %K
-        d_values = self.calculate_ema(k_values, 3)
-
-        return k_values, d_values
+        return IndicatorEngine(close, high, low).stochastic(period)
 
     def analyze_indicators(
         self,
         prices: np.ndarray,
         high: np.ndarray = None,
         low: np.ndarray = None,
-        volume: np.ndarray = None
+        volume: np.ndarray = None,
+        last_only: bool = False
     ) -> Dict[str, any]:
         """
         Calculate all technical indicators
 
+        Shared intermediates (the close EMAs behind ema_12 and MACD, the SMA
+        behind sma_20 and the Bollinger middle band) are computed once.
+
         Args:
             prices: Close prices
             high: High prices (optional)
             low: Low prices (optional)
             volume: Volume data (optional)
+            last_only: Only evaluate the tail of the series the current values
+                depend on (see IndicatorEngine.tail_length) instead of all of it
 
         Returns:
             Dictionary of indicators
         """
-        if high is None:
-            high = prices
-        if low is None:
-            low = prices
-
-        # Calculate indicators
-        sma_20 = self.calculate_sma(prices, 20)
-        sma_50 = self.calculate_sma(prices, 50)
-        ema_12 = self.calculate_ema(prices, 12)
-        rsi = self.calculate_rsi(prices)
-        macd, signal, histogram = self.calculate_macd(prices)
-        upper_bb, middle_bb, lower_bb = self.calculate_bollinger_bands(prices)
-        stoch_k, stoch_d = self.calculate_stochastic(high, low, prices)
-
-        # Current values
-        current_price = prices[-1]
-        current_rsi = rsi[-1]
-        current_macd = macd[-1]
-        current_signal = signal[-1]
-        current_stoch_k = stoch_k[-1]
-
-        # Store indicators
-        self.indicators = {
-            'price': current_price,
-            'sma_20': sma_20[-1] if len(sma_20) > 0 else current_price,
-            'sma_50': sma_50[-1] if len(sma_50) > 0 else current_price,
-            'ema_12': ema_12[-1],
-            'rsi': current_rsi,
-            'macd': current_macd,
-            'macd_signal': current_signal,
-            'macd_histogram': histogram[-1],
-            'bb_upper': upper_bb[-1],
-            'bb_middle': middle_bb[-1],
-            'bb_lower': lower_bb[-1],
-            'stoch_k': current_stoch_k,
-            'stoch_d': stoch_d[-1],
-            'bb_position': (current_price - lower_bb[-1]) / (upper_bb[-1] - lower_bb[-1]) if upper_bb[-1] != lower_bb[-1] else 0.5
-        }
+        engine = IndicatorEngine(prices, high, low, volume, last_only=last_only)
 
-        if volume is not None:
-            volume_sma = self.calculate_sma(volume, 20)
-            self.indicators['volume_ratio'] = volume[-1] / volume_sma[-1] if len(volume_sma) > 0 else 1.0
+        # Store indicators (for this thread only)
+        self.indicators = engine.summary()
 
         return self.indicators
 
-    def generate_signals(self, indicators: Dict[str, float] = None) -> Dict[str, any]:
+    def evaluate(
+        self,
+        prices: np.ndarray,
+        high: np.ndarray = None,
+        low: np.ndarray = None,
+        volume: np.ndarray = None,
+        last_only: bool = False
+    ) -> Dict[str, any]:
         """
-        Generate trading signals based on technical indicators
+        analyze_indicators + generate_signals without storing anything
+
+        Reentrant: safe to call concurrently from threads or coroutines on a
+        shared instance.
 
         Args:
-            indicators: Pre-calculated indicators (optional, uses last calculated if None)
+            prices, high, low, volume, last_only: As in analyze_indicators
 
         Returns:
-            Trading signal with confidence score
+            Trading signal with confidence score, as generate_signals
         """
-        if indicators is None:
-            indicators = self.indicators
+        indicators = IndicatorEngine(prices, high, low, volume, last_only=last_only).summary()
+        return self.generate_signals(indicators)
 
-        if not indicators:
-            raise ValueError("No indicators available. Run analyze_indicators first.")
+    def analyze_indicators_batch(
+        self,
+        prices: np.ndarray,
+        high: np.ndarray = None,
+        low: np.ndarray = None,
+        volume: np.ndarray = None,
+        last_only: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate all technical indicators for many symbols at once
 
-        # Signal scoring system
-        signals = []
+        Args:
+            prices: Close prices, shape (symbols, bars)
+            high, low, volume: Optional matrices of the same shape
+            last_only: As in analyze_indicators
 
-        # 1. RSI Analysis
-        rsi = indicators['rsi']
-        if rsi < 30:
-            signals.append(('buy', 2.0, 'RSI oversold'))
-        elif rsi < 40:
-            signals.append(('buy', 1.0, 'RSI approaching oversold'))
-        elif rsi > 70:
-            signals.append(('sell', 2.0, 'RSI overbought'))
-        elif rsi > 60:
-            signals.append(('sell', 1.0, 'RSI approaching overbought'))
-        else:
-            signals.append(('hold', 0.5, 'RSI neutral'))
+        Returns:
+            Indicator name -> (symbols,) latest values, each equal to what
+            analyze_indicators returns for that symbol's row
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim != 2:
+            raise ValueError(f"Expected a (symbols, bars) price matrix, got shape {prices.shape}")
 
-        # 2. MACD Analysis
-        macd = indicators['macd']
-        signal = indicators['macd_signal']
-        histogram = indicators['macd_histogram']
+        return IndicatorEngine(prices, high, low, volume, last_only=last_only).summary()
 
-        if macd > signal and histogram > 0:
-            signals.append(('buy', 1.5, 'MACD bullish crossover'))
-        elif macd < signal and histogram < 0:
-            signals.append(('sell', 1.5, 'MACD bearish crossover'))
-        else:
-            signals.append(('hold', 0.5, 'MACD neutral'))
-
-        # 3. Bollinger Bands Analysis
-        bb_position = indicators['bb_position']
-
-        if bb_position < 0.1:
-            signals.append(('buy', 1.5, 'Price near lower Bollinger Band'))
-        elif bb_position < 0.3:
-            signals.append(('buy', 0.8, 'Price below middle Bollinger Band'))
-        elif bb_position > 0.9:
-            signals.append(('sell', 1.5, 'Price near upper Bollinger Band'))
-        elif bb_position > 0.7:
-            signals.append(('sell', 0.8, 'Price above middle Bollinger Band'))
-        else:
-            signals.append(('hold', 0.5, 'Price in Bollinger Band middle'))
+    def generate_signals_batch(
+        self,
+        indicators: Dict[str, np.ndarray],
+        thresholds: SignalThresholds = DEFAULT_THRESHOLDS
+    ) -> SignalColumns:
+        """
+        Vectorized generate_signals over per-symbol indicator arrays
 
-        # 4. Stochastic Analysis
-        stoch_k = indicators['stoch_k']
+        Every scoring rule is evaluated as masks over all symbols, with the
+        same thresholds, weights and summation order as generate_signals, so
+        each symbol gets exactly the scalar result.
 
-        if stoch_k < 20:
-            signals.append(('buy', 1.2, 'Stochastic oversold'))
-        elif stoch_k > 80:
-            signals.append(('sell', 1.2, 'Stochastic overbought'))
-        else:
-            signals.append(('hold', 0.3, 'Stochastic neutral'))
+        Args:
+            indicators: Output of analyze_indicators_batch (or any indicator
+                name -> 1-D array dict, such as IndicatorEngine.history())
+            thresholds: RSI and Bollinger levels, as in generate_signals
 
-        # 5. Moving Average Analysis
-        price = indicators['price']
-        sma_20 = indicators['sma_20']
-        ema_12 = indicators['ema_12']
+        Returns:
+            SignalColumns (to_results() gives generate_signals-shaped dicts)
+        """
+        n_symbols = len(indicators['price'])
+        buy_score = np.zeros(n_symbols)
+        sell_score = np.zeros(n_symbols)
+        hold_score = np.zeros(n_symbols)
+        reason_codes = np.full((len(SIGNAL_RULES), n_symbols), -1)
 
-        if price > sma_20 and ema_12 > sma_20:
-            signals.append(('buy', 1.0, 'Price above moving averages'))
-        elif price < sma_20 and ema_12 < sma_20:
-            signals.append(('sell', 1.0, 'Price below moving averages'))
-        else:
-            signals.append(('hold', 0.3, 'Mixed moving average signals'))
+        for rule, (tests, branches) in enumerate(SIGNAL_RULES):
+            conditions = tests(indicators, thresholds)
+            branch = np.select(conditions, np.arange(len(conditions)), default=len(conditions))
 
-        # 6. Volume Analysis (if available)
-        if 'volume_ratio' in indicators:
-            volume_ratio = indicators['volume_ratio']
-            if volume_ratio > 1.5:
-                # High volume confirms the trend
-                signals.append(('confirm', 0.5, 'High volume confirmation'))
+            weights = np.array([weight for _, weight, _ in branches])[branch]
+            kinds = np.array([kind for kind, _, _ in branches])[branch]
+
+            # Adding 0.0 for non-matching rules leaves the scalar sums unchanged
+            buy_score += np.where(kinds == 'buy', weights, 0.0)
+            sell_score += np.where(kinds == 'sell', weights, 0.0)
+            hold_score += np.where(kinds == 'hold', weights, 0.0)
+
+            reason_codes[rule] = np.where(weights > 0.5, branch, -1)
+
+        total_score = buy_score + sell_score + hold_score
+
+        buy_wins = (buy_score > sell_score) & (buy_score > hold_score)
+        sell_wins = ~buy_wins & (sell_score > buy_score) & (sell_score > hold_score)
+        signals = np.select(
+            [buy_wins & (buy_score > 6), buy_wins, sell_wins & (sell_score > 6), sell_wins],
+            [SignalType.STRONG_BUY.value, SignalType.BUY.value, SignalType.STRONG_SELL.value, SignalType.SELL.value],
+            default=SignalType.HOLD.value
+        )
+
+        max_score = np.maximum(np.maximum(buy_score, sell_score), hold_score)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            confidence = np.minimum(0.95, np.where(total_score > 0, max_score / total_score, 0.33))
+
+        return SignalColumns(
+            signals=signals,
+            confidence=confidence,
+            buy_score=buy_score,
+            sell_score=sell_score,
+            hold_score=hold_score,
+            reason_codes=reason_codes,
+            indicators=indicators
+        )
+
+    def generate_signals(
+        self,
+        indicators: Dict[str, float] = None,
+        thresholds: SignalThresholds = DEFAULT_THRESHOLDS
+    ) -> Dict[str, any]:
+        """
+        Generate trading signals based on technical indicators
+
+        Args:
+            indicators: Pre-calculated indicators (optional, uses this thread's last calculated if None)
+            thresholds: RSI and Bollinger levels to score against
+
+        Returns:
+            Trading signal with confidence score
+        """
+        if indicators is None:
+            indicators = self.indicators
+
+        if not indicators:
+            raise ValueError("No indicators available. Run analyze_indicators first.")
+
+        # Signal scoring system: the first branch whose test passes, per rule
+        signals = []
+        for tests, branches in SIGNAL_RULES:
+            conditions = tests(indicators, thresholds)
+            branch = next((i for i, passed in enumerate(conditions) if passed), len(conditions))
+            signals.append(branches[branch])
 
         # Calculate final signal
-        buy_score = sum(weight for sig, weight, _ in signals if sig == 'buy')
-        sell_score = sum(weight for sig, weight, _ in signals if sig == 'sell')
-        hold_score = sum(weight for sig, weight, _ in signals if sig == 'hold')
+        buy_score = sum((weight for sig, weight, _ in signals if sig == 'buy'), 0.0)
+        sell_score = sum((weight for sig, weight, _ in signals if sig == 'sell'), 0.0)
+        hold_score = sum((weight for sig, weight, _ in signals if sig == 'hold'), 0.0)
 
         total_score = buy_score + sell_score + hold_score
 
@@ -0,0 +1,77 @@
+"""
+Shared fixtures for the AI model tests
+
+Run from src/backend/ai:
+    python -m pytest -q tests
+"""
+
+import os
+import re
+import sys
+from typing import Tuple
+
+import numpy as np
+import pytest
+
+# Models are imported as `models.<module>`, relative to src/backend/ai
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def random_ohlcv(n_bars: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Random-walk close, high, low and volume series"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    high = close * (1 + np.abs(rng.normal(0, 0.005, n_bars)))
+    low = close * (1 - np.abs(rng.normal(0, 0.005, n_bars)))
+    volume = rng.lognormal(10, 0.5, n_bars)
+    return close, high, low, volume
+
+
+@pytest.fixture
+def ohlcv():
+    """Factory for random-walk close, high, low and volume series"""
+    return random_ohlcv
+
+
+@pytest.fixture(scope='session')
+def sentiment_model_name(tmp_path_factory):
+    """
+    Sentiment model for analyzer tests: SENTIMENT_TEST_MODEL if set (e.g.
+    ProsusAI/finbert where it can be downloaded), otherwise a small randomly
+    initialized BERT classifier saved locally, with a vocabulary covering the
+    benchmark texts
+    """
+    if os.environ.get('SENTIMENT_TEST_MODEL'):
+        return os.environ['SENTIMENT_TEST_MODEL']
+
+    import torch
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizer
+
+    from benchmarks.bench_sentiment import SAMPLE_TEXTS
+    from benchmarks.bench_sentiment_backends import LABELLED_SET
+
+    texts = SAMPLE_TEXTS + [text for text, _ in LABELLED_SET]
+    words = sorted({token for text in texts for token in re.findall(r'\w+|[^\w\s]', text.lower())})
+
+    directory = tmp_path_factory.mktemp('sentiment_model')
+    vocab_file = directory / 'vocab.txt'
+    vocab_file.write_text('\n'.join(['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]'] + words) + '\n')
+    tokenizer = BertTokenizer(str(vocab_file))
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=tokenizer.vocab_size,
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        num_labels=3
+    )
+    model = BertForSequenceClassification(config)
+    # Decisive logits, so labels mean something beyond keyword boosts
+    with torch.no_grad():
+        model.classifier.weight.normal_(0, 1.0)
+
+    model.save_pretrained(directory)
+    tokenizer.save_pretrained(directory)
+    return str(directory)
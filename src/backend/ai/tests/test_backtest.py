@@ -0,0 +1,39 @@
+"""
+Backtester trade accounting
+"""
+
+import numpy as np
+import pytest
+
+from models.backtest import Backtester
+
+
+def test_flip_fee_is_split_between_trades():
+    # Long bars 1-3, flipped short at bar 3 until bar 5, long again bars 6-8
+    positions = np.array([0, 1, 1, -1, -1, 0, 1, 1, 0], dtype=np.float64)
+    previous = np.concatenate([[0.0], positions[:-1]])
+    bar_returns = np.array([0, 0, 0.1, 0.1, -0.1, -0.05, 0, 0.1, 0])
+
+    trade_returns = Backtester._trade_returns(positions, previous, bar_returns, fee=0.01)
+
+    expected = [
+        0.99 * 1.10 * 1.09 - 1,  # entry fee, +10%, +10% less the exit half of the flip fee
+        0.99 * 1.10 * 1.04 - 1,  # entry half of the flip fee, short +10%, short +5% less exit fee
+        0.99 * 1.10 * 0.99 - 1,  # entry fee, +10%, exit fee
+    ]
+    np.testing.assert_allclose(trade_returns, expected, rtol=1e-12)
+
+
+def test_no_trades():
+    positions = np.zeros(5)
+    assert len(Backtester._trade_returns(positions, positions, np.full(5, 0.01), fee=0.001)) == 0
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_long_only_trades_compound_to_equity(ohlcv, seed):
+    # Without flips every bar's return belongs to exactly one trade
+    close, high, low, volume = ohlcv(600, seed)
+    result = Backtester(fee=0.001).run(close, high, low, volume)
+
+    assert result.metrics['n_trades'] > 0
+    assert np.prod(1 + result.trade_returns) == pytest.approx(result.equity[-1], rel=1e-9)
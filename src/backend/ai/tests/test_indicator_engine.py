@@ -0,0 +1,52 @@
+"""
+Indicator functions: input validation and short series
+"""
+
+import numpy as np
+import pytest
+
+from models.indicator_engine import rsi, sma
+from models.trading_signals import TradingSignalsGenerator
+
+
+@pytest.mark.parametrize('n_prices', [0, 1, 14])
+def test_rsi_rejects_short_series(n_prices):
+    with pytest.raises(ValueError, match=f"RSI needs more than 14 prices, got {n_prices}"):
+        rsi(np.linspace(100, 110, n_prices))
+
+
+def test_rsi_accepts_one_more_price_than_period():
+    assert rsi(np.linspace(100, 110, 15)).shape == (15,)
+
+
+@pytest.mark.parametrize('n_prices', [1, 20, 49])
+def test_sma_of_short_series_is_empty(n_prices):
+    prices = np.linspace(100, 110, n_prices)
+
+    assert sma(prices, 50).shape == (0,)
+    assert sma(np.vstack([prices, prices]), 50).shape == (2, 0)
+
+
+def test_sma_full_windows():
+    prices = np.arange(1.0, 51.0)
+
+    np.testing.assert_allclose(sma(prices, 50), [25.5])
+    np.testing.assert_allclose(sma(prices, 20), np.arange(10.5, 41.0))
+
+
+@pytest.mark.parametrize('n_bars', [20, 35, 49])
+def test_short_series_sma_50_falls_back_to_current_price(ohlcv, n_bars):
+    close, high, low, volume = ohlcv(n_bars)
+
+    indicators = TradingSignalsGenerator().analyze_indicators(close, high, low, volume)
+
+    assert indicators['sma_50'] == close[-1]
+    assert indicators['sma_20'] == pytest.approx(close[-20:].mean(), rel=1e-12)
+
+
+def test_sma_50_with_full_window(ohlcv):
+    close, high, low, volume = ohlcv(80)
+
+    indicators = TradingSignalsGenerator().analyze_indicators(close, high, low, volume)
+
+    assert indicators['sma_50'] == pytest.approx(close[-50:].mean(), rel=1e-12)
@@ -0,0 +1,96 @@
+"""
+ModelRegistry: one load per key, and evict/clear against loads in progress
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from models.model_registry import ModelRegistry
+
+
+class CountingLoader:
+    """Loader returning a new object per call, optionally blocking until released"""
+
+    def __init__(self, block: bool = False):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(timeout=10)
+        return object()
+
+
+def test_concurrent_first_gets_load_once():
+    registry = ModelRegistry()
+    loader = CountingLoader()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        models = list(pool.map(lambda _: registry.get('model', loader), range(32)))
+
+    assert loader.calls == 1
+    assert all(model is models[0] for model in models)
+
+
+def test_evict_waits_for_load_in_progress():
+    registry = ModelRegistry()
+    loader = CountingLoader(block=True)
+
+    loading = threading.Thread(target=registry.get, args=('model', loader))
+    loading.start()
+    assert loader.started.wait(timeout=10)
+
+    evicting = threading.Thread(target=registry.evict, args=('model',))
+    evicting.start()
+    evicting.join(timeout=0.2)
+    assert evicting.is_alive()
+
+    loader.release.set()
+    loading.join()
+    evicting.join()
+
+    # The load finished first and the eviction removed its model
+    assert 'model' not in registry
+    assert registry._key_locks == {}
+    registry.get('model', loader)
+    assert loader.calls == 2
+
+
+def test_clear_drops_models_and_key_locks():
+    registry = ModelRegistry()
+    for key in ['a', 'b', ('c', 'cpu')]:
+        registry.get(key, CountingLoader())
+
+    registry.clear()
+
+    assert registry.stats() == {'loaded': 0, 'load_times': {}}
+    assert registry._key_locks == {}
+    registry.evict('missing')
+
+
+def test_gets_during_evictions_always_return_a_model():
+    registry = ModelRegistry()
+    loader = CountingLoader()
+    stop = threading.Event()
+
+    def evict_repeatedly():
+        while not stop.is_set():
+            registry.evict('model')
+            registry.clear()
+
+    evicting = threading.Thread(target=evict_repeatedly)
+    evicting.start()
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            models = list(pool.map(lambda _: registry.get('model', loader), range(2000)))
+    finally:
+        stop.set()
+        evicting.join()
+
+    assert all(model is not None for model in models)
+    registry.clear()
+    assert registry._key_locks == {} and 'model' not in registry
@@ -0,0 +1,128 @@
+"""
+OHLCVStore: live appends and file growth seen by readers in this and other
+processes, read-only views and argument validation
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from models.ohlcv_store import OHLCVSeries, OHLCVStore
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Opens the series once, then prints its row count and close sum for every
+# line read from stdin
+READER = """
+import sys
+from models.ohlcv_store import OHLCVStore
+
+series = OHLCVStore(sys.argv[1]).series('BTC')
+for _ in sys.stdin:
+    close = series.close
+    print(len(close), repr(float(close.sum())), flush=True)
+"""
+
+
+def candles(start: int, n_rows: int):
+    """timestamp, open, high, low, close, volume for rows start..start + n_rows"""
+    rows = np.arange(start, start + n_rows, dtype=np.float64)
+    return np.arange(start, start + n_rows), rows, rows + 2, rows - 2, rows + 1, rows * 10
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OHLCVStore(str(tmp_path / 'store'))
+
+
+@pytest.fixture
+def small_series(store):
+    """Writable BTC series that has to grow after 4 rows"""
+    return OHLCVSeries.create(store.path('BTC'), capacity=4)
+
+
+def test_reader_sees_appends_across_two_grows(store, small_series):
+    small_series.append(*candles(0, 3))
+    reader = store.series('BTC')
+    views = [reader.close]
+
+    small_series.append(*candles(3, 3))  # 4 -> 8 rows
+    assert small_series.capacity == 8
+    views.append(reader.close)
+
+    small_series.append(*candles(6, 5))  # 8 -> 16 rows
+    assert small_series.capacity == 16
+    views.append(reader.close)
+
+    assert [len(view) for view in views] == [3, 6, 11]
+    np.testing.assert_array_equal(reader.close, np.arange(11) + 1.0)
+    np.testing.assert_array_equal(reader.ohlcv(), np.column_stack(candles(0, 11)[1:]))
+    assert reader.capacity == 16
+    # Views taken before a grow keep their rows
+    np.testing.assert_array_equal(views[0], [1.0, 2.0, 3.0])
+    assert not os.path.exists(small_series.path + '.grow')
+
+
+def test_reader_process_sees_appends_across_two_grows(store, small_series):
+    small_series.append(*candles(0, 2), flush=True)
+    reader = subprocess.Popen(
+        [sys.executable, '-c', READER, store.root],
+        cwd=AI_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+
+    def read():
+        reader.stdin.write('\n')
+        reader.stdin.flush()
+        n_rows, total = reader.stdout.readline().split()
+        return int(n_rows), float(total)
+
+    try:
+        seen = [read()]
+        for start, n_rows in [(2, 1), (3, 3), (6, 5)]:  # grows to 8, then 16
+            small_series.append(*candles(start, n_rows), flush=True)
+            seen.append(read())
+    finally:
+        reader.stdin.close()
+        reader.wait(timeout=30)
+
+    assert reader.returncode == 0
+    assert seen == [(n, float(np.sum(np.arange(n) + 1.0))) for n in (2, 3, 6, 11)]
+
+
+def test_views_are_read_only(store):
+    store.append('BTC', *candles(0, 5))
+    writer = store.series('BTC', writable=True)
+
+    for series in (writer, store.series('BTC')):
+        for view in (series.close, series.timestamp, series.ohlcv()):
+            assert not view.flags.writeable
+            with pytest.raises(ValueError):
+                view[0] = 0
+
+    np.testing.assert_array_equal(writer.close, np.arange(5) + 1.0)
+
+
+@pytest.mark.parametrize('last, expected_rows', [(None, 5), (0, 0), (2, 2), (5, 5), (9, 5)])
+def test_ohlcv_last(store, last, expected_rows):
+    store.append('BTC', *candles(0, 5))
+
+    data = store.ohlcv('BTC', last=last)
+    assert data.shape == (expected_rows, 5)
+    np.testing.assert_array_equal(data[:, 3], np.arange(5 - expected_rows, 5) + 1.0)
+
+
+def test_invalid_arguments(store):
+    store.append('BTC', *candles(0, 5))
+
+    with pytest.raises(ValueError):
+        store.ohlcv('BTC', last=-1)
+    for symbol in ['', '.hidden', os.path.join('..', 'BTC')]:
+        with pytest.raises(ValueError):
+            store.path(symbol)
+    with pytest.raises(ValueError):
+        store.append('BTC', *candles(4, 1))
+    with pytest.raises(ValueError):
+        store.series('BTC').append(*candles(5, 1))
@@ -0,0 +1,125 @@
+"""
+CryptoPricePredictor: MC dropout on shared models, and predict_many vs
+predict
+"""
+
+import sys
+import threading
+
+import numpy as np
+import pytest
+import torch
+
+from models.price_predictor import CryptoPricePredictor
+
+
+@pytest.fixture
+def candles(ohlcv):
+    """(n, 5) [open, high, low, close, volume] candles"""
+    def make(n_rows: int, seed: int = 0, extra_columns: int = 0) -> np.ndarray:
+        close, high, low, volume = ohlcv(n_rows, seed)
+        open_ = np.concatenate([[close[0]], close[:-1]])
+        columns = [open_, high, low, close, volume] + [np.full(n_rows, 7.0)] * extra_columns
+        return np.stack(columns, axis=1)
+    return make
+
+
+def assert_predictions_close(actual, expected):
+    # predict_many applies the scalers itself, predict through MinMaxScaler.transform
+    assert actual.keys() == expected.keys()
+    for horizon in expected:
+        assert actual[horizon] == pytest.approx(expected[horizon], rel=1e-5)
+
+
+def untrained_predictor(data: np.ndarray, multi_head: bool = False) -> CryptoPricePredictor:
+    # Untrained weights predict exactly like trained ones
+    torch.manual_seed(0)
+    predictor = CryptoPricePredictor(multi_head=multi_head)
+    predictor.scaler.fit(predictor.prepare_features(data))
+    predictor.is_trained = True
+    return predictor
+
+
+@pytest.mark.parametrize('multi_head', [False, True])
+def test_deterministic_predict_is_stable_during_mc_on_shared_models(candles, tmp_path, multi_head):
+    data = candles(300)
+    path = str(tmp_path / 'predictor.bundle')
+    untrained_predictor(data, multi_head).save_bundle(path)
+
+    # Both load the same process-wide models from the registry
+    deterministic, stochastic = CryptoPricePredictor(), CryptoPricePredictor()
+    deterministic.load_bundle(path)
+    stochastic.load_bundle(path)
+    for name, model in deterministic.models.items():
+        assert stochastic.models[name] is model
+
+    expected = deterministic.predict(data)
+    stop = threading.Event()
+
+    def run_mc():
+        while not stop.is_set():
+            stochastic.predict(data, mc_samples=16)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    worker = threading.Thread(target=run_mc)
+    worker.start()
+    try:
+        results = [deterministic.predict(data) for _ in range(100)]
+    finally:
+        stop.set()
+        worker.join()
+        sys.setswitchinterval(interval)
+
+    assert all(result == expected for result in results)
+    assert not any(model.training for model in deterministic.models.values())
+
+
+def test_mc_dropout_shares_weights_without_changing_mode(candles):
+    data = candles(300)
+    predictor = untrained_predictor(data)
+
+    first = predictor.predict(data, mc_samples=8)
+    assert first['24h']['confidence_upper'] > first['24h']['confidence_lower']
+    assert not any(model.training for model in predictor.models.values())
+
+    twin = predictor._dropout_model('24h')
+    assert twin.training
+    assert all(a is b for a, b in zip(predictor.models['24h'].parameters(), twin.parameters()))
+    assert predictor._dropout_model('24h') is twin
+
+    # Replaced models get a fresh twin
+    predictor.models = predictor._build_models()
+    assert predictor._dropout_model('24h') is not twin
+
+
+def test_predict_many_matches_predict(candles):
+    data = {symbol: candles(200, seed=i) for i, symbol in enumerate(['BTC', 'ETH', 'SOL'])}
+    predictor = untrained_predictor(data['BTC'])
+
+    results = predictor.predict_many(data)
+    for symbol, x in data.items():
+        assert_predictions_close(results[symbol], predictor.predict(x))
+        assert_predictions_close(predictor.predict_many({symbol: x})[symbol], predictor.predict(x))
+
+
+def test_predict_many_ignores_extra_columns(candles):
+    predictor = untrained_predictor(candles(200))
+    wide = candles(200, seed=1, extra_columns=2)
+
+    assert predictor.predict_many({'BTC': wide}) == predictor.predict_many({'BTC': wide[:, :5]})
+    assert predictor.predict(wide) == predictor.predict(wide[:, :5])
+
+
+def test_predict_uses_asset_scaler_for_symbol(candles):
+    predictor = untrained_predictor(candles(200))
+    # An asset on a very different price scale
+    cheap = candles(200, seed=1)
+    cheap[:, :4] /= 1000
+    predictor.fit_asset_scaler('DOGE', cheap)
+
+    expected = predictor.predict_many({'DOGE': cheap})['DOGE']
+    assert_predictions_close(predictor.predict(cheap, symbol='DOGE'), expected)
+    assert predictor.predict(cheap)['24h']['predicted_price'] != pytest.approx(expected['24h']['predicted_price'], rel=1e-3)
+    # Symbols without an asset scaler fall back to the shared one
+    assert predictor.predict(cheap, symbol='XRP') == predictor.predict(cheap)
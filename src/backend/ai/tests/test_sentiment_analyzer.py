@@ -0,0 +1,150 @@
+"""
+CryptoSentimentAnalyzer: inference backends against fp32, the cached ONNX
+export, and batched against single-text scoring
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+import torch
+from transformers import AutoModelForSequenceClassification
+
+from benchmarks.bench_sentiment import SAMPLE_TEXTS, make_mixed_corpus
+from benchmarks.bench_sentiment_backends import LABELLED_SET
+from models import sentiment_analyzer
+from models.sentiment_analyzer import SENTIMENT_LABELS, CryptoSentimentAnalyzer
+
+# Dynamic int8 quantization may move a borderline text across a label
+# boundary; the traced and exported fp32 graphs must not
+MIN_INT8_AGREEMENT = 0.9
+
+
+@pytest.fixture
+def onnx_cache(tmp_path, monkeypatch):
+    directory = tmp_path / 'onnx'
+    monkeypatch.setattr(sentiment_analyzer, 'ONNX_CACHE_DIR', str(directory))
+    return directory
+
+
+def scores(analyzer, texts):
+    results = analyzer.analyze_batch(texts)
+    labels = [result['sentiment'] for result in results]
+    probs = np.array([[result['scores'][label] for label in SENTIMENT_LABELS] for result in results])
+    return labels, probs
+
+
+@pytest.fixture
+def reference(sentiment_model_name):
+    analyzer = CryptoSentimentAnalyzer(sentiment_model_name, cache_size=0, shared=False)
+    return scores(analyzer, [text for text, _ in LABELLED_SET])
+
+
+@pytest.mark.parametrize('backend', ['int8', 'torchscript', 'onnx'])
+def test_backend_agrees_with_fp32(sentiment_model_name, reference, onnx_cache, backend):
+    analyzer = CryptoSentimentAnalyzer(sentiment_model_name, backend=backend, cache_size=0, shared=False)
+    labels, probs = scores(analyzer, [text for text, _ in LABELLED_SET])
+    expected_labels, expected_probs = reference
+
+    agreement = np.mean([a == b for a, b in zip(labels, expected_labels)])
+    if backend == 'int8':
+        assert agreement >= MIN_INT8_AGREEMENT
+    else:
+        assert agreement == 1.0
+        np.testing.assert_allclose(probs, expected_probs, atol=1e-4)
+
+
+def test_onnx_export_is_cached(sentiment_model_name, onnx_cache):
+    first = CryptoSentimentAnalyzer(sentiment_model_name, backend='onnx', cache_size=0, shared=False)
+    path = CryptoSentimentAnalyzer.default_onnx_path(sentiment_model_name)
+    assert os.listdir(onnx_cache) == [os.path.basename(path)]
+    exported_at = os.stat(path).st_mtime_ns
+
+    # A second process or restart loads the same graph instead of re-exporting
+    second = CryptoSentimentAnalyzer(sentiment_model_name, backend='onnx', cache_size=0, shared=False)
+    assert os.listdir(onnx_cache) == [os.path.basename(path)]
+    assert os.stat(path).st_mtime_ns == exported_at
+
+    texts = [text for text, _ in LABELLED_SET]
+    assert first.analyze_batch(texts) == second.analyze_batch(texts)
+
+
+def test_onnx_backend_holds_no_eager_model(sentiment_model_name, onnx_cache, monkeypatch):
+    exporting = CryptoSentimentAnalyzer(sentiment_model_name, backend='onnx', cache_size=0, shared=False)
+    assert exporting.model is None
+
+    # With the graph cached, only the tokenizer is loaded
+    def no_eager_model(self):
+        raise AssertionError('eager model loaded')
+
+    monkeypatch.setattr(CryptoSentimentAnalyzer, '_load_fp32', no_eager_model)
+    cached = CryptoSentimentAnalyzer(sentiment_model_name, backend='onnx', cache_size=0, shared=False)
+    assert cached.model is None
+    texts = [text for text, _ in LABELLED_SET]
+    assert cached.analyze_batch(texts) == exporting.analyze_batch(texts)
+
+
+def test_onnx_export_follows_retrained_weights(sentiment_model_name, onnx_cache, tmp_path):
+    model_dir = str(tmp_path / 'model')
+    shutil.copytree(sentiment_model_name, model_dir)
+    texts = [text for text, _ in LABELLED_SET]
+
+    before = scores(CryptoSentimentAnalyzer(model_dir, backend='onnx', cache_size=0, shared=False), texts)
+    first_export = CryptoSentimentAnalyzer.default_onnx_path(model_dir)
+
+    # Retrain in place
+    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    with torch.no_grad():
+        model.classifier.weight.neg_()
+    model.save_pretrained(model_dir)
+
+    assert CryptoSentimentAnalyzer.default_onnx_path(model_dir) != first_export
+    after = scores(CryptoSentimentAnalyzer(model_dir, backend='onnx', cache_size=0, shared=False), texts)
+    expected = scores(CryptoSentimentAnalyzer(model_dir, cache_size=0, shared=False), texts)
+
+    assert after[0] == expected[0]
+    np.testing.assert_allclose(after[1], expected[1], atol=1e-4)
+    assert not np.allclose(after[1], before[1], atol=1e-4)
+    # The stale graph is gone
+    assert os.listdir(onnx_cache) == [os.path.basename(CryptoSentimentAnalyzer.default_onnx_path(model_dir))]
+
+
+def test_explicit_onnx_path(sentiment_model_name, onnx_cache, tmp_path):
+    path = tmp_path / 'graphs' / 'sentiment.onnx'
+    CryptoSentimentAnalyzer(sentiment_model_name, backend='onnx', onnx_path=str(path), cache_size=0, shared=False)
+
+    assert os.listdir(path.parent) == ['sentiment.onnx']
+    assert not onnx_cache.exists()
+
+
+def probs_of(results):
+    return np.array([[result['scores'][label] for label in SENTIMENT_LABELS] for result in results])
+
+
+@pytest.mark.parametrize('batch_size, max_tokens', [(64, 4096), (64, 512), (8, None), (64, None)])
+def test_batched_scores_match_single_texts(sentiment_model_name, batch_size, max_tokens):
+    # Headlines next to long posts, so most texts are padded in their batch;
+    # empty texts and duplicates take the non-model paths
+    texts = make_mixed_corpus(40, seed=7) + ['', 'https://t.co/x', SAMPLE_TEXTS[0], SAMPLE_TEXTS[0]]
+    analyzer = CryptoSentimentAnalyzer(sentiment_model_name, cache_size=0, shared=False)
+    single = [analyzer.analyze_sentiment(text) for text in texts]
+
+    batched = analyzer.analyze_batch(texts, batch_size=batch_size, max_tokens=max_tokens)
+
+    np.testing.assert_allclose(probs_of(batched), probs_of(single), atol=1e-5)
+    assert [result['sentiment'] for result in batched] == [result['sentiment'] for result in single]
+
+
+def test_padding_does_not_change_scores(sentiment_model_name):
+    analyzer = CryptoSentimentAnalyzer(sentiment_model_name, cache_size=0, shared=False)
+    short = SAMPLE_TEXTS[1]
+    long = ' '.join(SAMPLE_TEXTS * 3)
+    encoded = analyzer._encode([short, long])
+    assert len(encoded[0]['input_ids']) < len(encoded[1]['input_ids']) // 4
+
+    # One fixed-size batch pads the short text to the long one
+    together = analyzer.analyze_batch_columns([short, long], max_tokens=None)
+    alone = [analyzer.analyze_batch_columns([text], max_tokens=None) for text in (short, long)]
+
+    np.testing.assert_allclose(together.probs, np.vstack([columns.probs for columns in alone]), atol=1e-5)
@@ -0,0 +1,84 @@
+"""
+SentimentBatcher: per-caller results and failures, and served counts
+"""
+
+import asyncio
+
+import pytest
+
+from models.sentiment_analyzer import CryptoSentimentAnalyzer
+from models.sentiment_service import SentimentBatcher
+
+TEXTS = [
+    'Bitcoin breaks out to a new all-time high',
+    'Exchange hacked, withdrawals halted',
+    'ETH moves sideways ahead of the upgrade',
+    'Whales are accumulating bitcoin',
+]
+BAD_TEXT = 'this text fails'
+
+
+class FailingAnalyzer(CryptoSentimentAnalyzer):
+    """Analyzer whose batch call raises whenever BAD_TEXT is in it"""
+
+    def analyze_batch(self, texts, *args, **kwargs):
+        if BAD_TEXT in texts:
+            raise RuntimeError('bad input')
+        return super().analyze_batch(texts, *args, **kwargs)
+
+
+def assert_results_close(actual, expected):
+    # Padding within a batch moves probabilities by float noise only
+    assert len(actual) == len(expected)
+    for a, b in zip(actual, expected):
+        assert a['sentiment'] == b['sentiment']
+        assert a['scores'] == pytest.approx(b['scores'], abs=1e-5)
+
+
+@pytest.fixture(scope='module')
+def analyzer(sentiment_model_name):
+    return FailingAnalyzer(sentiment_model_name, cache_size=0, shared=False)
+
+
+def test_concurrent_requests_are_batched(analyzer):
+    async def run():
+        async with SentimentBatcher(analyzer, max_batch_size=8, max_wait_ms=50) as batcher:
+            results = await asyncio.gather(*(batcher.analyze(text) for text in TEXTS))
+            return results, batcher.stats()
+
+    results, stats = asyncio.run(run())
+
+    assert_results_close(results, [analyzer.analyze_sentiment(text) for text in TEXTS])
+    assert stats['batches_run'] == 1
+    assert stats['requests_served'] == len(TEXTS)
+
+
+def test_failing_text_only_fails_its_caller(analyzer):
+    texts = TEXTS[:2] + [BAD_TEXT] + TEXTS[2:]
+
+    async def run():
+        async with SentimentBatcher(analyzer, max_batch_size=8, max_wait_ms=50) as batcher:
+            results = await asyncio.gather(*(batcher.analyze(text) for text in texts), return_exceptions=True)
+            return results, batcher.stats()
+
+    results, stats = asyncio.run(run())
+
+    assert isinstance(results[2], RuntimeError)
+    assert_results_close(results[:2] + results[3:], [analyzer.analyze_sentiment(text) for text in TEXTS])
+    assert stats['requests_served'] == len(TEXTS)
+
+
+def test_cancelled_requests_are_not_served(analyzer):
+    async def run():
+        async with SentimentBatcher(analyzer, max_batch_size=8, max_wait_ms=200) as batcher:
+            tasks = [asyncio.create_task(batcher.analyze(text)) for text in TEXTS]
+            await asyncio.sleep(0.02)
+            tasks[1].cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            return results, batcher.stats()
+
+    results, stats = asyncio.run(run())
+
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert stats['requests_served'] == len(TEXTS) - 1
+    assert stats['batches_run'] == 1
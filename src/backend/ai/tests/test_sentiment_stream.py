@@ -0,0 +1,148 @@
+"""
+StreamingSentimentAggregator: sliding, tumbling and cumulative windows
+against aggregate_sentiment, sources and the overall summary
+"""
+
+import numpy as np
+import pytest
+
+from models.sentiment_analyzer import CryptoSentimentAnalyzer
+from models.sentiment_stream import StreamingSentimentAggregator
+
+
+def result(sentiment: str, positive: float, negative: float) -> dict:
+    return {
+        'sentiment': sentiment,
+        'scores': {'positive': positive, 'negative': negative, 'neutral': 1 - positive - negative}
+    }
+
+
+BULLISH = result('positive', 0.8, 0.1)
+BEARISH = result('negative', 0.1, 0.7)
+
+
+@pytest.fixture(scope='module')
+def analyzer(sentiment_model_name):
+    return CryptoSentimentAnalyzer(sentiment_model_name, cache_size=0, shared=False)
+
+
+def random_results(n_results: int, seed: int = 0):
+    """Results shaped like analyze_sentiment output, with random weights"""
+    rng = np.random.default_rng(seed)
+    probs = rng.dirichlet([1.0, 1.0, 1.0], n_results)
+    labels = ['positive', 'negative', 'neutral']
+    results = [
+        {'sentiment': labels[int(np.argmax(row))],
+         'scores': {label: float(p) for label, p in zip(labels, row)}}
+        for row in probs
+    ]
+    return results, rng.uniform(0.5, 5.0, n_results).tolist()
+
+
+def assert_aggregate_matches(actual, expected):
+    # The stream sums weighted scores before normalizing, aggregate_sentiment after
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, dict):
+            assert actual[key] == pytest.approx(value, rel=1e-9)
+        elif isinstance(value, float):
+            assert actual[key] == pytest.approx(value, rel=1e-9, abs=1e-12)
+        else:
+            assert actual[key] == value
+
+
+def test_cumulative_matches_aggregate_sentiment(analyzer):
+    results, weights = random_results(500)
+    stream = StreamingSentimentAggregator()
+    for i, (item, weight) in enumerate(zip(results, weights)):
+        stream.add(item, 'twitter', weight, timestamp=float(i * 1000))
+
+    assert_aggregate_matches(stream.aggregate('twitter'), analyzer.aggregate_sentiment(results, weights))
+
+
+def test_sliding_window_evicts_old_buckets(analyzer):
+    # One result every 2 seconds, 10-second buckets, 60-second window
+    results, weights = random_results(100, seed=1)
+    timestamps = [2.0 * i for i in range(100)]
+    stream = StreamingSentimentAggregator(window_seconds=60, bucket_seconds=10)
+
+    for t, item, weight in zip(timestamps, results, weights):
+        stream.add(item, 'reddit', weight, timestamp=t)
+
+        # Every bucket overlapping (t - 60, t] is kept
+        start = (t - 60) // 10 * 10
+        in_window = [i for i, ts in enumerate(timestamps) if start <= ts <= t]
+        assert_aggregate_matches(
+            stream.aggregate('reddit'),
+            analyzer.aggregate_sentiment([results[i] for i in in_window], [weights[i] for i in in_window])
+        )
+
+    # Time passing without new results expires buckets too
+    last = timestamps[-1]
+    assert stream.aggregate('reddit', now=last + 30)['sample_size'] == \
+        sum(1 for ts in timestamps if ts >= (last - 30) // 10 * 10)
+    assert stream.aggregate('reddit', now=last + 70) == CryptoSentimentAnalyzer.empty_aggregate()
+
+
+def test_tumbling_windows_and_completed(analyzer):
+    results, weights = random_results(30, seed=2)
+    stream = StreamingSentimentAggregator(window_seconds=60, mode='tumbling')
+
+    # 0-59s: first window
+    for i in range(20):
+        stream.add(results[i], 'news', weights[i], timestamp=3.0 * i)
+    assert stream.completed('news') == CryptoSentimentAnalyzer.empty_aggregate()
+    assert_aggregate_matches(stream.aggregate('news'), analyzer.aggregate_sentiment(results[:20], weights[:20]))
+
+    # 60-119s: the first window is finished and the aggregate restarts
+    for i in range(20, 30):
+        stream.add(results[i], 'news', weights[i], timestamp=60.0 + 3.0 * (i - 20))
+    assert_aggregate_matches(stream.completed('news'), analyzer.aggregate_sentiment(results[:20], weights[:20]))
+    assert_aggregate_matches(stream.aggregate('news'), analyzer.aggregate_sentiment(results[20:], weights[20:]))
+
+    # An empty window in between: the last finished one is the 60-119s window
+    assert stream.aggregate('news', now=185.0) == CryptoSentimentAnalyzer.empty_aggregate()
+    assert_aggregate_matches(stream.completed('news'), analyzer.aggregate_sentiment(results[20:], weights[20:]))
+
+
+def test_late_result_lands_in_newest_bucket(analyzer):
+    stream = StreamingSentimentAggregator(window_seconds=60, bucket_seconds=10)
+    stream.add(BULLISH, 'twitter', timestamp=100.0)
+    # Older than the window, but counted with the newest bucket rather than dropped
+    stream.add(BEARISH, 'twitter', timestamp=15.0)
+
+    assert stream.latest_timestamp == 100.0
+    assert [bucket[0] for bucket in stream.sources['twitter'].buckets] == [10]
+    assert_aggregate_matches(stream.aggregate('twitter'), analyzer.aggregate_sentiment([BULLISH, BEARISH]))
+
+    # ... and expires together with it
+    assert stream.aggregate('twitter', now=169.0)['sample_size'] == 2
+    assert stream.aggregate('twitter', now=170.0) == CryptoSentimentAnalyzer.empty_aggregate()
+
+
+@pytest.mark.parametrize('source', ['telegram', 'Twitter', ''])
+def test_unknown_sources_are_rejected(source):
+    stream = StreamingSentimentAggregator()
+
+    with pytest.raises(ValueError, match='Unknown source'):
+        stream.add(BULLISH, source, timestamp=0.0)
+    with pytest.raises(ValueError, match='Unknown source'):
+        stream.add_batch([BULLISH, BEARISH], source, timestamp=0.0)
+
+    assert stream.sources == {}
+    assert stream.summary() == {}
+
+
+def test_overall_covers_every_source():
+    stream = StreamingSentimentAggregator()
+    stream.add_batch([BULLISH] * 3, 'twitter', timestamp=0.0)
+    stream.add_batch([BEARISH] * 2, 'reddit', timestamp=0.0)
+    stream.add(BULLISH, 'news', weight=5.0, timestamp=0.0)
+
+    summary = stream.summary()
+
+    assert set(summary) == set(CryptoSentimentAnalyzer.SOURCE_WEIGHTS) | {'overall'}
+    assert summary['overall']['sources_analyzed'] == 3
+    assert summary['overall'] == CryptoSentimentAnalyzer.combine_sources(
+        {source: stream.aggregate(source) for source in CryptoSentimentAnalyzer.SOURCE_WEIGHTS}
+    )
@@ -0,0 +1,132 @@
+"""
+StreamingSignalsGenerator must give, tick by tick, what analyze_indicators
++ generate_signals give over the same history
+"""
+
+import numpy as np
+import pytest
+
+from models.signal_stream import StreamingSignalsGenerator
+from models.trading_signals import TradingSignalsGenerator
+
+TOLERANCE = dict(rtol=1e-9, atol=1e-9)
+
+
+def assert_matches_batch(result, prices, high=None, low=None, volume=None):
+    batch = TradingSignalsGenerator()
+    indicators = batch.analyze_indicators(prices, high, low, volume)
+    expected = batch.generate_signals(indicators)
+
+    assert result['indicators'].keys() == indicators.keys()
+    for key, value in indicators.items():
+        np.testing.assert_allclose(result['indicators'][key], value, err_msg=key, **TOLERANCE)
+
+    assert result['signal'] == expected['signal']
+    assert result['reasons'] == expected['reasons']
+    np.testing.assert_allclose(result['confidence'], expected['confidence'], **TOLERANCE)
+
+
+def test_update_matches_batch_on_every_prefix(ohlcv):
+    close, high, low, volume = ohlcv(400, seed=1)
+    stream = StreamingSignalsGenerator()
+
+    for t in range(len(close)):
+        result = stream.update(close[t], high[t], low[t], volume[t])
+        if t + 1 < StreamingSignalsGenerator.MIN_TICKS:
+            assert result is None
+            continue
+
+        n = t + 1
+        assert_matches_batch(result, close[:n], high[:n], low[:n], volume[:n])
+        assert stream.indicators == result['indicators']
+
+
+def test_warm_up_boundary(ohlcv):
+    close, high, low, volume = ohlcv(StreamingSignalsGenerator.MIN_TICKS, seed=2)
+    stream = StreamingSignalsGenerator()
+
+    for t in range(StreamingSignalsGenerator.MIN_TICKS - 1):
+        assert stream.update(close[t], high[t], low[t], volume[t]) is None
+        assert not stream.is_ready
+
+    # The batch path cannot score one bar short of a Bollinger window either
+    n = StreamingSignalsGenerator.MIN_TICKS - 1
+    with pytest.raises(ValueError):
+        TradingSignalsGenerator().analyze_indicators(close[:n], high[:n], low[:n], volume[:n])
+
+    t = StreamingSignalsGenerator.MIN_TICKS - 1
+    result = stream.update(close[t], high[t], low[t], volume[t])
+    assert stream.is_ready
+    assert_matches_batch(result, close, high, low, volume)
+
+
+def test_flat_prices_give_zero_width_bands():
+    prices = np.full(80, 5.0)
+    stream = StreamingSignalsGenerator()
+
+    for t, price in enumerate(prices):
+        result = stream.update(price)
+        if result is not None:
+            assert_matches_batch(result, prices[:t + 1])
+
+    assert result['indicators']['bb_upper'] == result['indicators']['bb_lower']
+    assert result['indicators']['bb_position'] == 0.5
+    assert result['indicators']['stoch_k'] == 50
+    assert 'volume_ratio' not in result['indicators']
+
+
+def test_rising_prices_have_no_losses():
+    prices = 100 + np.arange(60, dtype=np.float64)
+    stream = StreamingSignalsGenerator()
+
+    for t, price in enumerate(prices):
+        result = stream.update(price)
+        if result is not None:
+            assert_matches_batch(result, prices[:t + 1])
+
+    # No losses means no RSI average loss, which the batch kernel scores as 0
+    assert result['indicators']['rsi'] == 0
+
+
+def test_warm_up_then_update(ohlcv):
+    close, high, low, volume = ohlcv(300, seed=3)
+    stream = StreamingSignalsGenerator()
+    stream.warm_up(close[:200], high[:200], low[:200], volume[:200])
+
+    expected = TradingSignalsGenerator().analyze_indicators(close[:200], high[:200], low[:200], volume[:200])
+    for key, value in expected.items():
+        np.testing.assert_allclose(stream.indicators[key], value, err_msg=key, **TOLERANCE)
+
+    for t in range(200, 300):
+        result = stream.update(close[t], high[t], low[t], volume[t])
+        assert_matches_batch(result, close[:t + 1], high[:t + 1], low[:t + 1], volume[:t + 1])
+
+
+def test_volume_must_be_given_on_every_tick_or_none():
+    stream = StreamingSignalsGenerator()
+    stream.update(100.0, volume=1.0)
+    with pytest.raises(ValueError):
+        stream.update(101.0)
+
+
+def test_reset_forgets_history(ohlcv):
+    close, high, low, volume = ohlcv(100, seed=4)
+    stream = StreamingSignalsGenerator()
+    stream.warm_up(close, high, low, volume)
+    stream.reset()
+
+    assert not stream.is_ready
+    for t in range(30):
+        result = stream.update(close[t], high[t], low[t], volume[t])
+    assert_matches_batch(result, close[:30], high[:30], low[:30], volume[:30])
+
+
+def test_reset_clears_stochastic_state(ohlcv):
+    close, high, low, volume = ohlcv(100, seed=5)
+    stream = StreamingSignalsGenerator()
+    assert stream._stoch_k == 0.0
+
+    stream.warm_up(close, high, low, volume)
+    assert stream._stoch_k != 0.0
+    stream.reset()
+    assert stream._stoch_k == 0.0
@@ -0,0 +1,53 @@
+"""
+Single-pass clean_text against the previous four-regex pipeline
+"""
+
+import random
+
+import pytest
+
+from benchmarks.bench_text_pipeline import legacy_preprocess, make_tweets
+from models.sentiment_analyzer import clean_text
+
+# Fragments that make the URL, mention, hashtag and special-character
+# passes interact when glued together
+FRAGMENTS = [
+    '@', '#', 'http', 'https://', 'www', 'www.', '.', ',', '!', '?', ':', '/',
+    'x', 'btc', '_', '42', ' ', '  ', '\t', '\n', '$', '🚀', 'é', 'ß', '-', "'"
+]
+
+EDGE_CASES = [
+    '',
+    '   ',
+    '@whale_alert',
+    '@userhttp://t.co/x',
+    '@user_https://t.co/x rest',
+    '@wwwxyz',
+    '@a@b@c',
+    '#BTC#ETH',
+    '#@user',
+    'mail me at someone@example.com!',
+    'www.example.com/path?q=1, then more',
+    'wwwAexample',
+    'https://t.co/abc@user',
+    '$BTC to the 🚀🚀 moon!!!',
+    'Bitcoin  rallies today',
+    'naïve café Straße',
+]
+
+
+@pytest.mark.parametrize('text', EDGE_CASES)
+def test_edge_cases_match_legacy(text):
+    assert clean_text(text) == legacy_preprocess(text)
+
+
+def test_tweets_match_legacy():
+    for text in make_tweets(2000):
+        assert clean_text(text) == legacy_preprocess(text)
+
+
+def test_random_fragments_match_legacy():
+    rng = random.Random(0)
+    for _ in range(20000):
+        text = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12)))
+        assert clean_text(text) == legacy_preprocess(text), repr(text)
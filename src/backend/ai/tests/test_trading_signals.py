@@ -0,0 +1,150 @@
+"""
+TradingSignalsGenerator: scalar and batch scoring, one instance serving a
+thread pool, and pickling for process pools
+"""
+
+import json
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from models.signal_stream import StreamingSignalsGenerator
+from models.trading_signals import SIGNAL_RULES, SignalThresholds, TradingSignalsGenerator
+
+N_REQUESTS = 2000
+
+
+@pytest.fixture
+def requests_ohlcv(ohlcv):
+    return [ohlcv(60, seed=i) for i in range(N_REQUESTS)]
+
+
+@pytest.fixture
+def fast_thread_switching():
+    # Switch threads as often as possible so requests interleave
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def per_request(ohlcv):
+    generator = TradingSignalsGenerator()
+    generator.analyze_indicators(*ohlcv)
+    return generator.generate_signals()
+
+
+@pytest.mark.parametrize('path', ['evaluate', 'two_step'])
+def test_shared_instance_matches_per_request_instances(requests_ohlcv, fast_thread_switching, path):
+    expected = [per_request(ohlcv) for ohlcv in requests_ohlcv]
+    shared = TradingSignalsGenerator()
+
+    def evaluate(ohlcv):
+        return shared.evaluate(*ohlcv)
+
+    def two_step(ohlcv):
+        shared.analyze_indicators(*ohlcv)
+        return shared.generate_signals()
+
+    run = evaluate if path == 'evaluate' else two_step
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(run, requests_ohlcv))
+
+    assert results == expected
+
+
+def test_stored_indicators_are_per_thread(ohlcv):
+    generator = TradingSignalsGenerator()
+    indicators = generator.analyze_indicators(*ohlcv(100))
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(lambda: generator.indicators).result() == {}
+        with pytest.raises(ValueError):
+            pool.submit(generator.generate_signals).result()
+
+    assert generator.indicators == indicators
+
+
+def test_generator_pickles(ohlcv):
+    close, high, low, volume = ohlcv(200)
+    generator = TradingSignalsGenerator()
+    indicators = generator.analyze_indicators(close, high, low, volume)
+
+    restored = pickle.loads(pickle.dumps(generator))
+
+    # Stored indicators are thread state and do not travel
+    assert restored.indicators == {}
+    assert restored.generate_signals(indicators) == generator.generate_signals(indicators)
+    assert restored.evaluate(close, high, low, volume) == generator.evaluate(close, high, low, volume)
+    restored.analyze_indicators(close, high, low, volume)
+    assert restored.generate_signals() == generator.generate_signals()
+
+
+def test_streaming_generator_pickles_mid_stream(ohlcv):
+    close, high, low, volume = ohlcv(200)
+    stream = StreamingSignalsGenerator()
+    stream.warm_up(close[:100], high[:100], low[:100], volume[:100])
+
+    restored = pickle.loads(pickle.dumps(stream))
+    for t in range(100, 200):
+        assert restored.update(close[t], high[t], low[t], volume[t]) == stream.update(close[t], high[t], low[t], volume[t])
+
+
+def random_indicators(n_rows: int, seed: int = 0):
+    """Indicator rows spread over every branch of every scoring rule"""
+    rng = np.random.default_rng(seed)
+    price = rng.normal(100, 2, n_rows)
+    macd = rng.normal(0, 1, n_rows)
+    return {
+        'price': price,
+        'sma_20': price + rng.normal(0, 2, n_rows),
+        'ema_12': price + rng.normal(0, 2, n_rows),
+        'rsi': rng.uniform(0, 100, n_rows),
+        'macd': macd,
+        'macd_signal': macd + rng.normal(0, 1, n_rows),
+        'macd_histogram': rng.normal(0, 1, n_rows),
+        'bb_position': rng.uniform(-0.2, 1.2, n_rows),
+        'stoch_k': rng.uniform(0, 100, n_rows),
+        'volume_ratio': rng.uniform(0.5, 2.5, n_rows),
+    }
+
+
+@pytest.mark.parametrize('thresholds', [SignalThresholds(), SignalThresholds(rsi_oversold=20, bb_near_upper=0.8)])
+def test_batch_results_are_identical_to_scalar(thresholds):
+    generator = TradingSignalsGenerator()
+    indicators = random_indicators(2000)
+
+    batch = generator.generate_signals_batch(indicators, thresholds).to_results()
+    scalar = [
+        generator.generate_signals({name: values[i] for name, values in indicators.items()}, thresholds)
+        for i in range(2000)
+    ]
+
+    assert batch == scalar
+    for batch_result, scalar_result in zip(batch, scalar):
+        assert {key: type(value) for key, value in batch_result.items()} == \
+            {key: type(value) for key, value in scalar_result.items()}
+        assert json.dumps(batch_result) == json.dumps(scalar_result)
+
+    # Every reason of every rule was produced
+    reasons = {reason for result in scalar for reason in result['reasons']}
+    assert reasons == {reason for _, branches in SIGNAL_RULES for _, weight, reason in branches if weight > 0.5}
+
+
+def test_scores_are_floats():
+    generator = TradingSignalsGenerator()
+    # Only buy and hold branches fire, so the sell score is empty
+    indicators = {name: values[0] for name, values in random_indicators(1).items()}
+    indicators.update(rsi=10.0, macd=1.0, macd_signal=0.0, macd_histogram=1.0, bb_position=0.05, stoch_k=50.0,
+                      price=101.0, sma_20=100.0, ema_12=100.5)
+
+    result = generator.generate_signals(indicators)
+
+    assert result['sell_score'] == 0.0 and type(result['sell_score']) is float
+    assert result['signal'] == 'buy'
+    assert result['reasons'] == [
+        'RSI oversold', 'MACD bullish crossover', 'Price near lower Bollinger Band', 'Price above moving averages'
+    ]